@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""Pseudo-terminal benchmarks for PPMenu: latency, bytes and memory."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import argparse
+import fcntl
+import json
+import os
+import platform
+import pty
+import select
+import signal
+import struct
+import subprocess
+import sys
+import termios
+import time
+
+from typing import Any, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ppmenu import PPM  # noqa: E402
+from ppmenu.constants import ANSI, Keys  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+DEFAULT_DEPTHS = [1, 2, 5, 10, 20]
+
+# Items per level when sweeping nesting depth
+DEPTH_LEVEL_SIZE = 10
+
+# Terminal size the menu runs in
+ROWS, COLUMNS = 40, 120
+
+# Seconds to wait for a frame before the run is considered hung
+FRAME_TIMEOUT = 30.0
+
+# Metrics compared by --compare; higher is worse for all of them
+COMPARED_METRICS = [
+    ('startup_ms', None),
+    ('latency_ms', 'p50'),
+    ('latency_ms', 'p90'),
+    ('bytes_per_frame', 'mean'),
+    ('syscalls_per_key', None),
+    ('peak_rss_kb', None),
+]
+
+END_OF_FRAME = ANSI.END_SYNC.encode()
+
+
+# --- Child Process ---
+
+def build_menu(size: int, depth: int) -> dict[str, Any]:
+    """Build a menu with `size` items per level and `depth` levels."""
+    def action() -> None:
+        pass
+
+    level: dict[str, Any] = {f'Item {i}': action for i in range(size)}
+    for _ in range(depth - 1):
+        parent: dict[str, Any] = {'Deeper': level}
+        parent.update({f'Item {i}': action for i in range(1, size)})
+        level = parent
+    return level
+
+
+def run_child(size: int, depth: int) -> None:
+    """Run the benchmark menu on the pseudo-terminal (child side)."""
+    PPM(build_menu(size, depth), title=f'Benchmark {size}x{depth}').run()
+
+
+# --- Parent Process ---
+
+def keystrokes(depth: int, count: int) -> list[bytes]:
+    """Return a key script in which every key changes the frame."""
+    if depth == 1:
+        cycle = [b'j', b'k']
+    else:
+        cycle = [b'l'] * (depth - 1) + [b'h'] * (depth - 1)
+    return [cycle[i % len(cycle)] for i in range(count)]
+
+
+def read_frame(fd: int) -> bytes:
+    """Read output until the end of the next synchronized frame."""
+    data = b''
+    deadline = time.perf_counter() + FRAME_TIMEOUT
+    while END_OF_FRAME not in data:
+        remaining = deadline - time.perf_counter()
+        ready, _, _ = select.select([fd], [], [], max(remaining, 0))
+        if not ready:
+            raise TimeoutError('No frame received from the menu.')
+        data += os.read(fd, 65536)
+    return data
+
+
+def proc_syscalls(pid: int) -> Optional[int]:
+    """Return read plus write syscalls made by a process so far."""
+    try:
+        with open(f'/proc/{pid}/io') as io_file:
+            fields = dict(line.split(': ') for line in io_file)
+    except OSError:
+        return None
+    return int(fields['syscr']) + int(fields['syscw'])
+
+
+def proc_peak_rss(pid: int) -> Optional[int]:
+    """Return the peak resident memory of a process in kB."""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the value below which `fraction` of the sorted values lie."""
+    index = min(int(round(fraction * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def bench_case(size: int, depth: int, count: int) -> dict[str, Any]:
+    """Run one menu under a pseudo-terminal and measure it."""
+    pid, fd = pty.fork()
+    if pid == 0:
+        try:
+            run_child(size, depth)
+        finally:
+            os._exit(0)
+
+    fcntl.ioctl(
+        fd, termios.TIOCSWINSZ, struct.pack('HHHH', ROWS, COLUMNS, 0, 0)
+    )
+    try:
+        start = time.perf_counter()
+        read_frame(fd)
+        startup = time.perf_counter() - start
+
+        latencies: list[float] = []
+        frame_bytes: list[int] = []
+        syscalls_before = proc_syscalls(pid)
+        for key in keystrokes(depth, count):
+            sent = time.perf_counter()
+            os.write(fd, key)
+            frame = read_frame(fd)
+            latencies.append(time.perf_counter() - sent)
+            frame_bytes.append(len(frame))
+        syscalls_after = proc_syscalls(pid)
+        peak_rss = proc_peak_rss(pid)
+
+        os.write(fd, Keys.Q.encode())
+    finally:
+        _reap(pid, fd)
+
+    latencies.sort()
+    syscalls = None
+    if syscalls_before is not None and syscalls_after is not None:
+        syscalls = round((syscalls_after - syscalls_before) / count, 2)
+
+    return {
+        'size': size,
+        'depth': depth,
+        'keys': count,
+        'startup_ms': round(startup * 1000, 3),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50) * 1000, 3),
+            'p90': round(percentile(latencies, 0.90) * 1000, 3),
+            'p99': round(percentile(latencies, 0.99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3),
+        },
+        'bytes_per_frame': {
+            'mean': round(sum(frame_bytes) / len(frame_bytes), 1),
+            'max': max(frame_bytes),
+        },
+        'syscalls_per_key': syscalls,
+        'peak_rss_kb': peak_rss,
+    }
+
+
+def _reap(pid: int, fd: int) -> None:
+    """Wait for the child to exit, killing it if it hangs."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            while select.select([fd], [], [], 0.05)[0]:
+                os.read(fd, 65536)
+        except OSError:
+            pass
+        done, _ = os.waitpid(pid, os.WNOHANG)
+        if done:
+            break
+    else:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    os.close(fd)
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit of the repository, if available."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    sizes: list[int],
+    depths: list[int],
+    count: int
+) -> dict[str, Any]:
+    """Run the size sweep and the depth sweep."""
+    cases = [(size, 1) for size in sizes]
+    cases += [(DEPTH_LEVEL_SIZE, depth) for depth in depths if depth > 1]
+    results = []
+    for size, depth in cases:
+        result = bench_case(size, depth, count)
+        print(
+            f'size={size:>7} depth={depth:>2}  '
+            f'p50={result["latency_ms"]["p50"]:>8.3f}ms  '
+            f'p99={result["latency_ms"]["p99"]:>8.3f}ms  '
+            f'bytes/frame={result["bytes_per_frame"]["mean"]:>8.1f}  '
+            f'syscalls/key={result["syscalls_per_key"]}  '
+            f'rss={result["peak_rss_kb"]}kB',
+            file=sys.stderr,
+        )
+        results.append(result)
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+# --- Comparison ---
+
+def metric(result: dict[str, Any], name: str, field: Optional[str]) -> Any:
+    """Return a metric of one result, or None if it was not measured."""
+    value = result.get(name)
+    if field is not None and isinstance(value, dict):
+        value = value.get(field)
+    return value
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float
+) -> list[str]:
+    """
+    Return a line for every metric that got worse than the threshold.
+
+    Args:
+        baseline: Earlier report, e.g. from the release branch.
+        current: Report of the commit under test.
+        threshold: Allowed relative increase, e.g. 0.2 for 20%.
+    """
+    old_cases = {
+        (result['size'], result['depth']): result
+        for result in baseline['results']
+    }
+    regressions: list[str] = []
+    for result in current['results']:
+        old = old_cases.get((result['size'], result['depth']))
+        if old is None:
+            continue
+        for name, field in COMPARED_METRICS:
+            before = metric(old, name, field)
+            after = metric(result, name, field)
+            if not before or after is None:
+                continue
+            if after > before * (1 + threshold):
+                label = f'{name}.{field}' if field else name
+                regressions.append(
+                    f'size={result["size"]} depth={result["depth"]} '
+                    f'{label}: {before} -> {after} '
+                    f'(+{(after / before - 1) * 100:.0f}%)'
+                )
+    return regressions
+
+
+# --- Command Line ---
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+        help='items per level for the size sweep (depth 1)',
+    )
+    parser.add_argument(
+        '--depths', type=int, nargs='+', default=DEFAULT_DEPTHS,
+        help=f'nesting depths, {DEPTH_LEVEL_SIZE} items per level',
+    )
+    parser.add_argument(
+        '--keys', type=int, default=200,
+        help='keystrokes sent per case',
+    )
+    parser.add_argument(
+        '--output', help='write the JSON report to this file',
+    )
+    parser.add_argument(
+        '--compare', metavar='BASELINE',
+        help='JSON report to compare against; exit 1 on regressions',
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='allowed relative increase before a metric is a regression',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmarks and report or compare the results."""
+    args = parse_args(argv)
+    report = run_suite(args.sizes, args.depths, args.keys)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(baseline, report, args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,6 +6,7 @@
 import sys
 
 from ppmenu import PPM, ColorScheme
+from ppmenu.status import State, StatusRegion
 from coffee_quotes import quotes
 
 # --- Custom Color Scheme ---
@@ -19,9 +20,14 @@ custom_colors = ColorScheme(
 # --- Internal Data ---
 cart: list[tuple[str, float]] = []
 
+# The total is only recomputed when the cart changes
+state = State(cart=cart)
+state.derive("total", lambda items: sum(p for _, p in items), "cart")
+
 def add_to_cart(item: str, price: float) -> None:
     """Add an item to the cart."""
     cart.append((item, price))
+    state.touch("cart")
 
 def view_cart() -> None:
     """Display the cart summary."""
@@ -29,11 +35,9 @@ def view_cart() -> None:
         print("\nYour cart is empty.")
         return
     print("\nCurrent Cart:")
-    total = 0.0
     for name, price in cart:
         print(f"- {name} : ${price:.2f}")
-        total += price
-    print(f"\nTotal: ${total:.2f}")
+    print(f"\nTotal: ${state['total']:.2f}")
 
 def checkout() -> None:
     """Checkout and exit."""
@@ -51,14 +55,14 @@ PRODUCTS = {
     "Coffee": {
         "e": ("Espresso", 2.50),
         "a": ("Americano", 3.00),
-        "l": ("Latte", 4.50),
+        "t": ("Latte", 4.50),
         "c": ("Cappuccino", 4.00),
         "m": ("Mocha", 4.75),
     },
     "Tea": {
         "g": ("Green Tea", 2.75),
         "b": ("Black Tea", 2.50),
-        "h": ("Herbal Tea", 3.00),
+        "r": ("Herbal Tea", 3.00),
         "m": ("Matcha", 4.00),
     },
     "Pastries": {
@@ -96,18 +100,17 @@ class CoffeeShopMenu(PPM):
         """Display the coffee shop title."""
         print(f"{self.colors.title}{self.shop_title}{self.colors.reset}\n")
 
-    def _display_cart(self) -> None:
-        """Display the shopping cart before the menu."""
-        print(f"{self.colors.submenu}Current Cart:{self.colors.reset}")
-        if cart:
-            total = 0.0
-            for name, price in cart:
-                print(f" - {name} : ${price:.2f}")
-                total += price
-            print(f"\nTotal: ${total:.2f}\n")
+    def render_cart(self, state: State) -> list[str]:
+        """Shopping cart lines; redrawn only when the cart changed."""
+        lines = [f"{self.colors.submenu}Current Cart:{self.colors.reset}"]
+        if state["cart"]:
+            lines += [
+                f" - {name} : ${price:.2f}" for name, price in state["cart"]
+            ]
+            lines += ["", f"Total: ${state['total']:.2f}", ""]
         else:
-            quote = next(iter(quotes))
-            print(f" {quote}\n")
+            lines += [f" {next(iter(quotes))}", ""]
+        return lines
 
 # --- Run the Coffee Shop Menu ---
 def run_coffee_shop() -> None:
@@ -116,6 +119,7 @@ def run_coffee_shop() -> None:
         colors=custom_colors,
         show_nav_help=False,
     )
+    menu.status = StatusRegion(menu.render_cart, state)
     menu.run()
 
 if __name__ == "__main__":
@@ -3,15 +3,56 @@
 
 # created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
 
+import asyncio
+import copy
+import inspect
+import os
 import re
 import sys
-import termios
-import tty
+import time
+import warnings
 
-from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Union
 
-from .constants import ANSI, ColorScheme, DEFAULT_COLORS, Keys, NAVIGATION_HELP
+from .constants import (
+    ANSI,
+    ColorScheme,
+    DEFAULT_COLORS,
+    JOB_REFRESH_INTERVAL,
+    Keys,
+    NAVIGATION_HELP,
+    NO_COLORS,
+)
+from .batch import Batch
+from .chords import CHORD_TIMEOUT, MAX_CHORD_LENGTH, ChordNode, assign_chords
+from .decoder import ESC_TIMEOUT, KeyReader, coalesce
+from .jobs import DEFAULT_MAX_WORKERS, Job, JobRunner, _await
+from .keymap import CHORD, JUMP, MOVES, Keymap, Table
+from .layout import (
+    COLUMN_GAP,
+    MAX_MEASURED,
+    RESIZE_DEBOUNCE,
+    display_width,
+    fit,
+    plan_columns,
+)
+from .lazy import LazyCache, LazyMenu
+from .level import ACTION, LAZY, SUBMENU, Level, MenuItem
+from .paths import MAX_COMPLETIONS, SEPARATOR, PathIndex
+from .render import Frame, Renderer, capture_print
+from .search import Search, SearchIndex
+from .stats import MenuStats
+from .status import StatusRegion
+from .terminal import TerminalSession
+from .usage import UsageModel
+from .viewport import Viewport
+
+# `[x] Label` or `[xy] Label` keys: quick-jump chord and label
+QUICK_NAV_PATTERN = re.compile(
+    rf'^\[([a-z]{{1,{MAX_CHORD_LENGTH}}})\]\s+(.*)', re.IGNORECASE
+)
 
 
 class PPMError(Exception):
@@ -19,12 +60,9 @@ class PPMError(Exception):
     pass
 
 
-@dataclass
-class MenuItem:
-    value: Any
-    quick_nav: Optional[str]
-    original_key: str
-    quick_nav_map: dict[str, int]
+class KeymapWarning(UserWarning):
+    """A key binding shadows the quick-jump letter of a menu item."""
+    pass
 
 
 class PPM:
@@ -32,106 +70,421 @@ class PPM:
 
     def __init__(
         self,
-        menu_structure: dict[str, Any],
+        menu_structure: Union[dict[str, Any], Level],
         title: Optional[str] = None,
         colors: ColorScheme = DEFAULT_COLORS,
         show_nav_help: bool = True,
+        auto_quick_jump: bool = False,
     ):
         """
         Initialize the menu system.
 
         Args:
-            menu_structure: Dictionary structure of the menu.
+            menu_structure: Dictionary structure of the menu, or a
+                ready `Level` such as the root of a catalog.
             title: Optional title displayed above the menu.
             colors: Color scheme instance.
             show_nav_help: Whether to display navigation help.
+                Colors are turned off when stdout is not a terminal or
+                the NO_COLOR environment variable is set.
+            auto_quick_jump: Give items without `[x]` a short quick-jump
+                chord, e.g. for generated menus.
         """
         if not menu_structure:
             raise PPMError('Empty menu structure provided.')
 
-        self.original_menu = menu_structure
-        self.menu = self._process_menu_structure(menu_structure.copy())
+        self.original_menu: Any = menu_structure
+        self.auto_quick_jump = auto_quick_jump
+        self.keymap = Keymap()
+        self._levels: dict[int, tuple[dict[str, Any], Level]] = {}
+        self.lazy_cache = LazyCache()
+        self.lazy_cache.on_evict = self._forget
+        # Menu whose processed levels and indexes this one reuses
+        self._shared: Optional[PPM] = None
         self.title = title
-        self.colors = colors
+        # The scheme asked for, also when this terminal shows no colors
+        self.color_scheme = colors
+        self.colors = colors if _use_color() else NO_COLORS
         self.show_nav_help = show_nav_help
+        # Upper bound on the columns of a level that does not fit
+        self.max_columns: int = 1
+        # Workers for batches when there is no `jobs` runner
+        self.batch_workers: int = DEFAULT_MAX_WORKERS
+        self.stats: Optional[MenuStats] = None
+        self.usage: Optional[UsageModel] = None
+
+        self._init_session()
+        self.menu = self._get_level(menu_structure)
+        self.compile()
 
+    def _init_session(self) -> None:
+        """Set up the navigation and display state of one user."""
         self.current_pos: int = 0
-        self.path: list[tuple[dict[str, MenuItem], int]] = []
+        self.path: list[tuple[Level, int]] = []
         self.running: bool = True
         self.arrow_buffer: str = ''
 
+        self.renderer = Renderer()
+        self.frame = Frame()
+        self.terminal = TerminalSession()
+        self.terminal.on_resize = self._on_resize
+        self.keys = KeyReader()
+        self._pending_keys: deque[str] = deque()
+        self.viewport = Viewport()
+        self._width: int = 80
+        self._resized_at: Optional[float] = None
+        self._rendered_level: Optional[Level] = None
+        self._style_colors: tuple[str, ...] = ()
+        self._style_version: int = 0
+
+        self.search: Optional[Search] = None
+        self._search_return_pos: int = 0
+        self._index_level: Optional[Level] = None
+        self._level_index: Optional[SearchIndex] = None
+        self._tree_index: Optional[
+            tuple[SearchIndex, list[tuple[int, ...]]]
+        ] = None
+        self._tree_paths: Optional[
+            tuple[list[tuple[str, ...]], list[tuple[int, ...]]]
+        ] = None
+
+        self.goto_query: Optional[str] = None
+        self._goto_matches: list[str] = []
+        # The go-to list shows recent paths until something is typed
+        self._goto_recent: bool = False
+        self._path_index: Optional[PathIndex] = None
+        self._jump_level: Optional[Level] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._events: Optional[asyncio.Queue[Optional[list[str]]]] = None
+        self._pending_action: Optional[Any] = None
+        self._pending_key: str = ''
+        self.jobs: Optional[JobRunner] = None
+        self._chord: Optional[ChordNode] = None
+        self.commands: dict[str, Callable[[Level, Any], Optional[Level]]] = {
+            JUMP: self._command_jump,
+            CHORD: self._command_chord,
+            'home': self._command_home,
+            'end': self._command_end,
+            'back': self._command_back,
+            'select': self._command_select,
+            'run_batch': self._command_run_batch,
+            'search': self._command_search,
+            'goto': self._command_goto,
+            'recent': self._command_recent,
+            'cancel_job': self._command_cancel_job,
+            'mark': self._command_mark,
+            'mark_range': self._command_mark_range,
+            'mark_all': self._command_mark_all,
+            'clear_marks': self._command_clear_marks,
+            'quit': self._command_quit,
+        }
+
+        # Marked positions by level id, with the level itself
+        self.marks: dict[int, tuple[Level, set[int]]] = {}
+        self._mark_anchor: Optional[int] = None
+        self.batch: Optional[Batch] = None
+
+        self.status: Optional[StatusRegion] = None
+        # Last full frame, with the rows of the status region in it
+        self._frame_lines: list[str] = []
+        self._status_rows: tuple[int, int] = (0, 0)
+        self._menu_dirty: bool = True
+        self._jobs_shown: bool = False
+
+        # Submenus loading in the background, by id of the raw menu
+        self._prefetched: dict[
+            int, Future[tuple[Any, Level, Optional[float]]]
+        ] = {}
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+
+    def session(self) -> 'PPM':
+        """
+        Return a menu for one more user of the same tree.
+
+        The new menu shares the processed levels, the lazy cache, the
+        key bindings and the search and path indexes with this one, and
+        has its own cursor, back-stack, marks, renderer and input. Its
+        memory does not grow with the size of the tree, e.g. for the
+        sessions of a `MenuServer`.
+
+        A `status` region gets a copy over the same `State`, so every
+        session shows the shared status. Attributes set by a subclass
+        are shared too; override this method to give each session its
+        own copy of them.
+        """
+        session = copy.copy(self)
+        session._shared = self._shared or self
+        session._init_session()
+        if self.status is not None:
+            session.status = self.status.copy()
+        return session
+
     # --- Menu Processing ---
 
     def _process_menu_structure(
         self,
         menu: dict[str, Any]
-    ) -> dict[str, MenuItem]:
+    ) -> Level:
         """
-        Process raw menu into structured MenuItem instances.
+        Process a raw menu into a compact `Level`.
 
         Args:
             menu: Raw menu dictionary.
 
         Returns:
-            Processed menu dictionary.
-        """
-        processed: dict[str, MenuItem] = {}
-        quick_nav_map: dict[str, int] = {}
-
-        for idx, (key, value) in enumerate(menu.items()):
-            match = re.match(r'^\[([a-z])\]\s+(.*)', key, re.IGNORECASE)
-            if match:
-                quick_nav = match.group(1).lower()
-                new_key = match.group(2).strip()
-                if quick_nav in quick_nav_map:
-                    raise PPMError(f'Duplicate quick jump letter: [{quick_nav}] detected.')
-                processed[new_key] = MenuItem(
-                    value=value,
-                    quick_nav=quick_nav,
-                    original_key=key,
-                    quick_nav_map=quick_nav_map,
-                )
-                quick_nav_map[quick_nav] = idx
+            Processed menu level.
+        """
+        labels, quick_navs, quick_nav_map = split_keys(menu)
+        if self.auto_quick_jump:
+            assign_chords(quick_navs, quick_nav_map, self.keymap.bindings)
+        return Level(
+            labels, list(menu), quick_navs, list(menu.values()), quick_nav_map
+        )
+
+    def _get_level(self, menu: Union[dict[str, Any], Level]) -> Level:
+        """Return the processed level of a raw submenu, processing it once."""
+        if isinstance(menu, Level):
+            return menu
+        entry = self._levels.get(id(menu))
+        if entry is None:
+            loaded = self._take_prefetched(menu)
+            level = (
+                loaded[1] if loaded
+                else self._process_menu_structure(menu)
+            )
+            entry = self._levels[id(menu)] = (menu, level)
+        return entry[1]
+
+    def _get_lazy_level(self, node: LazyMenu) -> Level:
+        """Return the level of a lazy submenu, loading it when not cached."""
+        if self.lazy_cache.on_evict is None:
+            self.lazy_cache.on_evict = self._forget
+        level = self.lazy_cache.get(node)
+        if level is None:
+            loaded = self._take_prefetched(node)
+            if loaded and not self.lazy_cache.expired(node, loaded[2]):
+                menu, level, loaded_at = loaded
             else:
-                processed[key] = MenuItem(
-                    value=value,
-                    quick_nav=None,
-                    original_key=key,
-                    quick_nav_map=quick_nav_map,
-                )
+                menu, level = self._load_lazy(node)
+                loaded_at = None
+            self.lazy_cache.put(node, menu, level, loaded_at)
+        return level
+
+    def _load_lazy(self, node: LazyMenu) -> tuple[Any, Level]:
+        """Call the provider of a lazy submenu and process its items."""
+        menu = node.load()
+        if isinstance(menu, Level):
+            return menu, menu
+        return menu, self._process_menu_structure(menu)
+
+    def _prefetch(self, current_level: Level) -> None:
+        """
+        Load the likeliest submenus of a level in the background.
+
+        The `usage.prefetch` submenus selected most often from this level
+        are loaded by one worker thread, so opening them does not wait
+        for a slow provider.
+        """
+        usage = self.usage
+        if usage is None or usage.prefetch <= 0:
+            return
+        wanted = usage.prefetch
+        for label in usage.likely(self._path_label()[1:]):
+            if wanted <= 0:
+                break
+            try:
+                pos = current_level.index(label)
+            except KeyError:
+                continue
+            kind = current_level.kinds[pos]
+            value = current_level.item_values[pos]
+            if kind == LAZY:
+                wanted -= 1
+                if value in self.lazy_cache:
+                    continue
+                load = self._prefetch_lazy
+            elif kind == SUBMENU and isinstance(value, dict) and value:
+                wanted -= 1
+                if id(value) in self._levels:
+                    continue
+                load = self._prefetch_structure
+            else:
+                continue
+            if id(value) not in self._prefetched:
+                if self._prefetcher is None:
+                    self._prefetcher = ThreadPoolExecutor(
+                        1, thread_name_prefix='ppmenu-prefetch'
+                    )
+                future = self._prefetcher.submit(load, value)
+                self._prefetched[id(value)] = future
+
+    def _prefetch_lazy(
+        self,
+        node: LazyMenu
+    ) -> tuple[Any, Level, Optional[float]]:
+        """Load a lazy submenu in the background, noting when."""
+        loaded_at = self.lazy_cache.clock()
+        return (*self._load_lazy(node), loaded_at)
+
+    def _prefetch_structure(
+        self,
+        menu: dict[str, Any]
+    ) -> tuple[dict[str, Any], Level, Optional[float]]:
+        """Process a raw submenu in the background."""
+        return menu, self._process_menu_structure(menu), None
+
+    def _take_prefetched(
+        self,
+        menu: Any
+    ) -> Optional[tuple[Any, Level, Optional[float]]]:
+        """
+        Return the result of a prefetch of a submenu, if one was started.
+
+        Waits for a prefetch that is still running. A prefetch that failed
+        returns None, so the caller loads the submenu again and the error
+        is raised where the user opened it. The result ends with the time
+        a lazy submenu was loaded at, on the `lazy_cache` clock.
+        """
+        future = self._prefetched.pop(id(menu), None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
 
-        return processed
+    def _forget(self, menu: dict[str, Any]) -> None:
+        """Drop cached submenus of an evicted lazy level."""
+        stack = [value for value in menu.values() if isinstance(value, dict)]
+        while stack:
+            entry = self._levels.pop(id(stack.pop()), None)
+            if entry is not None:
+                stack.extend(entry[1].submenus())
+
+    def _walk(self) -> list[dict[str, Any]]:
+        """Return every raw level reachable from the root menu."""
+        seen = {id(self.original_menu)}
+        raw_levels = [self.original_menu]
+        for menu in raw_levels:
+            for value in self._get_level(menu).submenus():
+                if value and id(value) not in seen:
+                    seen.add(id(value))
+                    raw_levels.append(value)
+        return raw_levels
+
+    def compile(self) -> 'PPM':
+        """
+        Process and validate every level of the menu tree once.
+
+        Levels are cached by the identity of their raw dict, so entering
+        or leaving a submenu later is a lookup, not a reparse. Called
+        from `__init__`, so broken submenus (e.g. duplicate quick-jump
+        letters) are reported before the menu is shown.
+
+        Raises:
+            PPMError: If any level of the tree is invalid.
+        """
+        for menu in self._walk():
+            self._dispatch_table(self._get_level(menu))
+        return self
+
+    def invalidate(self, menu: Optional[dict[str, Any]] = None) -> None:
+        """
+        Reprocess levels after the menu structure was changed at runtime.
+
+        Processed levels are updated in place, so the level on screen and
+        the levels in `path` show the new items right away.
+
+        Args:
+            menu: The raw submenu dict that changed. When omitted, the
+                whole tree is reprocessed.
+
+        Raises:
+            PPMError: If a changed level is invalid.
+        """
+        if self._shared is not None:
+            self._shared.invalidate(menu)
+            self._forget_positions()
+            return
+        if menu is None:
+            entries = list(self._levels.values())
+        else:
+            entry = self._levels.get(id(menu))
+            entries = [entry] if entry else []
+
+        for raw, level in entries:
+            level.replace(self._process_menu_structure(raw))
+
+        reachable = {id(raw) for raw in self._walk()}
+        if menu is None:
+            # Forget levels that are no longer part of the tree; in
+            # place, as sessions hold the same dict
+            for key in [key for key in self._levels if key not in reachable]:
+                del self._levels[key]
+            self.lazy_cache.clear()
+
+        self._tree_index = None
+        self._tree_paths = None
+        self._path_index = None
+        self._forget_positions()
+
+    def _forget_positions(self) -> None:
+        """Drop state that refers to item positions after a change."""
+        self._index_level = None
+        self._prefetched.clear()
+        # Positions may now point at other items
+        self.marks.clear()
+        self.renderer.invalidate()
+        self._menu_dirty = True
 
     def _get_quick_nav_map(
         self,
-        current_level: dict[str, MenuItem]
+        current_level: Level
     ) -> dict[str, int]:
         """Return quick navigation map for the current level."""
-        if not current_level:
-            return {}
-        first_item = next(iter(current_level.values()))
-        return first_item.quick_nav_map
+        return current_level.quick_nav_map
 
     # --- Terminal Input ---
 
     def _getch(self) -> str:
-        """Capture a single character from stdin, handling arrows and Alt."""
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1)
+        """Return the next key, reading a new batch when none is pending."""
+        if not self._pending_keys:
+            self._pending_keys.extend(self._read_keys())
+        return self._pending_keys.popleft()
 
-            if ch == Keys.ESCAPE:
-                ch2 = sys.stdin.read(1)
-                if ch2 == '[':
-                    ch3 = sys.stdin.read(1)
-                    return Keys.ESCAPE + '[' + ch3  # Arrow keys
-                return f'ALT+{ch2.lower()}'  # Alt+key
+    def _read_keys(self) -> list[str]:
+        """Return every key that is available, blocking for at least one."""
+        if self._pending_keys:
+            keys = list(self._pending_keys)
+            self._pending_keys.clear()
+            return keys
+        timeout = self._input_timeout()
+        stats = self.stats
+        start = stats.clock() if stats is not None else 0.0
+        with self.terminal:
+            keys = self.keys.read(timeout)
+        if stats is not None:
+            stats.record('input', stats.clock() - start)
+        return keys
 
-            return ch
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    def _input_timeout(self) -> Optional[float]:
+        """Return how long to wait for keys before redrawing anyway."""
+        timeouts = []
+        if self._chord is not None and self._chord.position is not None:
+            timeouts.append(CHORD_TIMEOUT)
+        if self._background_active():
+            timeouts.append(JOB_REFRESH_INTERVAL)
+        if self.status is not None:
+            # A throttled status update is drawn once it is allowed
+            wait = self.status.timeout()
+            if wait is not None:
+                timeouts.append(wait)
+        if self._resized_at is not None:
+            timeouts.append(max(
+                self._resized_at + RESIZE_DEBOUNCE - time.monotonic(), 0.0
+            ))
+        return min(timeouts, default=None)
 
     # --- Display Methods ---
 
@@ -139,41 +492,350 @@ class PPM:
         """Clear the terminal screen."""
         print(ANSI.CLEAR_SCREEN, end='')
 
-    def _display_menu(self, current_level: dict[str, MenuItem]) -> None:
+    def _display_menu(self, current_level: Level) -> None:
         """Master function to display the menu."""
-        self._clear_screen()
-        self._display_title()
-        self._display_cart()
-        self._display_menu_items(current_level)
-        self._display_footer()
+        if self._resizing():
+            return
+        stats = self.stats
+        start = stats.clock() if stats is not None else 0.0
+
+        if current_level is not self._rendered_level:
+            self.renderer.invalidate()
+            self.viewport.reset()
+            self._rendered_level = current_level
+            if stats is not None:
+                stats.visit(self._path_label())
+            self._prefetch(current_level)
+
+        if self._status_only(current_level):
+            lines = self._compose_status()
+        else:
+            lines = self._compose_frame(current_level)
+        self.renderer.render(lines)
+        if stats is not None:
+            stats.record('render', stats.clock() - start)
+
+    def _compose_frame(
+        self,
+        current_level: Level
+    ) -> list[str]:
+        """
+        Build the whole frame in one buffer.
+
+        Display methods write to `self.frame`; plain `print()` calls from
+        overridden hooks such as `_display_cart` land in the same buffer.
+        Output of other threads, e.g. background jobs, does not.
+        The header and footer are composed first, so the viewport gets
+        exactly the rows that are left for menu items.
+        """
+        header = self._compose_part(
+            self._display_title,
+            self._display_cart,
+            lambda: self._display_batch(current_level),
+        )
+        start = header.height()
+        header.extend(self._compose_part(self._display_status))
+        self._status_rows = (start, header.height())
+        footer = self._compose_part(self._display_footer)
+
+        size = self.renderer.get_size()
+        rows = size.lines
+        self._width = size.columns
+        self.viewport.fit(rows - header.height() - footer.height() - 1)
+
+        self.frame = header
+        with capture_print(self.frame):
+            self._display_menu_items(current_level)
+        self.frame.extend(footer)
+        self._frame_lines = self.frame.lines()
+        self._menu_dirty = False
+        self._jobs_shown = self._background_active()
+        return self._frame_lines
+
+    def _status_only(self, current_level: Level) -> bool:
+        """Whether only the status region can have changed on screen."""
+        renderer = self.renderer
+        return (
+            self.status is not None
+            and not self._menu_dirty
+            and not self._jobs_shown
+            and current_level is self._rendered_level
+            and not renderer.needs_full_repaint
+            and tuple(renderer.get_size()) == renderer.size
+        )
+
+    def _compose_status(self) -> list[str]:
+        """
+        Put fresh status lines into the last frame.
+
+        The menu items are not composed again; the renderer then rewrites
+        only the status rows. A status block that changed height needs a
+        new layout, so it gets a full frame.
+        """
+        start, end = self._status_rows
+        status = self.status.lines() if self.status is not None else []
+        if len(status) != end - start:
+            return self._compose_frame(self._rendered_level or self.menu)
+        lines = list(self._frame_lines)
+        lines[start:end] = status
+        self._frame_lines = lines
+        return lines
+
+    def _compose_part(self, *display: Callable[[], None]) -> Frame:
+        """Run display methods into a fresh frame and return it."""
+        self.frame = Frame()
+        with capture_print(self.frame):
+            for method in display:
+                method()
+        return self.frame
 
     def _display_title(self) -> None:
         """Display the menu title."""
         if self.title:
-            print(f'{self.colors.title}{self.title}{self.colors.reset}\n')
+            colors = self.colors
+            self.frame.line(f'{colors.title}{self.title}{colors.reset}')
+            self.frame.line()
 
     def _display_cart(self) -> None:
         """Optional cart/status display. Empty by default."""
         pass
 
-    def _display_menu_items(self, current_level: dict[str, MenuItem]) -> None:
-        """Display all menu items."""
-        items = list(current_level.items())
-        for i, (key, item) in enumerate(items):
+    def _display_status(self) -> None:
+        """Display the lines of the status region, if there is one."""
+        status = self.status
+        if status is None:
+            return
+        if status.on_dirty is None:
+            status.on_dirty = self._wake
+        for line in status.lines():
+            self.frame.line(line)
+
+    def _display_batch(self, current_level: Level) -> None:
+        """Display the number of marked items and the batch progress."""
+        colors = self.colors
+        marked = sum(len(positions) for _, positions in self.marks.values())
+        if marked:
+            here = len(self._marked(current_level))
+            where = '' if here == marked else f' ({here} here)'
+            self.frame.line(
+                f'{colors.match}{marked} marked{where}{colors.reset}  '
+                f'{colors.dim}Enter: run, Esc: clear{colors.reset}'
+            )
+        if self.batch is not None:
+            self.frame.line(
+                f'{colors.dim}Batch: {self.batch.summary()}{colors.reset}'
+            )
+
+    def _display_menu_items(self, current_level: Level) -> None:
+        """Display the menu items that fit in the viewport."""
+        if self.search is not None:
+            self._display_search_results(self.search)
+            return
+        if self.goto_query is not None:
+            self._display_goto()
+            return
+
+        columns, width = self._columns(current_level)
+        viewport = self.viewport
+        viewport.fit(viewport.rows, columns)
+        # Cached lines are cut to the column width, and padded to it
+        # when there are several columns. Levels are shared by sessions
+        # whose colors may differ, so the colors are part of the key.
+        key = (
+            self._current_style_version(), self._style_colors, width,
+            columns > 1,
+        )
+        cache = current_level.styled
+        marked = self._marked(current_level)
+        watch_jobs = self.jobs is not None or self.batch is not None
+        lines = []
+        for i in viewport.window(self.current_pos, len(current_level)):
+            styled = cache[i]
+            if styled is None or styled[0] != key:
+                styled = self._styled(current_level, i, key)
+            selected = i == self.current_pos
+            line = styled[1] if selected else styled[2]
+            if i in marked:
+                line = self._format_marked(line, selected)
+
+            if watch_jobs and current_level.kinds[i] == ACTION:
+                job = self._job_of(current_level, i)
+                status = self._format_job_status(job)
+                if status:
+                    line = fit(line.rstrip(' ') + status, width, columns > 1)
+
+            lines.append(line)
+
+        if columns == 1:
+            for line in lines:
+                self.frame.line(line)
+            return
+        gap = ' ' * COLUMN_GAP
+        rows = min(viewport.rows, len(lines))
+        for row in range(rows):
+            self.frame.line(gap.join(lines[row::rows]).rstrip(' '))
+
+    def _columns(self, current_level: Level) -> tuple[int, int]:
+        """Return the number of columns of a level and their width."""
+        count = len(current_level)
+        if self.max_columns <= 1 or count <= self.viewport.rows:
+            return 1, self._width
+        entry = current_level.layout
+        if entry is None or entry[0] != count:
+            keys = current_level.original_keys
+            natural = max(
+                display_width(keys[i]) for i in range(min(count, MAX_MEASURED))
+            )
+            # Room for the '-> ' marker of the selected item
+            entry = current_level.layout = (count, natural + 3)
+        return plan_columns(
+            entry[1], count, self._width, self.viewport.rows,
+            self.max_columns,
+        )
+
+    def restyle(self) -> None:
+        """
+        Drop all cached item lines.
+
+        Call after changing state that an overridden `_format_*_item`
+        method reads; color scheme changes are picked up automatically.
+        """
+        self._style_version += 1
+        self._menu_dirty = True
+
+    def _current_style_version(self) -> int:
+        """Return a number that changes whenever the color scheme does."""
+        colors = tuple(vars(self.colors).values())
+        if colors != self._style_colors:
+            self._style_colors = colors
+            self._style_version += 1
+        return self._style_version
+
+    def _styled(
+        self,
+        level: Level,
+        pos: int,
+        key: tuple[int, tuple[str, ...], int, bool]
+    ) -> tuple[Any, str, str]:
+        """
+        Format both variants of an item's line once and cache them.
+
+        The cache entry remembers the style version, the colors and the
+        width the lines were cut to, so a changed color scheme or
+        terminal width rebuilds it; changing an item through a `MenuItem`
+        view drops its entry.
+
+        Args:
+            level: Level holding the item.
+            pos: Position of the item.
+            key: Style version, colors, width, and whether to pad to the
+                width.
+        """
+        _, _, width, pad = key
+        colors = self.colors
+        quick_nav = level.quick_navs[pos]
+        original_key = level.original_keys[pos]
+        selected = (
+            f'{colors.selected}-> {colors.reset}'
+            f'{self._format_selected_item(quick_nav, original_key)}'
+        )
+        unselected = '   ' + self._format_unselected_item(
+            quick_nav, original_key, level.item_values[pos]
+        )
+        styled = level.styled[pos] = (
+            key, fit(selected, width, pad), fit(unselected, width, pad)
+        )
+        return styled
+
+    def _display_search_results(self, search: Search) -> None:
+        """Display the search prompt and the matching items."""
+        colors = self.colors
+        results = search.results()
+        scope = 'menu' if search.targets is not None else 'level'
+        self.frame.line(
+            f'{colors.match}/{search.query}{colors.reset}  '
+            f'{colors.dim}{len(results)} found in {scope}{colors.reset}'
+        )
+        self.viewport.fit(self.viewport.height - 1)
+
+        for i in self.viewport.window(self.current_pos, len(results)):
+            idx = results[i]
+            selected = i == self.current_pos
             prefix = (
-                f'{self.colors.selected}-> {self.colors.reset}'
-                if i == self.current_pos else '   '
+                f'{colors.selected}-> {colors.reset}' if selected else '   '
             )
-            quick_nav = item.quick_nav
-            value = item.value
-            original_key = item.original_key
+            text = self._format_match(
+                search.index.labels[idx],
+                search.index.positions(idx, search.query),
+                selected,
+            )
+            self.frame.line(fit(f'{prefix}{text}', self._width))
 
+    def _display_goto(self) -> None:
+        """Display the go-to prompt and the completed paths."""
+        colors = self.colors
+        matches = self._goto_matches
+        count = f'{len(matches)}+' if len(matches) == MAX_COMPLETIONS else (
+            str(len(matches))
+        )
+        kind = 'recent' if self._goto_recent else 'paths'
+        self.frame.line(
+            f'{colors.match}:{self.goto_query}{colors.reset}  '
+            f'{colors.dim}{count} {kind}{colors.reset}'
+        )
+        self.viewport.fit(self.viewport.height - 1)
+
+        for i in self.viewport.window(self.current_pos, len(matches)):
             if i == self.current_pos:
-                display_text = self._format_selected_item(quick_nav, original_key)
+                line = f'{colors.selected}-> {matches[i]}{colors.reset}'
             else:
-                display_text = self._format_unselected_item(quick_nav, original_key, value)
+                line = f'   {colors.dim}{matches[i]}{colors.reset}'
+            self.frame.line(fit(line, self._width))
+
+    def _format_match(
+        self,
+        label: str,
+        positions: list[int],
+        selected: bool
+    ) -> str:
+        """Format a search result with the matched characters highlighted."""
+        color = self.colors.selected if selected else self.colors.dim
+        marked = set(positions)
+        text = ''.join(
+            f'{self.colors.match}{ch}{self.colors.reset}{color}'
+            if pos in marked else ch
+            for pos, ch in enumerate(label)
+        )
+        return f'{color}{text}{self.colors.reset}'
+
+    def _format_marked(self, line: str, selected: bool) -> str:
+        """Put a mark in front of an item line."""
+        colors = self.colors
+        if selected:
+            arrow = f'{colors.selected}-> {colors.reset}'
+            return f'{colors.selected}*> {colors.reset}{line[len(arrow):]}'
+        return f' {colors.match}*{colors.reset} {line[3:]}'
 
-            print(f'{prefix}{display_text}')
+    def _format_job_status(self, job: Optional[Job]) -> str:
+        """Format the status of an item's background job."""
+        if job is None:
+            return ''
+        colors = self.colors
+        status = job.status
+        if status == 'queued':
+            return f' {colors.dim}[queued]{colors.reset}'
+        if status == 'running':
+            return f' {colors.match}[running {job.elapsed:.1f}s]{colors.reset}'
+        if status == 'failed':
+            error = _preview(job.error)
+            return f' {colors.failed}[failed: {error}]{colors.reset}'
+        if status == 'cancelled':
+            return f' {colors.dim}[cancelled]{colors.reset}'
+        result = '' if job.result is None else f': {_preview(job.result)}'
+        return (
+            f' {colors.quick_letter}[done {job.elapsed:.1f}s{result}]'
+            f'{colors.reset}'
+        )
 
     def _format_selected_item(self, quick_nav: Optional[str], text: str) -> str:
         """Format selected item line."""
@@ -182,7 +844,8 @@ class PPM:
                 f'{self.colors.brackets}[{self.colors.reset}'
                 f'{self.colors.selected}{quick_nav}{self.colors.reset}'
                 f'{self.colors.brackets}]{self.colors.reset}'
-                f'{self.colors.selected}{text[3:]}{self.colors.reset}'
+                f'{self.colors.selected}{_after_chord(quick_nav, text)}'
+                f'{self.colors.reset}'
             )
         return f'{self.colors.selected}{text}{self.colors.reset}'
 
@@ -194,7 +857,7 @@ class PPM:
     ) -> str:
         """Format unselected item line."""
         color = (
-            self.colors.submenu if isinstance(value, dict)
+            self.colors.submenu if isinstance(value, (dict, LazyMenu))
             else self.colors.dim
         )
         if quick_nav:
@@ -202,96 +865,1071 @@ class PPM:
                 f'{self.colors.brackets}[{self.colors.reset}'
                 f'{self.colors.quick_letter}{quick_nav}{self.colors.reset}'
                 f'{self.colors.brackets}]{self.colors.reset}'
-                f'{color}{text[3:]}{self.colors.reset}'
+                f'{color}{_after_chord(quick_nav, text)}{self.colors.reset}'
             )
         return f'{color}{text}{self.colors.reset}'
 
     def _display_footer(self) -> None:
         """Display navigation help."""
         if self.show_nav_help:
-            print(NAVIGATION_HELP)
+            self.frame.line(NAVIGATION_HELP)
 
     # --- Navigation Handling ---
 
     def _handle_navigation(
         self,
-        current_level: dict[str, MenuItem]
-    ) -> Optional[dict[str, MenuItem]]:
+        current_level: Level
+    ) -> Optional[Level]:
         """Handle user input for navigation and selection."""
-        char = self._getch()
-        quick_nav_map = self._get_quick_nav_map(current_level)
-
-        # ALT+Quick Jump
-        if char.startswith('ALT+'):
-            alt_key = char[4:]
-            if alt_key in quick_nav_map:
-                self.current_pos = quick_nav_map[alt_key]
-                return self._activate_item(current_level, self.current_pos)
+        return self._handle_key(current_level, self._getch())
+
+    def _handle_keys(
+        self,
+        current_level: Level,
+        keys: list[str]
+    ) -> Optional[Level]:
+        """
+        Apply a batch of keys, coalescing repeated moves.
+
+        A run of identical moves (e.g. a held `j`) becomes a single
+        position change; every other key is handled one by one.
+        """
+        stats = self.stats
+        if stats is not None:
+            start = stats.clock()
+            action_time = stats.current.get('action', 0.0)
+
+        level: Optional[Level] = current_level
+        if keys or self._chord is not None:
+            self._menu_dirty = True
+        if not keys and self._chord is not None:
+            # Nothing followed an ambiguous chord prefix in time
+            level = self._finish_chord(current_level)
+        groups = deque(coalesce(keys))
+        while groups and level is not None and self.running:
+            if self._pending_action is not None:
+                # Keys typed after an async action run once it finished
+                self._pending_keys.extend(
+                    char for char, count in groups for _ in range(count)
+                )
+                break
+            char, count = groups.popleft()
+            step = self._step(level, char)
+            if step:
+                # Moving on abandons a pending chord prefix
+                self._chord = None
+                self._move(level, step * count)
+                continue
+            level = self._handle_key(level, char)
+            if count > 1:
+                groups.appendleft((char, count - 1))
+
+        if stats is not None:
+            # Actions run while keys are handled are timed separately
+            action_time = stats.current.get('action', 0.0) - action_time
+            stats.record('update', stats.clock() - start - action_time)
+        return level
+
+    def _step(self, current_level: Level, char: str) -> int:
+        """Return how far a key moves the selection, or 0."""
+        binding = self._dispatch_table(current_level).get(char)
+        if binding is None or binding[0] not in MOVES:
+            return 0
+        if self._typing() and len(char) == 1 and char.isprintable():
+            # Text typed into the search or go-to prompt
+            return 0
+        step = MOVES[binding[0]]
+        return step * self.viewport.height if 'page' in binding[0] else step
+
+    def _typing(self) -> bool:
+        """Whether keys go to the search or go-to prompt."""
+        return (
+            self.search is not None
+            or self.goto_query is not None
+            or self._chord is not None
+        )
+
+    def _move(self, current_level: Level, delta: int) -> None:
+        """Move the selection by `delta` items, staying inside the list."""
+        if self.search is not None:
+            total = len(self.search.results())
+        elif self.goto_query is not None:
+            total = len(self._goto_matches)
+        else:
+            total = len(current_level)
+        last = max(total - 1, 0)
+        self.current_pos = min(max(self.current_pos + delta, 0), last)
+
+    def _handle_key(
+        self,
+        current_level: Level,
+        char: str
+    ) -> Optional[Level]:
+        """Handle a single key for navigation and selection."""
+        if self.search is not None:
+            return self._handle_search_key(current_level, char)
+        if self.goto_query is not None:
+            return self._handle_goto_key(current_level, char)
+        if self._chord is not None:
+            return self._handle_chord_key(current_level, char)
+
+        step = self._step(current_level, char)
+        if step:
+            self._move(current_level, step)
             return current_level
 
-        # Normal Quick Jump (except h/j/k/l)
-        if (
-            len(char) == 1
-            and char.lower() in quick_nav_map
-            and char.lower() not in {'h', 'j', 'k', 'l'}
-        ):
-            self.current_pos = quick_nav_map[char.lower()]
-            return self._activate_item(current_level, self.current_pos)
+        binding = self._dispatch_table(current_level).get(char)
+        if binding is None:
+            return current_level
+        command, arg = binding
+        handler = self.commands.get(command)
+        if handler is None:
+            return current_level
+        return handler(current_level, arg)
+
+    def _dispatch_table(self, current_level: Level) -> Table:
+        """Return the compiled key table of a level, compiling it once."""
+        keymap = self.keymap
+        key = (keymap.version, len(current_level.quick_nav_map))
+        entry = current_level.dispatch
+        if entry is None or entry[0] != key:
+            table, conflicts = keymap.compile(current_level.quick_nav_map)
+            for char, command, pos in conflicts:
+                self._report_conflict(current_level, char, command, pos)
+            entry = current_level.dispatch = (key, table)
+        return entry[1]
+
+    def _report_conflict(
+        self,
+        current_level: Level,
+        char: str,
+        command: str,
+        pos: int
+    ) -> None:
+        """Warn, or raise in a strict keymap, about a shadowed quick jump."""
+        message = (
+            f'Quick jump [{char}] of {current_level.labels[pos]!r} is '
+            f'shadowed by the {command!r} key binding.'
+        )
+        if self.keymap.strict:
+            raise PPMError(message)
+        warnings.warn(message, KeymapWarning, stacklevel=2)
 
-        # Vim-style navigation
-        if char in (Keys.ARROW_UP, Keys.K):
-            self.current_pos = max(self.current_pos - 1, 0)
+    # --- Commands ---
+
+    def _command_jump(self, current_level: Level, pos: int) -> Optional[Level]:
+        """Select and activate the item of a quick-jump key."""
+        self.current_pos = pos
+        return self._activate_item(current_level, pos)
+
+    def _command_chord(self, current_level: Level, node: ChordNode) -> Level:
+        """Follow a typed chord letter; jump once the chord is complete."""
+        if node.only is not None:
+            self._chord = None
+            return self._command_jump(current_level, node.only)
+        self._chord = node
+        return current_level
+
+    def _handle_chord_key(
+        self,
+        current_level: Level,
+        char: str
+    ) -> Optional[Level]:
+        """Handle the key after a chord prefix."""
+        node = self._chord
+        child = node.children.get(char.lower()) if node else None
+        if child is not None:
+            return self._command_chord(current_level, child)
+        if char == Keys.ESCAPE:
+            self._chord = None
             return current_level
-        if char in (Keys.ARROW_DOWN, Keys.J):
-            self.current_pos = min(self.current_pos + 1, len(current_level) - 1)
+        level = self._finish_chord(current_level)
+        if level is None:
+            return level
+        return self._handle_key(level, char)
+
+    def _finish_chord(self, current_level: Level) -> Optional[Level]:
+        """End a chord; jump if the typed prefix is a chord itself."""
+        node, self._chord = self._chord, None
+        if node is None or node.position is None:
             return current_level
-        if char in (Keys.ARROW_LEFT, Keys.H):
-            if self.path:
-                prev_level, prev_pos = self.path.pop()
-                self.current_pos = prev_pos
-                return prev_level
+        return self._command_jump(current_level, node.position)
+
+    def _command_home(self, current_level: Level, arg: Any) -> Level:
+        """Select the first item."""
+        self.current_pos = 0
+        return current_level
+
+    def _command_end(self, current_level: Level, arg: Any) -> Level:
+        """Select the last item."""
+        self._move(current_level, len(current_level))
+        return current_level
+
+    def _command_back(self, current_level: Level, arg: Any) -> Level:
+        """Return to the parent level."""
+        if self.path:
+            prev_level, prev_pos = self.path.pop()
+            self.current_pos = prev_pos
+            return prev_level
+        return current_level
+
+    def _command_select(
+        self,
+        current_level: Level,
+        arg: Any
+    ) -> Optional[Level]:
+        """Activate the selected item, e.g. open a submenu."""
+        return self._activate_item(current_level, self.current_pos)
+
+    def _command_run_batch(
+        self,
+        current_level: Level,
+        arg: Any
+    ) -> Optional[Level]:
+        """Run the marked items, or activate the selected one."""
+        if self.marks:
+            self.run_batch()
             return current_level
-        if char in (Keys.ARROW_RIGHT, Keys.L, Keys.ENTER, Keys.NEWLINE):
-            return self._activate_item(current_level, self.current_pos)
-        if char == Keys.Q:
-            self.running = False
-            return None
+        return self._activate_item(current_level, self.current_pos)
+
+    def _command_search(self, current_level: Level, arg: Any) -> Level:
+        """Enter search mode."""
+        self._start_search(current_level)
+        return current_level
 
+    def _command_goto(self, current_level: Level, arg: Any) -> Level:
+        """Open the go-to prompt."""
+        self._start_goto()
         return current_level
 
+    def _command_recent(self, current_level: Level, arg: Any) -> Level:
+        """Open the go-to prompt listing the most used paths."""
+        if self.usage is not None:
+            self._start_goto()
+            self._goto_matches = self.usage.recent(MAX_COMPLETIONS)
+            self._goto_recent = True
+        return current_level
+
+    def _command_cancel_job(self, current_level: Level, arg: Any) -> Level:
+        """Cancel the queued job of the selected item."""
+        self._cancel_job(current_level)
+        return current_level
+
+    def _command_mark(self, current_level: Level, arg: Any) -> Level:
+        """Toggle the mark of the selected item and move down."""
+        pos = self.current_pos
+        if pos < len(current_level):
+            on = not self._is_marked(current_level, pos)
+            self.mark(current_level, [pos], on)
+            self._mark_anchor = pos
+            self._move(current_level, 1)
+        return current_level
+
+    def _command_mark_range(self, current_level: Level, arg: Any) -> Level:
+        """Mark the items between the last marked one and the selection."""
+        anchor = self._mark_anchor
+        if anchor is None or anchor >= len(current_level):
+            anchor = self.current_pos
+        low, high = sorted((anchor, self.current_pos))
+        self.mark(current_level, range(low, high + 1))
+        return current_level
+
+    def _command_mark_all(self, current_level: Level, arg: Any) -> Level:
+        """Mark every item of the level, or clear them if all are."""
+        everything = range(len(current_level))
+        all_marked = len(self._marked(current_level)) == len(current_level)
+        self.mark(current_level, everything, not all_marked)
+        return current_level
+
+    def _command_clear_marks(self, current_level: Level, arg: Any) -> Level:
+        """Clear all marks and the view of a finished batch."""
+        self.marks.clear()
+        self._mark_anchor = None
+        if self.batch is not None and not self.batch.active():
+            self.batch = None
+        return current_level
+
+    def _command_quit(self, current_level: Level, arg: Any) -> None:
+        """Leave the menu."""
+        self.running = False
+        return None
+
     def _activate_item(
         self,
-        current_level: dict[str, MenuItem],
+        current_level: Level,
         pos: int
-    ) -> Optional[dict[str, MenuItem]]:
+    ) -> Optional[Level]:
         """Activate the menu item at the given position."""
         if not current_level or pos >= len(current_level):
             return current_level
 
-        key = list(current_level.keys())[pos]
-        item = current_level[key]
-        value = item.value
+        key = current_level.labels[pos]
+        value = current_level.item_values[pos]
+        kind = current_level.kinds[pos]
 
-        if callable(value):
+        if self.usage is not None:
+            self.usage.record(self._path_label(key)[1:])
+        if kind == ACTION and self.jobs is not None:
+            self._start_job(key, value)
+            return current_level
+        if kind == ACTION:
             self._clear_screen()
-            value()
+            self.renderer.invalidate()
+            self._run_action(value, key)
             return current_level
-        if isinstance(value, dict) and value:
+        if kind == LAZY:
+            value = self._get_lazy_level(value)
+            if not value:
+                return current_level
             self.path.append((current_level, self.current_pos))
-            self.current_pos = 0
-            return self._process_menu_structure(value)
+            self.current_pos = self._likeliest(value)
+            return value
+        if kind == SUBMENU and value:
+            level = self._get_level(value)
+            self.path.append((current_level, self.current_pos))
+            self.current_pos = self._likeliest(level)
+            return level
 
+        self.renderer.invalidate()
         print(f'\nSelected: {key} -> {value}')
         return current_level
 
+    def _run_action(self, action: Callable[[], Any], key: str = '') -> None:
+        """Run a menu action, timing it when `stats` is enabled."""
+        stats = self.stats
+        if stats is None:
+            self._call_action(action)
+            return
+
+        start = stats.clock()
+        try:
+            self._call_action(action)
+        except Exception:
+            self._record_action(key, stats.clock() - start, failed=True)
+            raise
+        if self._pending_action is None:
+            self._record_action(key, stats.clock() - start)
+        else:
+            # Timed by run_async() once the coroutine was awaited
+            self._pending_key = key
+
+    def _record_action(
+        self,
+        key: str,
+        seconds: float,
+        failed: bool = False
+    ) -> None:
+        """Add an action's duration to the phase and path statistics."""
+        if self.stats is not None:
+            self.stats.record('action', seconds)
+            self.stats.action(self._path_label(key), seconds, failed)
+
+    def _call_action(self, action: Callable[[], Any]) -> None:
+        """
+        Run a menu action with the terminal in cooked mode.
+
+        Coroutine functions are awaited: by `run_async()` on its own event
+        loop, or with `asyncio.run()` when the menu runs synchronously.
+        """
+        with self.terminal.cooked():
+            result = action()
+            if not inspect.isawaitable(result):
+                return
+            if self._loop is None:
+                asyncio.run(_await(result))
+                return
+        self._pending_action = result
+
+    def _start_job(self, key: str, action: Callable[[], Any]) -> None:
+        """
+        Start an action on the job runner, redrawing when it finishes.
+
+        The job is kept under the item's path, so items that share an
+        action run and show jobs of their own.
+        """
+        if self.jobs is None:
+            return
+        job = self.jobs.submit(key, action, self._path_label(key))
+        self._watch_job(job, key)
+
+    def _watch_job(self, job: Job, key: str) -> None:
+        """Redraw when a job finishes, and time it when `stats` is on."""
+        job.future.add_done_callback(lambda _: self.request_redraw())
+        if self.stats is not None:
+            stats, path = self.stats, self._path_label(key)
+            job.future.add_done_callback(
+                lambda _: stats.action(
+                    path, job.elapsed, failed=job.status == 'failed'
+                )
+            )
+
+    def _job_of(self, current_level: Level, pos: int) -> Optional[Job]:
+        """Return the latest job of an item, from the batch or `jobs`."""
+        job = None
+        if self.batch is not None:
+            job = self.batch.job(current_level, pos)
+        if job is None and self.jobs is not None:
+            job = self.jobs.get(self._path_label(current_level.labels[pos]))
+        return job
+
+    def _background_active(self) -> bool:
+        """Whether a job or batch is queued or running."""
+        return bool(
+            self.jobs and self.jobs.active()
+            or self.batch and self.batch.active()
+        )
+
+    def _cancel_job(self, current_level: Level) -> None:
+        """Cancel the queued job of the selected item."""
+        pos = self.current_pos
+        if (
+            self.jobs is not None
+            and pos < len(current_level)
+            and current_level.kinds[pos] == ACTION
+        ):
+            self.jobs.cancel(self._path_label(current_level.labels[pos]))
+
+    def _likeliest(self, level: Level) -> int:
+        """
+        Return the position to select when a level opens.
+
+        With `usage` set, this is the item selected most often and most
+        recently from the level, else the first item.
+        """
+        usage = self.usage
+        if usage is None or not usage.preselect:
+            return 0
+        for label in usage.likely(self._path_label()[1:]):
+            try:
+                return level.index(label)
+            except KeyError:
+                continue
+        return 0
+
+    def _path_label(self, key: str = '') -> str:
+        """Return the current menu path, e.g. '/File/Recent'."""
+        names = [level.labels[pos] for level, pos in self.path]
+        if key:
+            names.append(key)
+        return '/' + '/'.join(names)
+
+    # --- Marks and Batches ---
+
+    def mark(
+        self,
+        level: Level,
+        positions: Iterable[int],
+        on: bool = True
+    ) -> None:
+        """
+        Mark or unmark items of a level for the next batch.
+
+        Args:
+            level: Level holding the items.
+            positions: Positions of the items.
+            on: Whether to set or clear the marks.
+        """
+        entry = self.marks.setdefault(id(level), (level, set()))
+        if on:
+            entry[1].update(positions)
+        else:
+            entry[1].difference_update(positions)
+        if not entry[1]:
+            del self.marks[id(level)]
+
+    def marked(self) -> list[tuple[Level, int]]:
+        """Return `(level, position)` of every marked item."""
+        return [
+            (level, pos) for level, positions in self.marks.values()
+            for pos in sorted(positions)
+        ]
+
+    def _marked(self, level: Level) -> set[int]:
+        """Return the marked positions of a level."""
+        entry = self.marks.get(id(level))
+        return entry[1] if entry is not None else set()
+
+    def _is_marked(self, level: Level, pos: int) -> bool:
+        """Whether an item is marked."""
+        return pos in self._marked(level)
+
+    def _mark_matches(self, current_level: Level, search: Search) -> None:
+        """Mark every item matching a search, in any level."""
+        results = search.results()
+        if search.targets is None:
+            self.mark(current_level, results)
+            return
+        for idx in results:
+            *parents, pos = search.targets[idx]
+            level: Optional[Level] = self.menu
+            for parent in parents:
+                level = self._sublevel(level, parent) if level else None
+            if level is not None:
+                self.mark(level, [pos])
+
+    def run_batch(
+        self,
+        items: Optional[list[tuple[Level, int]]] = None
+    ) -> Batch:
+        """
+        Start marked items together and clear their marks.
+
+        Items whose values share a `BatchAction` function are passed to
+        it in one call; other actions run one per job. Jobs go to the
+        executor of `jobs`, or to a pool of `batch_workers` threads, so
+        the menu stays responsive and shows the progress of each item.
+
+        Args:
+            items: `(level, position)` pairs to run instead of the marked
+                items.
+
+        Returns:
+            The started batch, also kept in `batch`.
+        """
+        if items is None:
+            items = self.marked()
+            self.marks.clear()
+        self._mark_anchor = None
+
+        if self.jobs is not None:
+            executor = self.jobs.executor
+            batch = Batch(items, executor, self.jobs.clock)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.batch_workers)
+            batch = Batch(items, executor)
+            # Queued jobs still run; the pool goes away once they did
+            executor.shutdown(wait=False)
+
+        for job in batch.jobs():
+            self._watch_job(job, job.name)
+        self.batch = batch
+        self.request_redraw()
+        return batch
+
+    # --- Search ---
+
+    def _start_search(self, current_level: Level) -> None:
+        """Enter search mode over the current level."""
+        self._search_return_pos = self.current_pos
+        self.search = Search(self._get_level_index(current_level))
+        self.current_pos = 0
+
+    def _get_level_index(
+        self,
+        current_level: Level
+    ) -> SearchIndex:
+        """Return the search index of a level, building it once."""
+        if (
+            current_level is not self._index_level
+            or self._level_index is None
+            or len(self._level_index) != len(current_level)
+        ):
+            self._index_level = current_level
+            self._level_index = SearchIndex(list(current_level.labels))
+        return self._level_index
+
+    def _get_tree_index(self) -> tuple[SearchIndex, list[tuple[int, ...]]]:
+        """Return the search index of the whole menu tree, building it once."""
+        if self._shared is not None:
+            return self._shared._get_tree_index()
+        if self._tree_index is None:
+            paths, targets = self._get_tree_paths()
+            labels = [' › '.join(path) for path in paths]
+            self._tree_index = (SearchIndex(labels), targets)
+        return self._tree_index
+
+    def _get_tree_paths(
+        self
+    ) -> tuple[list[tuple[str, ...]], list[tuple[int, ...]]]:
+        """Return the label path and position of every item, once."""
+        if self._shared is not None:
+            return self._shared._get_tree_paths()
+        if self._tree_paths is None:
+            paths: list[tuple[str, ...]] = []
+            targets: list[tuple[int, ...]] = []
+            self._collect_tree(self.menu, (), (), paths, targets)
+            self._tree_paths = (paths, targets)
+        return self._tree_paths
+
+    def _collect_tree(
+        self,
+        level: Level,
+        names: tuple[str, ...],
+        positions: tuple[int, ...],
+        paths: list[tuple[str, ...]],
+        targets: list[tuple[int, ...]]
+    ) -> None:
+        """Add a level and its submenus to the tree index lists."""
+        items = zip(level.labels, level.kinds, level.item_values)
+        for pos, (key, kind, value) in enumerate(items):
+            path = names + (key,)
+            target = positions + (pos,)
+            paths.append(path)
+            targets.append(target)
+            if kind == SUBMENU and value:
+                submenu = self._get_level(value)
+                self._collect_tree(submenu, path, target, paths, targets)
+
+    def _handle_search_key(
+        self,
+        current_level: Level,
+        char: str
+    ) -> Optional[Level]:
+        """Handle a key while search mode is active."""
+        search = self.search
+        if search is None:
+            return current_level
+
+        if char == Keys.ESCAPE:
+            self.search = None
+            self.current_pos = self._search_return_pos
+            return current_level
+        if char in (Keys.ENTER, Keys.NEWLINE, Keys.ARROW_RIGHT):
+            results = search.results()
+            if not results:
+                return current_level
+            idx = results[self.current_pos]
+            self.search = None
+            if search.targets is not None:
+                return self._jump_to(search.targets[idx])
+            self.current_pos = idx
+            return self._activate_item(current_level, idx)
+        if char == Keys.HOME:
+            self.current_pos = 0
+            return current_level
+        if char == Keys.END:
+            self._move(current_level, len(search.results()))
+            return current_level
+        if char == Keys.CTRL_A:
+            # Mark the matches and go back to the level
+            self._mark_matches(current_level, search)
+            self.search = None
+            self.current_pos = self._search_return_pos
+            return current_level
+
+        if char == Keys.TAB:
+            if search.targets is None:
+                index, targets = self._get_tree_index()
+                self.search = Search(index, targets)
+            else:
+                self.search = Search(self._get_level_index(current_level))
+            text = search.query
+        elif char in (Keys.BACKSPACE, Keys.CTRL_H):
+            search.pop()
+            text = ''
+        elif char.startswith(Keys.PASTE):
+            text = char[len(Keys.PASTE):]
+        elif len(char) == 1 and char.isprintable():
+            text = char
+        else:
+            return current_level
+
+        for ch in text:
+            if ch.isprintable():
+                self.search.push(ch)
+        self.current_pos = 0
+        return current_level
+
+    def _jump_to(
+        self,
+        positions: tuple[int, ...]
+    ) -> Optional[Level]:
+        """Open the item at a tree position, entering each submenu."""
+        self.path.clear()
+        level = self.menu
+        for pos in positions:
+            self.current_pos = pos
+            next_level = self._activate_item(level, pos)
+            if next_level is None:
+                return None
+            level = next_level
+        return level
+
+    # --- Go To ---
+
+    def goto(self, path: str) -> Level:
+        """
+        Open the level of a nested item and select the item.
+
+        The back-stack in `path` is rebuilt in one step, so going back
+        works as if the user had navigated there. Paths of regular
+        submenus are looked up in a prebuilt index; lazy submenus are
+        opened level by level.
+
+        Args:
+            path: Labels from the root, e.g. 'File/Recent/report.txt'.
+
+        Returns:
+            The level showing the item. `run()` switches to it as well.
+
+        Raises:
+            PPMError: If no item has this path.
+        """
+        level = self._jump_level = self._goto(path)
+        self.request_redraw()
+        return level
+
+    def _goto(self, path: str) -> Level:
+        """Open the level of a nested item; see `goto()`."""
+        target = self._get_path_index().get(path)
+        if target is None:
+            target = self._find_path(path)
+        return self._open_path(target)
+
+    def _get_path_index(self) -> PathIndex:
+        """Return the index of all item paths, building it once."""
+        if self._shared is not None:
+            return self._shared._get_path_index()
+        if self._path_index is None:
+            self._path_index = PathIndex(*self._get_tree_paths())
+        return self._path_index
+
+    def _find_path(self, path: str) -> tuple[int, ...]:
+        """Resolve a path by looking up each label in its level."""
+        names = path.strip(SEPARATOR).split(SEPARATOR)
+        positions: list[int] = []
+        level: Optional[Level] = self.menu
+        for name in names:
+            if level is None:
+                raise PPMError(f'No menu item at path: {path}')
+            try:
+                pos = level.index(name)
+            except KeyError:
+                raise PPMError(f'No menu item at path: {path}') from None
+            positions.append(pos)
+            level = self._sublevel(level, pos)
+        return tuple(positions)
+
+    def _open_path(self, positions: tuple[int, ...]) -> Level:
+        """Rebuild `path` for a tree position and select its item."""
+        stack: list[tuple[Level, int]] = []
+        level = self.menu
+        for pos in positions[:-1]:
+            sublevel = self._sublevel(level, pos)
+            if sublevel is None:
+                raise PPMError('Menu path does not lead through submenus.')
+            stack.append((level, pos))
+            level = sublevel
+        self.path[:] = stack
+        self.current_pos = positions[-1]
+        return level
+
+    def _sublevel(self, level: Level, pos: int) -> Optional[Level]:
+        """Return the submenu level of an item, or None for other items."""
+        kind = level.kinds[pos]
+        value = level.item_values[pos]
+        if kind == SUBMENU and value:
+            return self._get_level(value)
+        if kind == LAZY:
+            return self._get_lazy_level(value)
+        return None
+
+    def _start_goto(self) -> None:
+        """Open the go-to prompt."""
+        self._search_return_pos = self.current_pos
+        self.goto_query = ''
+        self._update_goto()
+
+    def _update_goto(self) -> None:
+        """List the paths completing the prompt text."""
+        self._goto_matches = self._get_path_index().complete(
+            self.goto_query or '', MAX_COMPLETIONS
+        )
+        self._goto_recent = False
+        self.current_pos = 0
+
+    def _handle_goto_key(
+        self,
+        current_level: Level,
+        char: str
+    ) -> Optional[Level]:
+        """Handle a key while the go-to prompt is open."""
+        query = self.goto_query or ''
+        if char == Keys.ESCAPE:
+            self.goto_query = None
+            self.current_pos = self._search_return_pos
+            return current_level
+        if char in (Keys.ENTER, Keys.NEWLINE):
+            matches = self._goto_matches
+            path = matches[self.current_pos] if matches else query
+            self.goto_query = None
+            try:
+                return self._goto(path)
+            except PPMError:
+                self.current_pos = self._search_return_pos
+                return current_level
+        if char == Keys.HOME:
+            self.current_pos = 0
+            return current_level
+        if char == Keys.END:
+            self._move(current_level, len(self._goto_matches))
+            return current_level
+
+        if char == Keys.TAB:
+            self.goto_query = self._get_path_index().extend(query)
+        elif char in (Keys.BACKSPACE, Keys.CTRL_H):
+            self.goto_query = query[:-1]
+        elif char.startswith(Keys.PASTE):
+            text = char[len(Keys.PASTE):]
+            self.goto_query = query + ''.join(
+                ch for ch in text if ch.isprintable()
+            )
+        elif len(char) == 1 and char.isprintable():
+            self.goto_query = query + char
+        else:
+            return current_level
+        self._update_goto()
+        return current_level
+
+    def _take_jump(self, level: Optional[Level]) -> Optional[Level]:
+        """Return the level opened by `goto()`, if any, else `level`."""
+        jump, self._jump_level = self._jump_level, None
+        if jump is not None:
+            self._menu_dirty = True
+        return jump if jump is not None else level
+
     # --- Main Loop ---
 
     def run(self) -> None:
         """Run the menu system."""
-        current_level = self.menu
-        while self.running:
-            self._display_menu(current_level)
-            new_level = self._handle_navigation(current_level)
-            if new_level is not current_level:
-                current_level = new_level or self.menu
+        current_level = self._first_level()
+        try:
+            with self.terminal:
+                while self.running:
+                    self._display_menu(current_level)
+                    try:
+                        keys = self._read_keys()
+                    except EOFError:
+                        break
+                    new_level = self._take_jump(
+                        self._handle_keys(current_level, keys)
+                    )
+                    if self.stats is not None:
+                        self.stats.end_iteration()
+                    if new_level is not current_level:
+                        current_level = new_level or self.menu
+        finally:
+            self.keys.close()
+            self._finish()
+
+    async def run_async(self) -> None:
+        """
+        Run the menu system inside a running asyncio event loop.
+
+        Keys are read through `loop.add_reader`, so other tasks keep
+        running while the menu waits for input. Menu values may be
+        coroutine functions; they are awaited with the terminal in
+        cooked mode. Call `request_redraw()` to draw a new frame, e.g.
+        after data shown by `_display_cart` changed.
+        """
+        fd = self.keys.fileno()
+        if fd is None:
+            raise PPMError('run_async() needs stdin with a file descriptor.')
+
+        self._loop = asyncio.get_running_loop()
+        self._events = asyncio.Queue()
+        current_level = self._first_level()
+        try:
+            with self.terminal:
+                self._loop.add_reader(fd, self._on_input, fd)
+                while self.running:
+                    self._display_menu(current_level)
+                    keys = await self._next_keys()
+                    new_level = self._handle_keys(current_level, keys)
+                    if self._pending_action is not None:
+                        await self._await_action(fd)
+                    new_level = self._take_jump(new_level)
+                    if self.stats is not None:
+                        self.stats.end_iteration()
+                    if new_level is not current_level:
+                        current_level = new_level or self.menu
+        finally:
+            self._loop.remove_reader(fd)
+            self._loop = None
+            self._events = None
+            self._finish()
+
+    def _first_level(self) -> Level:
+        """Return the level a run starts on, selecting its likeliest item."""
+        level = self._take_jump(self.menu) or self.menu
+        if level is self.menu and not self.path and self.current_pos == 0:
+            self.current_pos = self._likeliest(level)
+        return level
+
+    def _finish(self) -> None:
+        """Save the usage statistics and stop prefetching after a run."""
+        if self.usage is not None:
+            self.usage.save()
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown(wait=False, cancel_futures=True)
+            self._prefetcher = None
+        self._prefetched.clear()
+
+    def request_redraw(self) -> None:
+        """
+        Ask the running menu to draw a new frame.
+
+        Safe to call from other tasks and from other threads.
+        """
+        self._menu_dirty = True
+        self._wake()
+
+    def _wake(self) -> None:
+        """Make the loop that waits for keys draw a frame."""
+        loop, events = self._loop, self._events
+        if loop is not None and events is not None:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+        else:
+            self.keys.wake()
+
+    def _on_resize(self) -> None:
+        """
+        Note a terminal resize; called from the SIGWINCH handler.
+
+        Only the first event of a burst wakes the loop. The new layout is
+        drawn once no further event came in for `RESIZE_DEBOUNCE`.
+        """
+        first = self._resized_at is None
+        self._resized_at = time.monotonic()
+        if first:
+            self._wake()
+
+    def _resizing(self) -> bool:
+        """Whether a burst of resize events is still going on."""
+        resized_at = self._resized_at
+        if resized_at is None:
+            return False
+        if time.monotonic() - resized_at < RESIZE_DEBOUNCE:
+            return True
+        self._resized_at = None
+        self._menu_dirty = True
+        self.renderer.invalidate()
+        return False
+
+    async def _next_keys(self) -> list[str]:
+        """Wait for keys or a redraw request; return all pending keys."""
+        events = self._events
+        if events is None:
+            return []
+        keys = list(self._pending_keys)
+        self._pending_keys.clear()
+        if not keys:
+            timeout = self._input_timeout()
+            stats = self.stats
+            start = stats.clock() if stats is not None else 0.0
+            try:
+                batch = await asyncio.wait_for(events.get(), timeout)
+            except asyncio.TimeoutError:
+                batch = None
+            if stats is not None:
+                stats.record('input', stats.clock() - start)
+            keys.extend(batch or [])
+        while not events.empty():
+            keys.extend(events.get_nowait() or [])
+        return keys
+
+    def _on_input(self, fd: int) -> None:
+        """Decode the bytes that are ready on stdin and queue the keys."""
+        try:
+            keys = self.keys.read_ready()
+        except EOFError:
+            self.running = False
+            keys = []
+            if self._loop is not None:
+                self._loop.remove_reader(fd)
+        if self._events is not None:
+            self._events.put_nowait(keys)
+        if self.keys.decoder.pending and self._loop is not None:
+            self._loop.call_later(ESC_TIMEOUT, self._on_escape_timeout)
+
+    def _on_escape_timeout(self) -> None:
+        """Report a lone ESC once no more of its sequence arrived."""
+        if not self.keys.decoder.pending or self._events is None:
+            return
+        keys = self.keys.decoder.flush()
+        if keys:
+            self._events.put_nowait(keys)
+
+    async def _await_action(self, fd: int) -> None:
+        """Await the coroutine started by the last activated item."""
+        action, self._pending_action = self._pending_action, None
+        if self._loop is None:
+            return
+        self._loop.remove_reader(fd)
+        stats = self.stats
+        start = stats.clock() if stats is not None else 0.0
+        try:
+            with self.terminal.cooked():
+                await action
+        except Exception:
+            if stats is not None:
+                elapsed = stats.clock() - start
+                self._record_action(self._pending_key, elapsed, failed=True)
+            raise
+        else:
+            if stats is not None:
+                elapsed = stats.clock() - start
+                self._record_action(self._pending_key, elapsed)
+        finally:
+            self.renderer.invalidate()
+            self._loop.add_reader(fd, self._on_input, fd)
+
+
+def split_keys(
+    keys: Iterable[str]
+) -> tuple[list[str], list[Optional[str]], dict[str, int]]:
+    """
+    Split `[x] Label` keys into labels and quick-jump letters.
+
+    Args:
+        keys: Keys of one raw menu level.
+
+    Returns:
+        Labels, quick-jump letter of each key (or None), and the map of
+        quick-jump letters to positions.
+
+    Raises:
+        PPMError: If a quick-jump letter is used twice.
+    """
+    labels: list[str] = []
+    quick_navs: list[Optional[str]] = []
+    quick_nav_map: dict[str, int] = {}
+
+    for idx, key in enumerate(keys):
+        match = QUICK_NAV_PATTERN.match(key)
+        if match:
+            quick_nav = match.group(1).lower()
+            if quick_nav in quick_nav_map:
+                raise PPMError(f'Duplicate quick jump letter: [{quick_nav}] detected.')
+            quick_nav_map[quick_nav] = idx
+            labels.append(match.group(2).strip())
+            quick_navs.append(quick_nav)
+        else:
+            labels.append(key)
+            quick_navs.append(None)
+
+    return labels, quick_navs, quick_nav_map
+
+
+def _after_chord(quick_nav: str, text: str) -> str:
+    """Return an item key without its `[x]` prefix, keeping the space."""
+    prefix = f'[{quick_nav}]'
+    if text[:len(prefix)].lower() == prefix:
+        return text[len(prefix):]
+    return f' {text}'
+
+
+def _preview(value: Any, width: int = 40) -> str:
+    """Return a one-line, shortened text of a job result or error."""
+    text = ' '.join(str(value).split())
+    return text if len(text) <= width else text[:width - 1] + '…'
+
 
+def _use_color() -> bool:
+    """Whether output should contain color escape sequences."""
+    if os.environ.get('NO_COLOR'):
+        return False
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Running many marked menu items as one batch."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import time
+
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from .jobs import Job, _call
+from .level import ACTION, Level
+
+
+class BatchAction:
+    """
+    Menu action that can run for many items in one call.
+
+    Activated alone, it calls `func([arg])`. When several marked items
+    share the same `func`, a batch calls it once with all their
+    arguments, e.g. one `deploy(hosts)` instead of a deploy per host.
+
+    Example:
+        menu = {host: BatchAction(deploy, host) for host in hosts}
+    """
+
+    __slots__ = ('func', 'arg')
+
+    def __init__(self, func: Callable[[list[Any]], Any], arg: Any):
+        """
+        Initialize the action.
+
+        Args:
+            func: Callable taking a list of arguments.
+            arg: Argument of this item.
+        """
+        self.func = func
+        self.arg = arg
+
+    def __call__(self) -> Any:
+        """Run the action for this item alone."""
+        return self.func([self.arg])
+
+    def __repr__(self) -> str:
+        """Return a short description of the action."""
+        name = getattr(self.func, '__name__', repr(self.func))
+        return f'BatchAction({name}, {self.arg!r})'
+
+
+class Batch:
+    """
+    Marked items started together, with their progress and results.
+
+    Actions sharing a `BatchAction` function run as one job; every other
+    action runs as its own job. All jobs go to one executor, so at most
+    its number of workers run at the same time.
+    """
+
+    def __init__(
+        self,
+        items: list[tuple[Level, int]],
+        executor: Executor,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Start the actions of the given items.
+
+        Args:
+            items: `(level, position)` of every marked item; items that
+                are not actions are skipped.
+            executor: Executor the jobs are submitted to.
+            clock: Time source, in seconds.
+        """
+        self.items = [
+            (level, pos) for level, pos in items
+            if level.kinds[pos] == ACTION
+        ]
+        self._jobs: dict[tuple[int, int], Job] = {}
+
+        groups: dict[int, list[tuple[Level, int]]] = {}
+        for level, pos in self.items:
+            value = level.item_values[pos]
+            if isinstance(value, BatchAction):
+                groups.setdefault(id(value.func), []).append((level, pos))
+            else:
+                future = executor.submit(_call, value)
+                job = Job(level.labels[pos], future, clock)
+                self._add(job, [(level, pos)])
+
+        for members in groups.values():
+            values = [level.item_values[pos] for level, pos in members]
+            action = partial(values[0].func, [value.arg for value in values])
+            level, pos = members[0]
+            name = level.labels[pos]
+            if len(members) > 1:
+                name += f' +{len(members) - 1}'
+            job = Job(name, executor.submit(_call, action), clock)
+            self._add(job, members)
+
+    def _add(self, job: Job, members: list[tuple[Level, int]]) -> None:
+        """Record the job that runs the given items."""
+        for level, pos in members:
+            self._jobs[(id(level), pos)] = job
+
+    def job(self, level: Level, pos: int) -> Optional[Job]:
+        """Return the job running an item, if it is part of the batch."""
+        return self._jobs.get((id(level), pos))
+
+    def jobs(self) -> list[Job]:
+        """Return every job of the batch once."""
+        return list({id(job): job for job in self._jobs.values()}.values())
+
+    def active(self) -> bool:
+        """Whether any job is queued or running."""
+        return any(job.active for job in self.jobs())
+
+    def progress(self) -> dict[str, int]:
+        """Count the items by the status of their job."""
+        counts: dict[str, int] = {}
+        for _, job in self._labeled_jobs():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def results(self) -> dict[str, Any]:
+        """Return the result of every finished item by label."""
+        return {
+            label: job.result for label, job in self._labeled_jobs()
+            if job.status == 'done'
+        }
+
+    def errors(self) -> dict[str, BaseException]:
+        """Return the exception of every failed item by label."""
+        return {
+            label: job.error for label, job in self._labeled_jobs()
+            if job.error is not None
+        }
+
+    def _labeled_jobs(self) -> list[tuple[str, Job]]:
+        """Return the label and job of every item."""
+        return [
+            (level.labels[pos], self._jobs[(id(level), pos)])
+            for level, pos in self.items
+        ]
+
+    def summary(self) -> str:
+        """Describe the progress, e.g. '12/40 done, 1 failed, 4 running'."""
+        counts = self.progress()
+        parts = [f"{counts.get('done', 0)}/{len(self.items)} done"]
+        for status in ('failed', 'cancelled', 'running', 'queued'):
+            if counts.get(status):
+                parts.append(f'{counts[status]} {status}')
+        return ', '.join(parts)
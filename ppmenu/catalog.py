@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Menus loaded from JSON or TOML catalogs, with a compiled on-disk cache."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import functools
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+
+from typing import Any, Callable, Mapping, Optional
+
+from . import PPMError, split_keys
+from .lazy import LazyMenu
+from .level import Level
+
+# Key marking an action reference in a catalog: {"@action": "name"}
+ACTION_KEY = '@action'
+
+# Optional positional arguments of an action reference
+ARGS_KEY = 'args'
+
+# Suffix of the compiled cache written next to the catalog
+CACHE_SUFFIX = '.ppmc'
+
+CACHE_MAGIC = b'PPMC'
+CACHE_VERSION = 2
+
+# Interpreter that wrote a cache; marshal data is only read back by the
+# same implementation, Python version and marshal format
+CACHE_TAG = f'{sys.implementation.cache_tag}-{marshal.version}'.encode()
+
+# Magic, version, interpreter tag, source mtime (ns), source size,
+# root offset, offset of the action names, sha256
+HEADER = struct.Struct('<4sI32sqqQQ32s')
+RECORD_LENGTH = struct.Struct('<I')
+
+# Kinds of compiled entries
+_VALUE, _ACTION, _SUBMENU = range(3)
+
+
+class CatalogMenu(LazyMenu):
+    """Submenu of a catalog, decoded from the compiled cache when opened."""
+
+    def __init__(self, catalog: 'Catalog', offset: int):
+        """
+        Initialize the submenu.
+
+        Args:
+            catalog: Catalog the submenu belongs to.
+            offset: Position of the submenu's record in the cache.
+        """
+        super().__init__(provider=lambda: catalog.level(offset))
+        self.catalog = catalog
+        self.offset = offset
+
+    def load(self) -> Level:  # type: ignore[override]
+        """Decode the submenu's level."""
+        return self.catalog.level(self.offset)
+
+
+class Catalog:
+    """
+    Menu tree read from a JSON or TOML file.
+
+    Nested tables are submenus; `{"@action": "name", "args": [...]}`
+    calls the action registered under `name`; any other value is a plain
+    value. The file is compiled once into a cache of one record per
+    level. Later runs read only the header and the levels that are
+    opened, as long as the catalog did not change.
+
+    Example:
+        catalog = Catalog('menu.json', {'deploy': deploy})
+        PPM(catalog.root()).run()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        actions: Mapping[str, Callable[..., Any]],
+        cache_path: Optional[str] = None,
+    ):
+        """
+        Open a catalog, compiling it when the cache is missing or stale.
+
+        Args:
+            path: JSON (`.json`) or TOML (`.toml`) catalog file.
+            actions: Actions that the catalog may reference, by name.
+            cache_path: Where to keep the compiled cache. Defaults to the
+                catalog path plus `.ppmc`. When it cannot be written, the
+                compiled catalog is kept in memory.
+
+        Raises:
+            PPMError: If the catalog cannot be read or is invalid.
+        """
+        self.path = path
+        self.actions = actions
+        self.cache_path = cache_path or path + CACHE_SUFFIX
+        self.compiled: bool = False
+        # Every action name referenced anywhere in the catalog
+        self.action_names: list[str] = []
+        self._data: Optional[bytes] = None
+
+        try:
+            stat = os.stat(path)
+        except OSError as error:
+            raise PPMError(f'Cannot read catalog {path}: {error}') from error
+        self.root_offset = self._cached_root(stat)
+        if self.root_offset is None:
+            self.root_offset = self._compile(stat)
+        self._check_actions()
+
+    def root(self) -> Level:
+        """Return the top level of the catalog."""
+        return self.level(self.root_offset)
+
+    def level(self, offset: int) -> Level:
+        """Decode the level stored at an offset of the cache."""
+        original_keys, labels, quick_navs, quick_nav_map, entries = (
+            marshal.loads(self._read_record(offset))
+        )
+        values = [self._value(kind, payload) for kind, payload in entries]
+        return Level(labels, original_keys, quick_navs, values, quick_nav_map)
+
+    def _value(self, kind: int, payload: Any) -> Any:
+        """Turn a compiled entry back into a menu value."""
+        if kind == _SUBMENU:
+            return CatalogMenu(self, payload)
+        if kind == _ACTION:
+            name, args = payload
+            return resolve_action(self.actions, name, args)
+        return payload
+
+    def _check_actions(self) -> None:
+        """
+        Check that every action the catalog references is registered.
+
+        Raises:
+            PPMError: If an action name is unknown, in any submenu.
+        """
+        missing = sorted(set(self.action_names) - set(self.actions))
+        if missing:
+            raise PPMError(f'Unknown action in catalog: {", ".join(missing)}')
+
+    # --- Cache ---
+
+    def _cached_root(self, stat: os.stat_result) -> Optional[int]:
+        """Return the root offset of a valid cache, or None if stale."""
+        try:
+            with open(self.cache_path, 'rb') as cache:
+                header = cache.read(HEADER.size)
+        except OSError:
+            return None
+        if len(header) != HEADER.size:
+            return None
+        magic, version, tag, mtime, size, root, names, digest = (
+            HEADER.unpack(header)
+        )
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            return None
+        if tag.rstrip(b'\0') != CACHE_TAG:
+            return None
+        unchanged = (mtime, size) == (stat.st_mtime_ns, stat.st_size)
+        # Touched but unchanged, e.g. by a checkout
+        if not unchanged and not (
+            size == stat.st_size and digest == self._digest()
+        ):
+            return None
+        try:
+            self.action_names = marshal.loads(self._read_record(names))
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            # A damaged cache is compiled again
+            return None
+        return root
+
+    def _compile(self, stat: os.stat_result) -> int:
+        """Parse the catalog and write its compiled cache."""
+        records = bytearray(HEADER.size)
+        action_names: set[str] = set()
+        root = _compile_level(self._parse(), records, action_names)
+        self.action_names = sorted(action_names)
+        names = _append_record(records, marshal.dumps(self.action_names))
+        records[:HEADER.size] = HEADER.pack(
+            CACHE_MAGIC, CACHE_VERSION, CACHE_TAG, stat.st_mtime_ns,
+            stat.st_size, root, names, self._digest(),
+        )
+        self.compiled = True
+        try:
+            temp = f'{self.cache_path}.{os.getpid()}.tmp'
+            with open(temp, 'wb') as cache:
+                cache.write(records)
+            os.replace(temp, self.cache_path)
+        except OSError:
+            self._data = bytes(records)
+        return root
+
+    def _parse(self) -> dict[str, Any]:
+        """Read the catalog source into a dict."""
+        try:
+            if self.path.endswith('.toml'):
+                try:
+                    import tomllib
+                except ImportError as error:
+                    raise PPMError(
+                        'TOML catalogs need Python 3.11 or newer.'
+                    ) from error
+                with open(self.path, 'rb') as source:
+                    menu = tomllib.load(source)
+            else:
+                with open(self.path, encoding='utf-8') as source:
+                    menu = json.load(source)
+        except (OSError, ValueError) as error:
+            raise PPMError(
+                f'Cannot read catalog {self.path}: {error}'
+            ) from error
+        if not isinstance(menu, dict) or not menu:
+            raise PPMError(f'Catalog {self.path} has no menu items.')
+        return menu
+
+    def _digest(self) -> bytes:
+        """Return the SHA-256 of the catalog source."""
+        digest = hashlib.sha256()
+        with open(self.path, 'rb') as source:
+            for chunk in iter(lambda: source.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.digest()
+
+    def _read_record(self, offset: int) -> bytes:
+        """Return the bytes of the record at an offset."""
+        if self._data is not None:
+            (length,) = RECORD_LENGTH.unpack_from(self._data, offset)
+            start = offset + RECORD_LENGTH.size
+            return self._data[start:start + length]
+        with open(self.cache_path, 'rb') as cache:
+            cache.seek(offset)
+            (length,) = RECORD_LENGTH.unpack(cache.read(RECORD_LENGTH.size))
+            return cache.read(length)
+
+
+def _compile_level(
+    menu: dict[str, Any],
+    records: bytearray,
+    action_names: set[str]
+) -> int:
+    """
+    Append a level and, before it, all of its submenus to the records.
+
+    Args:
+        menu: Level of the parsed catalog.
+        records: Compiled cache, extended in place.
+        action_names: Collects the names of the referenced actions.
+
+    Returns:
+        Offset of the level's record.
+    """
+    labels, quick_navs, quick_nav_map = split_keys(menu)
+    entries: list[tuple[int, Any]] = []
+    for key, value in menu.items():
+        if isinstance(value, dict) and ACTION_KEY in value:
+            name = str(value[ACTION_KEY])
+            action_names.add(name)
+            args = value.get(ARGS_KEY, [])
+            entries.append((_ACTION, (name, list(args))))
+        elif isinstance(value, dict):
+            offset = _compile_level(value, records, action_names)
+            entries.append((_SUBMENU, offset))
+        else:
+            entries.append((_VALUE, _plain(value)))
+
+    try:
+        data = marshal.dumps(
+            (list(menu), labels, quick_navs, quick_nav_map, entries)
+        )
+    except ValueError as error:
+        raise PPMError(f'Unsupported value in catalog: {error}') from error
+    return _append_record(records, data)
+
+
+def _append_record(records: bytearray, data: bytes) -> int:
+    """Append one length-prefixed record and return its offset."""
+    offset = len(records)
+    records += RECORD_LENGTH.pack(len(data))
+    records += data
+    return offset
+
+
+def resolve_action(
+    actions: Mapping[str, Callable[..., Any]],
+    name: str,
+    args: list[Any],
+) -> Callable[[], Any]:
+    """
+    Return the registered action for a reference, bound to its args.
+
+    Raises:
+        PPMError: If no action is registered under the name.
+    """
+    action = actions.get(name)
+    if action is None:
+        raise PPMError(f'Unknown action in catalog: {name}')
+    return functools.partial(action, *args) if args else action
+
+
+def _plain(value: Any) -> Any:
+    """Return a value marshal can store; other types become strings."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return str(value)
+
+
+def load_catalog(
+    path: str,
+    actions: Mapping[str, Callable[..., Any]],
+    cache_path: Optional[str] = None,
+) -> Level:
+    """
+    Return the top level of a catalog, ready to pass to `PPM`.
+
+    Args:
+        path: JSON or TOML catalog file.
+        actions: Actions that the catalog may reference, by name.
+        cache_path: Where to keep the compiled cache.
+    """
+    return Catalog(path, actions, cache_path).root()
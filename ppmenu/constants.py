@@ -3,7 +3,7 @@
 
 # created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
 @dataclass
 class Keys:
@@ -11,9 +11,22 @@ class Keys:
     ARROW_DOWN = '\x1b[B'
     ARROW_RIGHT = '\x1b[C'
     ARROW_LEFT = '\x1b[D'
+    HOME = '\x1b[H'
+    END = '\x1b[F'
+    PAGE_UP = '\x1b[5~'
+    PAGE_DOWN = '\x1b[6~'
+    DELETE = '\x1b[3~'
     ENTER = '\r'
     NEWLINE = '\n'
     ESCAPE = '\x1b'
+    PASTE = 'PASTE+'
+    TAB = '\t'
+    SPACE = ' '
+    CTRL_A = '\x01'
+    BACKSPACE = '\x7f'
+    CTRL_H = '\x08'
+    SEARCH = '/'
+    GOTO = ':'
     Q = 'q'
     H = 'h'
     J = 'j'
@@ -28,16 +41,28 @@ class ColorScheme:
     quick_letter: str = "\033[1;32m" # Bright green
     brackets: str = "\033[1;37m"     # White
     dim: str = "\033[2m"             # Dimmed
+    match: str = "\033[1;33m"        # Bright yellow
+    failed: str = "\033[1;31m"       # Bright red
     reset: str = "\033[0m"           # Reset
 
+# Seconds between redraws while background jobs are running
+JOB_REFRESH_INTERVAL = 0.5
+
 # Default color scheme
 DEFAULT_COLORS = ColorScheme()
 
+# Scheme without escape sequences, used when color is turned off
+NO_COLORS = ColorScheme(**{field.name: '' for field in fields(ColorScheme)})
+
 @dataclass
 class ANSI:
     CLEAR_SCREEN = "\033[2J\033[H"
     CLEAR_LINE = "\033[2K"
     CURSOR_HOME = "\033[H"
+    CURSOR_POSITION = "\033[{row};{col}H"
+    CLEAR_TO_END = "\033[J"
+    BEGIN_SYNC = "\033[?2026h"
+    END_SYNC = "\033[?2026l"
 
 
 NAVIGATION_HELP = (
@@ -45,5 +70,10 @@ NAVIGATION_HELP = (
     ' - j/k or ↓/↑      : Move down/up\n'
     ' - h or ←          : Go back\n'
     ' - l or →/Enter    : Select\n'
+    ' - PgUp/PgDn       : Page up/down\n'
+    ' - Home/End        : First/last item\n'
+    ' - /               : Search (Tab: whole menu, Esc: cancel)\n'
+    ' - :               : Go to path (Tab: complete, Esc: cancel)\n'
+    ' - Space/+/*       : Mark item/range/all (Enter: run, Esc: clear)\n'
     ' - q               : Quit'
 )
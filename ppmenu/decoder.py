@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Bulk, non-blocking key decoder for PPMenu."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import codecs
+import io
+import os
+import re
+import select
+import sys
+import time
+
+from typing import Optional, Union
+
+from .constants import Keys
+
+# Seconds to wait for the rest of an escape sequence before a lone ESC
+ESC_TIMEOUT = 0.05
+
+# Maximum number of bytes taken from the terminal in one read
+READ_SIZE = 4096
+
+PASTE_START = '\x1b[200~'
+PASTE_END = '\x1b[201~'
+
+# Alternative encodings of the same key, mapped to the `Keys` constant
+SEQUENCES = {
+    '\x1bOA': Keys.ARROW_UP,
+    '\x1bOB': Keys.ARROW_DOWN,
+    '\x1bOC': Keys.ARROW_RIGHT,
+    '\x1bOD': Keys.ARROW_LEFT,
+    '\x1bOH': Keys.HOME,
+    '\x1b[1~': Keys.HOME,
+    '\x1b[7~': Keys.HOME,
+    '\x1bOF': Keys.END,
+    '\x1b[4~': Keys.END,
+    '\x1b[8~': Keys.END,
+}
+
+# Arrows, Home and End with Shift/Ctrl/Alt modifiers, e.g. ESC [1;5A
+MODIFIED_KEY = re.compile(r'^\x1b\[1;\d+([A-DHF])$')
+
+
+class KeyDecoder:
+    """
+    State machine turning raw terminal input into key events.
+
+    Keys are the same strings `_handle_navigation` has always used: a
+    single character, an escape sequence from `Keys`, or 'ALT+x'.
+    Bracketed paste arrives as one `Keys.PASTE` + text event.
+
+    Incomplete escape sequences stay buffered until more input arrives
+    or `flush()` is called after `ESC_TIMEOUT`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty decoder."""
+        self._utf8 = codecs.getincrementaldecoder('utf-8')('replace')
+        self._buffer: str = ''
+        self._paste: Optional[list[str]] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether an incomplete escape sequence is waiting for input."""
+        return bool(self._buffer) and self._paste is None
+
+    def feed(self, data: Union[bytes, str]) -> list[str]:
+        """
+        Decode a chunk of input.
+
+        Args:
+            data: Raw bytes from the terminal, or already decoded text.
+
+        Returns:
+            All complete key events found so far, in order.
+        """
+        if isinstance(data, bytes):
+            data = self._utf8.decode(data)
+        self._buffer += data
+        return self._parse(final=False)
+
+    def flush(self) -> list[str]:
+        """Decode buffered input as if no more bytes will follow."""
+        return self._parse(final=True)
+
+    def _parse(self, final: bool) -> list[str]:
+        """Consume as much of the buffer as forms complete keys."""
+        keys: list[str] = []
+        buffer = self._buffer
+        i = 0
+
+        while i < len(buffer):
+            if self._paste is not None:
+                end = buffer.find(PASTE_END, i)
+                if end < 0:
+                    # Keep a possibly split end marker in the buffer
+                    cut = max(i, len(buffer) - len(PASTE_END) + 1)
+                    self._paste.append(buffer[i:cut])
+                    i = cut
+                    break
+                self._paste.append(buffer[i:end])
+                keys.append(Keys.PASTE + ''.join(self._paste))
+                self._paste = None
+                i = end + len(PASTE_END)
+                continue
+
+            if buffer[i] != Keys.ESCAPE:
+                keys.append(buffer[i])
+                i += 1
+                continue
+
+            key, size = self._parse_escape(buffer, i, final)
+            if not size:
+                break
+            i += size
+            if key == PASTE_START:
+                self._paste = []
+            else:
+                keys.append(key)
+
+        self._buffer = buffer[i:]
+        return keys
+
+    def _parse_escape(
+        self,
+        buffer: str,
+        start: int,
+        final: bool
+    ) -> tuple[str, int]:
+        """
+        Decode the escape sequence at `start`.
+
+        Returns:
+            The key and the number of characters it used, or size 0 when
+            the sequence is still incomplete.
+        """
+        if start + 1 >= len(buffer):
+            return (Keys.ESCAPE, 1) if final else ('', 0)
+
+        introducer = buffer[start + 1]
+        if introducer == '[':
+            end = start + 2
+            while end < len(buffer) and not '\x40' <= buffer[end] <= '\x7e':
+                end += 1
+            if end >= len(buffer):
+                if final:
+                    return buffer[start:], len(buffer) - start
+                return '', 0
+            return _normalize(buffer[start:end + 1]), end + 1 - start
+
+        if introducer == 'O':
+            if start + 2 >= len(buffer):
+                return ('ALT+o', 2) if final else ('', 0)
+            return _normalize(buffer[start:start + 3]), 3
+
+        if introducer == Keys.ESCAPE:
+            return Keys.ESCAPE, 1
+
+        return f'ALT+{introducer.lower()}', 2
+
+
+def _normalize(sequence: str) -> str:
+    """Map an escape sequence to its canonical `Keys` value."""
+    match = MODIFIED_KEY.match(sequence)
+    if match:
+        sequence = f'\x1b[{match.group(1)}'
+    return SEQUENCES.get(sequence, sequence)
+
+
+def coalesce(keys: list[str]) -> list[tuple[str, int]]:
+    """Group consecutive identical keys into (key, count) pairs."""
+    groups: list[tuple[str, int]] = []
+    for key in keys:
+        if groups and groups[-1][0] == key:
+            groups[-1] = (key, groups[-1][1] + 1)
+        else:
+            groups.append((key, 1))
+    return groups
+
+
+class KeyReader:
+    """
+    Read every available byte in one go and return a batch of keys.
+
+    A lone ESC is reported after `ESC_TIMEOUT` instead of blocking until
+    the next key press.
+    """
+
+    def __init__(self, fd: Optional[int] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            fd: Input file descriptor. Defaults to stdin.
+        """
+        self.fd = fd
+        self.decoder = KeyDecoder()
+        # Pipe that `wake()` writes to, opened by the first `read()`
+        self._wakeup: Optional[tuple[int, int]] = None
+
+    def read(self, timeout: Optional[float] = None) -> list[str]:
+        """
+        Block until at least one key is available and return all keys.
+
+        Args:
+            timeout: Seconds to wait for input; an empty list is returned
+                when nothing arrived in time. Waits forever by default.
+                An empty list is also returned after `wake()`.
+        """
+        fd = self.fileno()
+        if fd is None:
+            return self._read_stream()
+
+        if self._wakeup is None:
+            self._wakeup = os.pipe()
+            for end in self._wakeup:
+                os.set_blocking(end, False)
+        wakeup = self._wakeup[0]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.decoder.pending:
+                wait: Optional[float] = ESC_TIMEOUT
+            elif deadline is not None:
+                wait = max(deadline - time.monotonic(), 0)
+            else:
+                wait = None
+            ready, _, _ = select.select([fd, wakeup], [], [], wait)
+            if wakeup in ready:
+                self._drain(wakeup)
+                if fd not in ready:
+                    return []
+            if ready:
+                keys = self.read_ready()
+            else:
+                keys = self.decoder.flush()
+            if keys:
+                return keys
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+
+    def read_ready(self) -> list[str]:
+        """
+        Decode the bytes that are ready now, without waiting for more.
+
+        Meant for event loops that call it once the descriptor is readable.
+        An incomplete escape sequence stays in `decoder` until more input
+        arrives or `decoder.flush()` is called.
+        """
+        fd = self.fileno()
+        if fd is None:
+            return self._read_stream()
+        data = os.read(fd, READ_SIZE)
+        if not data:
+            raise EOFError('End of input.')
+        return self.decoder.feed(data)
+
+    def wake(self) -> None:
+        """Make a blocked `read()` return early; safe from any thread."""
+        wakeup = self._wakeup
+        if wakeup is None:
+            return
+        try:
+            os.write(wakeup[1], b'\0')
+        except OSError:
+            # The pipe is full, so a wakeup is pending already
+            pass
+
+    def close(self) -> None:
+        """Release the wakeup pipe."""
+        wakeup, self._wakeup = self._wakeup, None
+        if wakeup is not None:
+            for end in wakeup:
+                os.close(end)
+
+    def _drain(self, fd: int) -> None:
+        """Discard pending wakeups."""
+        try:
+            while os.read(fd, READ_SIZE):
+                pass
+        except OSError:
+            pass
+
+    def _read_stream(self) -> list[str]:
+        """Fallback for streams without a file descriptor."""
+        while True:
+            ch = sys.stdin.read(1)
+            if not ch:
+                keys = self.decoder.flush()
+                if keys:
+                    return keys
+                raise EOFError('End of input.')
+            keys = self.decoder.feed(ch)
+            if keys:
+                return keys
+
+    def fileno(self) -> Optional[int]:
+        """Return the input file descriptor, if there is one."""
+        if self.fd is not None:
+            return self.fd
+        try:
+            return sys.stdin.fileno()
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return None
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Headless input/output backends for driving a menu without a TTY."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import io
+import os
+import re
+
+from contextlib import contextmanager, redirect_stdout
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
+
+from .decoder import KeyDecoder
+from .render import Renderer
+
+if TYPE_CHECKING:
+    from . import PPM
+
+# Terminal size reported to headless menus by default
+DEFAULT_SIZE = os.terminal_size((80, 24))
+
+# SGR color sequences, removed from frames captured as plain text
+SGR_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
+
+
+class ScriptedKeys:
+    """
+    Input backend replaying a prepared sequence of keys.
+
+    Each `read()` returns the next batch; `EOFError` is raised once the
+    script is exhausted, which ends `PPM.run()`.
+    """
+
+    def __init__(self, keys: Union[bytes, Iterable[str]], batch: int = 1):
+        """
+        Initialize the script.
+
+        Args:
+            keys: Key strings as `_handle_key` receives them, or raw
+                terminal bytes that are decoded like real input.
+            batch: Number of keys returned per read; a larger batch
+                behaves like fast typing or key autorepeat.
+        """
+        if isinstance(keys, bytes):
+            decoder = KeyDecoder()
+            keys = decoder.feed(keys) + decoder.flush()
+        self.keys = list(keys)
+        self.batch = max(batch, 1)
+        self.position: int = 0
+
+    def read(self, timeout: Optional[float] = None) -> list[str]:
+        """Return the next batch of keys."""
+        if self.position >= len(self.keys):
+            raise EOFError('End of scripted input.')
+        start = self.position
+        self.position = min(start + self.batch, len(self.keys))
+        return self.keys[start:self.position]
+
+    def fileno(self) -> Optional[int]:
+        """Scripted input has no file descriptor."""
+        return None
+
+    def wake(self) -> None:
+        """Do nothing; scripted reads never block."""
+        pass
+
+    def close(self) -> None:
+        """Do nothing; there is nothing to release."""
+        pass
+
+
+class HeadlessTerminal:
+    """Terminal backend that never touches a TTY."""
+
+    active: bool = False
+
+    def __enter__(self) -> 'HeadlessTerminal':
+        """Do nothing; there is no terminal mode to change."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Do nothing; there is no terminal mode to restore."""
+        pass
+
+    @contextmanager
+    def cooked(self) -> Iterator[None]:
+        """Run an action as is."""
+        yield
+
+    def restore(self) -> None:
+        """Do nothing; there is no terminal mode to restore."""
+        pass
+
+
+class CapturingRenderer(Renderer):
+    """Renderer that also keeps every composed frame as a string."""
+
+    def __init__(
+        self,
+        size: os.terminal_size = DEFAULT_SIZE,
+        capture: bool = True,
+        plain: bool = False,
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            size: Terminal size reported to the menu.
+            capture: Whether to keep the text of every frame.
+            plain: Whether to strip color sequences from captured frames.
+        """
+        super().__init__(write=self._discard, get_size=lambda: size)
+        self.capture = capture
+        self.plain = plain
+        self.captured: list[str] = []
+
+    def render(self, lines: list[str]) -> int:
+        """Draw a frame and keep its text."""
+        written = super().render(lines)
+        if self.capture:
+            text = '\n'.join(lines)
+            if self.plain:
+                text = SGR_PATTERN.sub('', text)
+            self.captured.append(text)
+        return written
+
+    def _discard(self, data: str) -> None:
+        """Drop escape-encoded output; only the frame text is kept."""
+        pass
+
+
+class HeadlessDriver:
+    """
+    Drive a real `PPM` from scripted keys, without a terminal.
+
+    The menu keeps its own `_handle_key` and `_activate_item` logic; only
+    input, output and terminal handling are swapped for headless
+    backends.
+
+    Example:
+        driver = HeadlessDriver(PPM(menu_structure))
+        frames = driver.run(['j', 'j', '\\r', 'q'])
+    """
+
+    def __init__(
+        self,
+        menu: 'PPM',
+        size: os.terminal_size = DEFAULT_SIZE,
+        capture: bool = True,
+        plain: bool = True,
+    ):
+        """
+        Install headless backends on a menu.
+
+        Args:
+            menu: Menu to drive.
+            size: Terminal size reported to the menu.
+            capture: Whether to keep the text of every frame.
+            plain: Whether to strip color sequences from captured frames.
+        """
+        self.menu = menu
+        self.renderer = CapturingRenderer(size, capture, plain)
+        self.output = io.StringIO()
+        menu.renderer = self.renderer
+        menu.terminal = HeadlessTerminal()
+
+    @property
+    def frames(self) -> list[str]:
+        """Text of every frame drawn so far."""
+        return self.renderer.captured
+
+    def run(
+        self,
+        keys: Union[bytes, Iterable[str]],
+        batch: int = 1
+    ) -> list[str]:
+        """
+        Run the menu until it quits or the keys run out.
+
+        Anything actions print goes to `output` instead of stdout.
+
+        Args:
+            keys: Key strings or raw terminal bytes.
+            batch: Number of keys delivered per read.
+
+        Returns:
+            Text of every frame drawn so far.
+        """
+        self.menu.keys = ScriptedKeys(keys, batch)
+        with redirect_stdout(self.output):
+            self.menu.run()
+        return self.frames
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Background execution of long-running menu actions."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import asyncio
+import inspect
+import time
+
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Hashable, Optional
+
+# Default number of actions allowed to run at the same time
+DEFAULT_MAX_WORKERS = 4
+
+
+def _call(action: Callable[[], Any]) -> Any:
+    """Run an action in a worker, awaiting it if it is a coroutine."""
+    result = action()
+    if inspect.isawaitable(result):
+        return asyncio.run(_await(result))
+    return result
+
+
+async def _await(awaitable: Any) -> Any:
+    """Wrap any awaitable so `asyncio.run()` accepts it."""
+    return await awaitable
+
+
+class Job:
+    """One submitted action: its future, timing and outcome."""
+
+    def __init__(
+        self,
+        name: str,
+        future: Future,
+        clock: Callable[[], float]
+    ):
+        """
+        Initialize the job.
+
+        Args:
+            name: Label of the menu item that started the job.
+            future: Future of the submitted action.
+            clock: Time source, in seconds.
+        """
+        self.name = name
+        self.future = future
+        self.clock = clock
+        self.submitted: float = clock()
+        self.finished: Optional[float] = None
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future) -> None:
+        """Record when the job finished."""
+        self.finished = self.clock()
+
+    @property
+    def status(self) -> str:
+        """One of 'queued', 'running', 'done', 'failed' or 'cancelled'."""
+        future = self.future
+        if future.cancelled():
+            return 'cancelled'
+        if future.done():
+            return 'failed' if future.exception() else 'done'
+        return 'running' if future.running() else 'queued'
+
+    @property
+    def active(self) -> bool:
+        """Whether the job is queued or running."""
+        return not self.future.done()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the job was submitted, or its total duration."""
+        end = self.finished if self.finished is not None else self.clock()
+        return end - self.submitted
+
+    @property
+    def result(self) -> Any:
+        """Return value of the action, or None if it did not finish."""
+        if self.status != 'done':
+            return None
+        return self.future.result()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """Exception raised by the action, if it failed."""
+        if self.status != 'failed':
+            return None
+        return self.future.exception()
+
+
+class JobRunner:
+    """
+    Run menu actions on a thread or process pool.
+
+    At most `max_workers` actions run at once; further ones wait in the
+    queue and can still be cancelled. The latest job of every key, e.g.
+    the path of the menu item that started it, is kept, so its status
+    and result can be shown in later frames.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        processes: bool = False,
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            max_workers: Maximum number of actions running at once.
+            processes: Use a process pool; actions must be picklable.
+            executor: Ready-made executor to use instead of a new pool.
+            clock: Time source, in seconds.
+        """
+        if executor is None:
+            pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            executor = pool(max_workers=max_workers)
+        self.executor = executor
+        self.clock = clock
+        self.on_done: Optional[Callable[[Job], None]] = None
+        self._jobs: dict[Hashable, Job] = {}
+
+    def submit(
+        self,
+        name: str,
+        action: Callable[[], Any],
+        key: Optional[Hashable] = None
+    ) -> Job:
+        """
+        Start an action in the background.
+
+        A key whose job is still queued or running is not started twice;
+        its current job is returned instead.
+
+        Args:
+            name: Label of the menu item that started the job.
+            action: Callable to run.
+            key: What the job belongs to, e.g. the item path; defaults
+                to the action itself. Items sharing an action get jobs
+                of their own when their keys differ.
+        """
+        if key is None:
+            key = action
+        job = self.get(key)
+        if job is not None and job.active:
+            return job
+        future = self.executor.submit(_call, action)
+        job = Job(name, future, self.clock)
+        self._jobs[key] = job
+        if self.on_done is not None:
+            on_done = self.on_done
+            future.add_done_callback(lambda _: on_done(job))
+        return job
+
+    def get(self, key: Hashable) -> Optional[Job]:
+        """Return the latest job of a key, if one was ever started."""
+        return self._jobs.get(key)
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel the job of a key.
+
+        Only queued jobs can be cancelled; a running action is left to
+        finish.
+
+        Returns:
+            True if the job was cancelled.
+        """
+        job = self.get(key)
+        return job is not None and job.future.cancel()
+
+    def active(self) -> bool:
+        """Whether any job is queued or running."""
+        return any(job.active for job in self._jobs.values())
+
+    def jobs(self) -> list[Job]:
+        """Return the latest job of every key that was started."""
+        return list(self._jobs.values())
+
+    def results(self) -> dict[str, Any]:
+        """Return the results of finished jobs by item name."""
+        return {
+            job.name: job.result for job in self.jobs()
+            if job.status == 'done'
+        }
+
+    def shutdown(self, wait: bool = True, cancel: bool = False) -> None:
+        """
+        Stop the pool.
+
+        Args:
+            wait: Wait for running actions to finish.
+            cancel: Cancel actions that have not started yet.
+        """
+        self.executor.shutdown(wait=wait, cancel_futures=cancel)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Key bindings compiled into one dispatch table per menu level."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import itertools
+
+from typing import Any, Mapping, Optional
+
+from .chords import build_trie
+from .constants import Keys
+
+# Command of quick-jump keys; its argument is the item position
+JUMP = 'jump'
+
+# Command of the first letter of longer chords; its argument is a
+# `ChordNode`
+CHORD = 'chord'
+
+# Commands that move the selection, with their direction
+MOVES = {'up': -1, 'down': 1, 'page_up': -1, 'page_down': 1}
+
+DEFAULT_BINDINGS: dict[str, str] = {
+    Keys.ARROW_UP: 'up',
+    Keys.K: 'up',
+    Keys.ARROW_DOWN: 'down',
+    Keys.J: 'down',
+    Keys.PAGE_UP: 'page_up',
+    Keys.PAGE_DOWN: 'page_down',
+    Keys.HOME: 'home',
+    Keys.END: 'end',
+    Keys.ARROW_LEFT: 'back',
+    Keys.H: 'back',
+    Keys.ARROW_RIGHT: 'select',
+    Keys.L: 'select',
+    Keys.ENTER: 'run_batch',
+    Keys.NEWLINE: 'run_batch',
+    Keys.SEARCH: 'search',
+    Keys.GOTO: 'goto',
+    Keys.TAB: 'recent',
+    Keys.DELETE: 'cancel_job',
+    Keys.SPACE: 'mark',
+    '+': 'mark_range',
+    '*': 'mark_all',
+    Keys.ESCAPE: 'clear_marks',
+    Keys.Q: 'quit',
+}
+
+# Emacs-style control keys on top of the defaults
+EMACS_BINDINGS: dict[str, str] = {
+    **DEFAULT_BINDINGS,
+    '\x10': 'up',            # Ctrl+P
+    '\x0e': 'down',          # Ctrl+N
+    'ALT+v': 'page_up',
+    '\x16': 'page_down',     # Ctrl+V
+    '\x01': 'home',          # Ctrl+A
+    '\x05': 'end',           # Ctrl+E
+    '\x02': 'back',          # Ctrl+B
+    '\x06': 'select',        # Ctrl+F
+    '\x13': 'search',        # Ctrl+S
+    '\x07': 'quit',          # Ctrl+G
+}
+
+# Commands whose keys give way to an item with the same quick-jump
+# letter, so a `[q] Quit` item runs its own action
+YIELDING_COMMANDS = frozenset({'quit'})
+
+# Source of keymap versions; a new version invalidates compiled tables
+_versions = itertools.count(1)
+
+Table = dict[str, tuple[str, Any]]
+
+
+class Keymap:
+    """
+    Key to command bindings.
+
+    `PPM` compiles the bindings and the quick-jump letters of a level into
+    one dict when the level is first shown, so each key is resolved with
+    a single lookup. A binding takes precedence over a quick-jump letter
+    of the same key; the item stays reachable with ALT+letter, and the
+    conflict is reported when the table is compiled. Keys of
+    `YIELDING_COMMANDS` give way to the item instead.
+    """
+
+    def __init__(
+        self,
+        bindings: Optional[Mapping[str, str]] = None,
+        strict: bool = False,
+    ):
+        """
+        Initialize the keymap.
+
+        Args:
+            bindings: Key to command map; defaults to `DEFAULT_BINDINGS`.
+            strict: Raise `PPMError` on quick-jump conflicts instead of
+                warning.
+        """
+        self.bindings = dict(
+            DEFAULT_BINDINGS if bindings is None else bindings
+        )
+        self.strict = strict
+        self.version = next(_versions)
+
+    def bind(self, key: str, command: str) -> None:
+        """Make a key run a command, replacing its previous binding."""
+        self.bindings[key] = command
+        self.version = next(_versions)
+
+    def unbind(self, key: str) -> None:
+        """Remove the binding of a key."""
+        self.bindings.pop(key, None)
+        self.version = next(_versions)
+
+    def compile(
+        self,
+        quick_nav_map: Mapping[str, int]
+    ) -> tuple[Table, list[tuple[str, str, int]]]:
+        """
+        Build the dispatch table of a level.
+
+        Single-letter quick jumps map straight to their item; the first
+        letter of a longer chord maps to its node in the chord trie.
+
+        Args:
+            quick_nav_map: Quick-jump chord to position map of the level.
+
+        Returns:
+            The table, mapping keys to `(command, argument)`, and the
+            quick-jump conflicts as `(key, command, position)`.
+        """
+        table: Table = {
+            key: (command, None) for key, command in self.bindings.items()
+        }
+        conflicts: list[tuple[str, str, int]] = []
+        for letter, node in build_trie(quick_nav_map).children.items():
+            if node.children:
+                entry: tuple[str, Any] = (CHORD, node)
+                keys: tuple[str, ...] = (letter, f'ALT+{letter}')
+            else:
+                entry = (JUMP, node.position)
+                keys = (letter, letter.upper(), f'ALT+{letter}')
+            for key in keys:
+                command = self.bindings.get(key)
+                if command is None or command in YIELDING_COMMANDS:
+                    table[key] = entry
+                elif key != letter.upper():
+                    conflicts.append((key, command, node.first()))
+        return table, conflicts
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Terminal-width aware measuring, truncation and column layout."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import re
+import unicodedata
+
+from functools import lru_cache
+
+# Seconds without a new resize event before the menu is laid out again
+RESIZE_DEBOUNCE = 0.05
+
+# Spaces between the columns of a multi-column level
+COLUMN_GAP = 2
+
+# Items measured to find the natural column width of a level; longer
+# labels further down are truncated
+MAX_MEASURED = 5000
+
+ELLIPSIS = '…'
+
+# SGR color sequences, which take no room on screen
+SGR_PATTERN = re.compile(r'(\x1b\[[0-9;]*m)')
+
+RESET = '\x1b[0m'
+
+
+@lru_cache(maxsize=4096)
+def char_width(ch: str) -> int:
+    """
+    Return the number of terminal cells a character takes.
+
+    Wide and full-width East Asian characters (and most emoji) take two
+    cells; combining marks, format and control characters take none.
+    """
+    if unicodedata.combining(ch):
+        return 0
+    if unicodedata.category(ch) in ('Mn', 'Me', 'Cf', 'Cc'):
+        return 0
+    if unicodedata.east_asian_width(ch) in ('W', 'F'):
+        return 2
+    return 1
+
+
+def display_width(text: str) -> int:
+    """Return the width of text on screen, ignoring color sequences."""
+    if '\x1b' in text:
+        text = SGR_PATTERN.sub('', text)
+    if text.isascii() and text.isprintable():
+        return len(text)
+    return sum(map(char_width, text))
+
+
+def fit(text: str, width: int, pad: bool = False) -> str:
+    """
+    Cut text to at most `width` cells, ending it with an ellipsis.
+
+    Color sequences are kept, and a reset is added after a cut so a
+    color does not leak into the rest of the row.
+
+    Args:
+        text: Text, possibly with color sequences.
+        width: Number of cells available.
+        pad: Fill the remaining cells with spaces, e.g. for a column.
+    """
+    used = display_width(text)
+    if used <= width:
+        return text + ' ' * (width - used) if pad else text
+    if width <= 0:
+        return ''
+
+    parts: list[str] = []
+    room = width - 1
+    colored = False
+    for token in SGR_PATTERN.split(text):
+        if token.startswith('\x1b'):
+            parts.append(token)
+            colored = True
+            continue
+        for ch in token:
+            cells = char_width(ch)
+            if cells > room:
+                room = -1
+                break
+            parts.append(ch)
+            room -= cells
+        if room < 0:
+            break
+    parts.append(ELLIPSIS)
+    if colored:
+        parts.append(RESET)
+    text = ''.join(parts)
+    if pad:
+        text += ' ' * (width - display_width(text))
+    return text
+
+
+def plan_columns(
+    natural: int,
+    count: int,
+    width: int,
+    rows: int,
+    max_columns: int,
+) -> tuple[int, int]:
+    """
+    Decide how many columns a level is shown in.
+
+    A level is split into columns only when it does not fit in `rows`
+    and the window is wide enough for columns of its natural width.
+
+    Args:
+        natural: Width of the widest item line.
+        count: Number of items.
+        width: Width of the terminal.
+        rows: Rows available for items.
+        max_columns: Upper bound on the number of columns.
+
+    Returns:
+        The number of columns and the width of each.
+    """
+    if max_columns <= 1 or count <= rows:
+        return 1, width
+    columns = min(
+        max_columns,
+        (width + COLUMN_GAP) // (natural + COLUMN_GAP),
+        -(-count // rows),
+    )
+    if columns <= 1:
+        return 1, width
+    return columns, (width + COLUMN_GAP) // columns - COLUMN_GAP
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Lazy submenus loaded on demand, with an LRU/TTL level cache."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import time
+
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Union
+
+# Number of loaded lazy submenus kept in memory by default
+DEFAULT_CACHE_SIZE = 64
+
+Children = Union[dict[str, Any], Iterable[tuple[str, Any]]]
+
+
+class LazyMenu:
+    """
+    Submenu whose items are produced only when it is opened.
+
+    The provider returns a menu dict, or yields `(key, value)` pairs, in
+    the same format as `menu_structure`. Values may be further lazy
+    menus, so large catalogs are built one level at a time.
+    """
+
+    def __init__(
+        self,
+        provider: Callable[[], Children],
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the lazy submenu.
+
+        Args:
+            provider: Callable or generator function returning the items.
+            ttl: Seconds a loaded level stays valid. Defaults to the
+                cache's own TTL.
+        """
+        self.provider = provider
+        self.ttl = ttl
+
+    def load(self) -> dict[str, Any]:
+        """Call the provider and return its items as a menu dict."""
+        children = self.provider()
+        if isinstance(children, dict):
+            return children
+        return dict(children)
+
+
+class LazyCache:
+    """
+    Bounded cache of loaded lazy submenus.
+
+    The least recently used level is dropped when the cache is full, and
+    a level older than its TTL is loaded again on the next visit.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of loaded levels kept.
+            ttl: Default seconds a level stays valid; None keeps it until
+                it is evicted.
+            clock: Time source, in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.on_evict: Optional[Callable[[dict[str, Any]], None]] = None
+        self._entries: OrderedDict[
+            int, tuple[LazyMenu, Optional[float], dict[str, Any], Any]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached levels."""
+        return len(self._entries)
+
+    def __contains__(self, node: object) -> bool:
+        """Whether a valid level is cached, without marking it as used."""
+        entry = self._entries.get(id(node))
+        if entry is None:
+            return False
+        return entry[1] is None or self.clock() < entry[1]
+
+    def get(self, node: LazyMenu) -> Optional[Any]:
+        """Return the cached level of a lazy menu, if still valid."""
+        entry = self._entries.get(id(node))
+        if entry is None:
+            return None
+        expires = entry[1]
+        if expires is not None and self.clock() >= expires:
+            self._drop(id(node))
+            return None
+        self._entries.move_to_end(id(node))
+        return entry[3]
+
+    def put(
+        self,
+        node: LazyMenu,
+        menu: dict[str, Any],
+        level: Any,
+        loaded_at: Optional[float] = None,
+    ) -> None:
+        """
+        Store a loaded level, evicting the least recently used ones.
+
+        Args:
+            node: The lazy menu that was loaded.
+            menu: Raw items returned by its provider.
+            level: Processed level built from `menu`.
+            loaded_at: When the provider was called, e.g. by a
+                prefetch; defaults to now. The TTL counts from here.
+        """
+        expires = self._expires(node, loaded_at)
+        self._drop(id(node))
+        self._entries[id(node)] = (node, expires, menu, level)
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+
+    def expired(self, node: LazyMenu, loaded_at: Optional[float]) -> bool:
+        """Whether items loaded at `loaded_at` are older than the TTL."""
+        expires = self._expires(node, loaded_at)
+        return expires is not None and self.clock() >= expires
+
+    def _expires(
+        self,
+        node: LazyMenu,
+        loaded_at: Optional[float]
+    ) -> Optional[float]:
+        """Return when items loaded at a given time become stale."""
+        ttl = node.ttl if node.ttl is not None else self.ttl
+        if ttl is None:
+            return None
+        return (self.clock() if loaded_at is None else loaded_at) + ttl
+
+    def clear(self) -> None:
+        """Drop every cached level."""
+        for key in list(self._entries):
+            self._drop(key)
+
+    def _drop(self, key: int) -> None:
+        """Remove an entry and report its raw items to `on_evict`."""
+        entry = self._entries.pop(key, None)
+        if entry is not None and self.on_evict is not None:
+            self.on_evict(entry[2])
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Compact, index-based representation of one menu level."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Iterator, Optional
+
+from .lazy import LazyMenu
+
+# Item kinds, stored one byte per item in `Level.kinds`
+VALUE = 0
+ACTION = 1
+SUBMENU = 2
+LAZY = 3
+
+
+def kind_of(value: Any) -> int:
+    """Return the kind of a menu value."""
+    if callable(value):
+        return ACTION
+    if isinstance(value, LazyMenu):
+        return LAZY
+    if isinstance(value, dict):
+        return SUBMENU
+    return VALUE
+
+
+class Level(MutableMapping):
+    """
+    One processed menu level, stored as parallel lists.
+
+    The run loop addresses items by position: `labels[i]`,
+    `item_values[i]`, `kinds[i]` and so on. No per-item objects are kept.
+
+    For existing code the level still behaves like the old
+    `dict[str, MenuItem]`: `level['File']`, `'File' in level` and
+    `level.items()` work, returning `MenuItem` views created on demand.
+    """
+
+    __slots__ = (
+        'labels',
+        'original_keys',
+        'quick_navs',
+        'item_values',
+        'kinds',
+        'styled',
+        'quick_nav_map',
+        'dispatch',
+        'layout',
+        '_index',
+    )
+
+    def __init__(
+        self,
+        labels: list[str],
+        original_keys: list[str],
+        quick_navs: list[Optional[str]],
+        item_values: list[Any],
+        quick_nav_map: dict[str, int],
+    ):
+        """
+        Initialize the level from parallel lists.
+
+        Args:
+            labels: Display labels, without the `[x] ` prefix.
+            original_keys: Keys as written in `menu_structure`.
+            quick_navs: Quick-jump letter of each item, or None.
+            item_values: Action, submenu or plain value of each item.
+            quick_nav_map: Quick-jump letter to item position.
+        """
+        self.labels = labels
+        self.original_keys = original_keys
+        self.quick_navs = quick_navs
+        self.item_values = item_values
+        self.kinds = array('B', map(kind_of, item_values))
+        self.styled: list[Optional[tuple[Any, str, str]]] = (
+            [None] * len(labels)
+        )
+        self.quick_nav_map = quick_nav_map
+        # Compiled key table, see PPM._dispatch_table
+        self.dispatch: Optional[tuple[Any, dict[str, Any]]] = None
+        # Item count and natural column width, see PPM._columns
+        self.layout: Optional[tuple[int, int]] = None
+        self._index: Optional[dict[str, int]] = None
+
+    # --- Index-based API ---
+
+    def item(self, index: int) -> 'MenuItem':
+        """Return a view of the item at a position."""
+        return MenuItem(self, index)
+
+    def index(self, label: str) -> int:
+        """Return the position of a label; raise KeyError if missing."""
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index[label]
+
+    def submenus(self) -> Iterator[Any]:
+        """Yield the raw submenu dicts of the level."""
+        for kind, value in zip(self.kinds, self.item_values):
+            if kind == SUBMENU:
+                yield value
+
+    def reindex_quick_navs(self) -> None:
+        """
+        Rebuild `quick_nav_map` after quick-jump letters changed.
+
+        The map is updated in place; a letter used twice jumps to its
+        first item.
+        """
+        quick_nav_map = self.quick_nav_map
+        quick_nav_map.clear()
+        for pos, letter in enumerate(self.quick_navs):
+            if letter:
+                quick_nav_map.setdefault(letter, pos)
+        self.dispatch = None
+
+    def replace(self, other: 'Level') -> None:
+        """Take over the items of another level, keeping this object."""
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+
+    # --- Mapping compatibility ---
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self.labels)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the labels."""
+        return iter(self.labels)
+
+    def __contains__(self, label: object) -> bool:
+        """Whether a label is part of the level."""
+        try:
+            self.index(label)  # type: ignore[arg-type]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __getitem__(self, label: str) -> 'MenuItem':
+        """Return a view of the item with a label."""
+        return MenuItem(self, self.index(label))
+
+    def __setitem__(self, label: str, item: 'MenuItem') -> None:
+        """Replace the item with a label, or append a new one."""
+        value, quick_nav = item.value, item.quick_nav
+        original_key = item.original_key
+        try:
+            i = self.index(label)
+        except KeyError:
+            self._index = None
+            self.labels.append(label)
+            self.original_keys.append(original_key)
+            self.quick_navs.append(quick_nav)
+            self.item_values.append(value)
+            self.kinds.append(kind_of(value))
+            self.styled.append(None)
+        else:
+            self.original_keys[i] = original_key
+            self.quick_navs[i] = quick_nav
+            self.item_values[i] = value
+            self.kinds[i] = kind_of(value)
+            self.styled[i] = None
+        self.layout = None
+        self.reindex_quick_navs()
+
+    def __delitem__(self, label: str) -> None:
+        """Remove the item with a label."""
+        i = self.index(label)
+        for name in (
+            'labels', 'original_keys', 'quick_navs',
+            'item_values', 'kinds', 'styled',
+        ):
+            del getattr(self, name)[i]
+        self._index = None
+        self.layout = None
+        self.reindex_quick_navs()
+
+    def __repr__(self) -> str:
+        """Return a short description of the level."""
+        return f'Level({self.labels!r})'
+
+
+class MenuItem:
+    """
+    View of one item of a `Level`.
+
+    Reading a field reads the level's lists; assigning one writes back
+    and drops the item's cached styled lines.
+
+    The fields of the former dataclass are accepted too:
+    `MenuItem(value=..., quick_nav=..., original_key=...)`, positional or
+    by keyword, creates an item in a one-item level of its own, e.g. to
+    add it with `level[label] = item`.
+    """
+
+    __slots__ = ('level', 'position')
+
+    def __init__(self, *args: Any, **fields: Any):
+        """
+        Initialize the view.
+
+        Args:
+            level: Level holding the item.
+            position: Position of the item in the level.
+
+        Raises:
+            TypeError: If neither a level and position nor the item
+                fields are given.
+        """
+        if (args and isinstance(args[0], Level)) or 'level' in fields:
+            view = dict(zip(('level', 'position'), args), **fields)
+            self.level: Level = view['level']
+            self.position: int = view['position']
+            return
+
+        names = ('value', 'quick_nav', 'original_key', 'quick_nav_map')
+        item = dict(zip(names, args), **fields)
+        missing = [name for name in names[:3] if name not in item]
+        if missing or set(item) - set(names):
+            raise TypeError(
+                'MenuItem() takes a level and position, or value, '
+                'quick_nav, original_key and optionally quick_nav_map.'
+            )
+        quick_nav = item['quick_nav']
+        quick_nav_map = item.get('quick_nav_map')
+        if quick_nav_map is None:
+            quick_nav_map = {quick_nav: 0} if quick_nav else {}
+        key = item['original_key']
+        self.level = Level(
+            [key], [key], [quick_nav], [item['value']], quick_nav_map
+        )
+        self.position = 0
+
+    @property
+    def value(self) -> Any:
+        """Action, submenu or plain value of the item."""
+        return self.level.item_values[self.position]
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self.level.item_values[self.position] = value
+        self.level.kinds[self.position] = kind_of(value)
+        self.level.styled[self.position] = None
+
+    @property
+    def quick_nav(self) -> Optional[str]:
+        """Quick-jump letter of the item, or None."""
+        return self.level.quick_navs[self.position]
+
+    @quick_nav.setter
+    def quick_nav(self, quick_nav: Optional[str]) -> None:
+        self.level.quick_navs[self.position] = quick_nav
+        self.level.styled[self.position] = None
+        self.level.layout = None
+        self.level.reindex_quick_navs()
+
+    @property
+    def original_key(self) -> str:
+        """Key of the item as written in `menu_structure`."""
+        return self.level.original_keys[self.position]
+
+    @original_key.setter
+    def original_key(self, original_key: str) -> None:
+        self.level.original_keys[self.position] = original_key
+        self.level.styled[self.position] = None
+        self.level.layout = None
+
+    @property
+    def quick_nav_map(self) -> dict[str, int]:
+        """Quick-jump letter to position map of the item's level."""
+        return self.level.quick_nav_map
+
+    def __repr__(self) -> str:
+        """Return a short description of the item."""
+        return (
+            f'MenuItem(value={self.value!r}, quick_nav={self.quick_nav!r}, '
+            f'original_key={self.original_key!r})'
+        )
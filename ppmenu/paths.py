@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Index of full item paths, for jumping straight to nested items."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import bisect
+import os
+
+from typing import Optional
+
+# Separator between the labels of a path, e.g. 'File/Recent/report.txt'
+SEPARATOR = '/'
+
+# Most completions listed by the go-to prompt
+MAX_COMPLETIONS = 1000
+
+
+class PathIndex:
+    """
+    Map from full item paths to their positions in the menu tree.
+
+    Paths are labels joined with `SEPARATOR`, without the `[x] ` prefix.
+    A sorted list of all paths answers prefix completion with a binary
+    search.
+    """
+
+    def __init__(
+        self,
+        paths: list[tuple[str, ...]],
+        targets: list[tuple[int, ...]]
+    ):
+        """
+        Build the index.
+
+        Args:
+            paths: Labels from the root to every item.
+            targets: Position of every item in its level, per level.
+        """
+        self._targets: dict[str, tuple[int, ...]] = {}
+        for names, target in zip(paths, targets):
+            self._targets.setdefault(SEPARATOR.join(names), target)
+        self.paths = sorted(self._targets)
+
+    def __len__(self) -> int:
+        """Return the number of indexed paths."""
+        return len(self.paths)
+
+    def __contains__(self, path: object) -> bool:
+        """Whether a path is indexed."""
+        return isinstance(path, str) and normalize(path) in self._targets
+
+    def get(self, path: str) -> Optional[tuple[int, ...]]:
+        """Return the tree position of a path, or None if it is unknown."""
+        return self._targets.get(normalize(path))
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> list[str]:
+        """
+        Return the indexed paths that start with a prefix, sorted.
+
+        Args:
+            prefix: Start of a path.
+            limit: Maximum number of paths returned.
+        """
+        start, end = self._range(prefix)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.paths[start:end]
+
+    def extend(self, prefix: str) -> str:
+        """Return the longest text shared by all completions of a prefix."""
+        start, end = self._range(prefix)
+        if start == end:
+            return prefix.lstrip(SEPARATOR)
+        # Sorted, so the first and last completions bound the shared part
+        return os.path.commonprefix([self.paths[start], self.paths[end - 1]])
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        """Return the slice of `paths` starting with a prefix."""
+        prefix = prefix.lstrip(SEPARATOR)
+        start = bisect.bisect_left(self.paths, prefix)
+        end = bisect.bisect_right(self.paths, prefix + '\U0010ffff', lo=start)
+        return start, end
+
+
+def normalize(path: str) -> str:
+    """Return a path without leading or trailing separators."""
+    return path.strip(SEPARATOR)
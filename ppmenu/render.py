@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Differential frame renderer for PPMenu."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import io
+import os
+import shutil
+import sys
+import threading
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+from .constants import ANSI
+
+# Frame that receives the `print()` output of the current thread
+_capture = threading.local()
+
+
+def _stdout_write(data: str) -> None:
+    """Send a whole frame to stdout with a single write."""
+    sys.stdout.flush()
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        sys.stdout.write(data)
+        sys.stdout.flush()
+        return
+
+    payload = data.encode(sys.stdout.encoding or 'utf-8', 'replace')
+    while payload:
+        written = os.write(fd, payload)
+        payload = payload[written:]
+
+
+def _terminal_size() -> os.terminal_size:
+    """Return the size of the terminal, with a fallback when there is none."""
+    return shutil.get_terminal_size()
+
+
+class Frame:
+    """
+    Text buffer collecting one frame before it is drawn.
+
+    A frame is file-like, so `print()` calls from display hooks can be
+    redirected into it as well as written with `line()`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty frame."""
+        self._parts: list[str] = []
+
+    def write(self, text: str) -> int:
+        """Append raw text to the frame."""
+        self._parts.append(text)
+        return len(text)
+
+    def line(self, text: str = '') -> None:
+        """Append a full line to the frame."""
+        self._parts.append(text)
+        self._parts.append('\n')
+
+    def extend(self, other: 'Frame') -> None:
+        """Append the content of another frame."""
+        self._parts.extend(other._parts)
+
+    def height(self) -> int:
+        """Return the number of complete lines in the frame."""
+        return ''.join(self._parts).count('\n')
+
+    def flush(self) -> None:
+        """Do nothing; a frame is written out by the renderer."""
+        pass
+
+    def lines(self) -> list[str]:
+        """Return the frame content split into lines."""
+        return ''.join(self._parts).rstrip('\n').split('\n')
+
+
+class _ThreadStdout:
+    """
+    Stand-in for `sys.stdout` that sends a thread's output to its frame.
+
+    Threads that are not composing a frame, such as background jobs,
+    write to the wrapped stream as before.
+    """
+
+    def __init__(self, stream: TextIO):
+        """Wrap the stream that stdout was."""
+        self.stream = stream
+
+    def _target(self) -> Any:
+        """Return the frame of this thread, or the wrapped stream."""
+        frame = getattr(_capture, 'frame', None)
+        return self.stream if frame is None else frame
+
+    def write(self, text: str) -> int:
+        """Write to this thread's frame or to the stream."""
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        """Flush this thread's frame or the stream."""
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward everything else, e.g. `fileno()`, to the stream."""
+        return getattr(self.stream, name)
+
+
+@contextmanager
+def capture_print(frame: Frame) -> Iterator[Frame]:
+    """
+    Send `print()` output of the calling thread into a frame.
+
+    Unlike `contextlib.redirect_stdout`, other threads keep writing to
+    the real stdout, so a job printing while a frame is composed does not
+    end up in it. `sys.stdout` is wrapped once, on first use; the wrapper
+    forwards to the stream it replaced.
+    """
+    if not isinstance(sys.stdout, _ThreadStdout):
+        sys.stdout = _ThreadStdout(sys.stdout)
+    previous = getattr(_capture, 'frame', None)
+    _capture.frame = frame
+    try:
+        yield frame
+    finally:
+        _capture.frame = previous
+
+
+class Renderer:
+    """
+    Keep the previously drawn frame and repaint only the lines that changed.
+
+    A frame is a list of lines. The first frame, and every frame after
+    `invalidate()` or a terminal resize, is drawn with a full clear and
+    reprint. Any other frame only rewrites the rows that differ from the
+    previous one, using absolute cursor positioning.
+
+    Each frame is sent with a single write, wrapped in synchronized-update
+    sequences so supporting terminals swap it in atomically.
+    """
+
+    def __init__(
+        self,
+        write: Optional[Callable[[str], None]] = None,
+        synchronized: bool = True,
+        get_size: Optional[Callable[[], os.terminal_size]] = None,
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            write: Callable receiving the escape-encoded output of a frame.
+            synchronized: Whether to wrap frames in synchronized updates.
+            get_size: Callable returning the terminal size. Defaults to
+                `shutil.get_terminal_size`.
+        """
+        self.write = write or _stdout_write
+        self.get_size = get_size or _terminal_size
+        self.synchronized = synchronized
+        self.previous: list[str] = []
+        self.size: Optional[tuple[int, int]] = None
+        self.needs_full_repaint: bool = True
+
+        self.frames: int = 0
+        self.last_frame_bytes: int = 0
+        self.total_bytes: int = 0
+
+    def invalidate(self) -> None:
+        """Force the next frame to be a full repaint."""
+        self.needs_full_repaint = True
+
+    def render(self, lines: list[str]) -> int:
+        """
+        Draw a frame, writing only what differs from the previous one.
+
+        Args:
+            lines: Lines of the new frame, without trailing newlines.
+
+        Returns:
+            Number of bytes written for this frame.
+        """
+        size = tuple(self.get_size())
+        if size != self.size:
+            self.size = size
+            self.needs_full_repaint = True
+
+        if self.needs_full_repaint:
+            output = ANSI.CLEAR_SCREEN + '\n'.join(lines)
+            self.needs_full_repaint = False
+        else:
+            output = self._diff(self.previous, lines)
+
+        if output and self.synchronized:
+            output = f'{ANSI.BEGIN_SYNC}{output}{ANSI.END_SYNC}'
+
+        self.previous = list(lines)
+        self.frames += 1
+        self.last_frame_bytes = len(output.encode())
+        self.total_bytes += self.last_frame_bytes
+        if output:
+            self.write(output)
+        return self.last_frame_bytes
+
+    def _diff(self, old: list[str], new: list[str]) -> str:
+        """Build the escape sequences that turn `old` into `new`."""
+        parts: list[str] = []
+        for row, line in enumerate(new):
+            if row < len(old) and old[row] == line:
+                continue
+            parts.append(
+                f'{ANSI.CURSOR_POSITION.format(row=row + 1, col=1)}'
+                f'{ANSI.CLEAR_LINE}{line}'
+            )
+        if len(new) < len(old):
+            parts.append(
+                f'{ANSI.CURSOR_POSITION.format(row=len(new) + 1, col=1)}'
+                f'{ANSI.CLEAR_TO_END}'
+            )
+        return ''.join(parts)
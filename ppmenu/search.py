@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Incremental fuzzy search over menu labels."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import re
+
+from collections.abc import Sequence
+from typing import Iterator, Optional
+
+# Result sets larger than this are shown in menu order instead of ranked
+RANK_LIMIT = 5000
+
+# Labels whose columns are indexed together; bounds the padding of a
+# few long labels to their own block
+BLOCK_SIZE = 8192
+
+# Translation table base: every byte to '0'
+_ZEROS = b'0' * 256
+
+# Bit offsets set in every byte value, for decoding bit sets
+_BIT_OFFSETS = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1)
+    for value in range(256)
+)
+
+_NONZERO = re.compile(rb'[^\x00]')
+
+# Bytes of a bit set decoded at once by `_BitIndexes`
+_DECODE_CHUNK = 1024
+
+
+class SearchIndex:
+    """
+    Prebuilt lookup tables for a list of labels.
+
+    Labels are lowercased once up front. For every character and column
+    the index keeps a bit set of the labels holding that character at
+    that column, with bit `i` standing for label `i`. Narrowing a search
+    by one character then takes a few big-integer operations per column
+    instead of a scan of every label.
+    """
+
+    def __init__(self, labels: list[str]):
+        """
+        Initialize the index.
+
+        Args:
+            labels: Display labels, in menu order.
+        """
+        self.labels = labels
+        self.folded = [label.lower() for label in labels]
+        self.everything: int = (1 << len(labels)) - 1
+        # Character to (column, labels with it there), by column
+        self.postings: dict[str, list[tuple[int, int]]] = _build_postings(
+            self.folded
+        )
+
+    def __len__(self) -> int:
+        """Return the number of indexed labels."""
+        return len(self.labels)
+
+    def positions(self, idx: int, query: str) -> list[int]:
+        """Return the positions of the query characters in a label."""
+        text = self.folded[idx]
+        found: list[int] = []
+        pos = -1
+        for ch in query.lower():
+            pos = text.find(ch, pos + 1)
+            if pos < 0:
+                return []
+            found.append(pos)
+        return found
+
+
+def _build_postings(folded: list[str]) -> dict[str, list[tuple[int, int]]]:
+    """
+    Return the bit set of labels holding each character at each column.
+
+    Labels are padded into one string per block, so every column is a
+    strided slice, and each (character, column) bit set is parsed from
+    that slice at C speed.
+    """
+    found: dict[tuple[str, int], list[bytes]] = {}
+    blocks = range(0, len(folded), BLOCK_SIZE)
+    for block, start in enumerate(blocks):
+        texts = folded[start:start + BLOCK_SIZE]
+        width = max(map(len, texts), default=0)
+        # Reversed, so the first label of the block is the lowest bit
+        padded = ''.join(text.ljust(width, '\0') for text in reversed(texts))
+        nbytes = (len(texts) + 7) // 8
+        for data, names in _encode_columns(padded):
+            for pos in range(width):
+                column = data[pos::width]
+                for code in set(column):
+                    if not code:
+                        continue
+                    table = _ZEROS[:code] + b'1' + _ZEROS[code + 1:]
+                    bits = int(column.translate(table), 2)
+                    parts = found.setdefault((names[code], pos), [])
+                    # Blocks that lack the pair are all zeros
+                    parts.extend([bytes(BLOCK_SIZE // 8)] * (
+                        block - len(parts)
+                    ))
+                    parts.append(bits.to_bytes(nbytes, 'little'))
+
+    postings: dict[str, list[tuple[int, int]]] = {}
+    for (ch, pos), parts in sorted(found.items(), key=lambda item: item[0][1]):
+        bits = int.from_bytes(b''.join(parts), 'little')
+        postings.setdefault(ch, []).append((pos, bits))
+    return postings
+
+
+def _encode_columns(padded: str) -> Iterator[tuple[bytes, dict[int, str]]]:
+    """
+    Encode padded labels as bytes, one byte per character.
+
+    Yields each encoding with the character of every byte value. ASCII
+    is encoded as is; other characters get the byte values 128-255, in
+    several passes when a block has more than 128 of them.
+    """
+    if padded.isascii():
+        yield padded.encode('ascii'), {code: chr(code) for code in range(128)}
+        return
+    others = sorted({ch for ch in padded if not ch.isascii()})
+    for first in range(0, len(others), 128):
+        group = others[first:first + 128]
+        codes = dict.fromkeys(map(ord, others), 0)
+        if first:
+            # ASCII was reported by the first pass
+            codes.update(dict.fromkeys(range(1, 128), 0))
+        names = {code: chr(code) for code in range(128)}
+        for code, ch in enumerate(group, 128):
+            codes[ord(ch)] = code
+            names[code] = ch
+        yield padded.translate(codes).encode('latin-1'), names
+
+
+class _BitIndexes(Sequence):
+    """Label indexes of a bit set, decoded in order as they are read."""
+
+    def __init__(self, bits: int, count: int):
+        """Store the bit set and the number of bits set in it."""
+        self.data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+        self.count = count
+        self.decoded: list[int] = []
+        self.offset = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexes."""
+        return self.count
+
+    def __getitem__(self, i: int) -> int:  # type: ignore[override]
+        """Return the index at a position, decoding up to it."""
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError('Search result index out of range.')
+        while len(self.decoded) <= i:
+            self._decode(_DECODE_CHUNK)
+        return self.decoded[i]
+
+    def __iter__(self) -> Iterator[int]:
+        """Decode every index in order."""
+        self._decode(len(self.data))
+        return iter(self.decoded)
+
+    def _decode(self, size: int) -> None:
+        """Decode the next `size` bytes of the bit set."""
+        end = min(self.offset + size, len(self.data))
+        _decode_bits(self.data, self.offset, end, self.decoded)
+        self.offset = end
+
+
+def _decode_bits(data: bytes, start: int, end: int, out: list[int]) -> None:
+    """Append the indexes of the bits set in a byte range of a bit set."""
+    for match in _NONZERO.finditer(data, start, end):
+        byte = match.start()
+        out.extend([byte * 8 + bit for bit in _BIT_OFFSETS[data[byte]]])
+
+
+def _indexes(bits: int) -> list[int]:
+    """Return the label indexes of a bit set, in order."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    out: list[int] = []
+    _decode_bits(data, 0, len(data), out)
+    return out
+
+
+class _Matches:
+    """Labels matching one query, grouped by where their match ends."""
+
+    def __init__(self, ends: list[tuple[int, int]]):
+        """
+        Store the matches.
+
+        Args:
+            ends: (column of the last matched character, bit set of the
+                labels), by column.
+        """
+        self.ends = ends
+        bits = 0
+        for _, labels in ends:
+            bits |= labels
+        self.bits = bits
+        self.count = bin(bits).count('1')
+        self.ranked: Optional[Sequence[int]] = None
+
+
+class Search:
+    """
+    Incremental fuzzy (subsequence) search over a `SearchIndex`.
+
+    Each added character only narrows the previous result set: for the
+    labels whose match ends at a column, it looks for the new character
+    in a later column, using the bit sets of the index. Removing a
+    character pops back to the results that were already computed.
+    """
+
+    def __init__(
+        self,
+        index: SearchIndex,
+        targets: Optional[list[tuple[int, ...]]] = None
+    ):
+        """
+        Initialize the search.
+
+        Args:
+            index: Index of the labels to search.
+            targets: Optional tree positions of each label, for searches
+                across the whole menu tree.
+        """
+        self.index = index
+        self.targets = targets
+        self.query: str = ''
+        self._stack: list[_Matches] = [
+            _Matches([(-1, index.everything)])
+        ]
+
+    def push(self, ch: str) -> None:
+        """Add a character to the query and narrow the results."""
+        ch = ch.lower()
+        ends = self._stack[-1].ends
+        found: list[tuple[int, int]] = []
+        # Labels whose match ended before the column being looked at
+        pending = 0
+        n = 0
+        for pos, labels in self.index.postings.get(ch, ()):
+            while n < len(ends) and ends[n][0] < pos:
+                pending |= ends[n][1]
+                n += 1
+            if pending:
+                hit = pending & labels
+                if hit:
+                    found.append((pos, hit))
+                    pending ^= hit
+            elif n == len(ends):
+                break
+        self.query += ch
+        self._stack.append(_Matches(found))
+
+    def pop(self) -> None:
+        """Remove the last character of the query."""
+        if self.query:
+            self.query = self.query[:-1]
+            self._stack.pop()
+
+    def results(self) -> Sequence[int]:
+        """
+        Return matching label indexes, best match first.
+
+        Matches are ranked by the length of the matched span, then by
+        how early the match starts. Very large result sets keep menu
+        order and are decoded only as far as they are read, since they
+        are narrowed again by the next keystroke.
+        """
+        matches = self._stack[-1]
+        if matches.ranked is None:
+            if not self.query or matches.count > RANK_LIMIT:
+                matches.ranked = _BitIndexes(matches.bits, matches.count)
+            else:
+                folded = self.index.folded
+                first = self.query[0]
+                spans: list[tuple[int, int, int]] = []
+                for end, labels in matches.ends:
+                    for idx in _indexes(labels):
+                        start = folded[idx].find(first)
+                        spans.append((end - start, start, idx))
+                spans.sort()
+                matches.ranked = [idx for _, _, idx in spans]
+        return matches.ranked
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Serving one menu tree to many terminals over local sockets."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import argparse
+import asyncio
+import os
+import shutil
+import struct
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, Optional
+
+from . import PPM, PPMError, _use_color
+from .constants import NO_COLORS
+from .decoder import ESC_TIMEOUT, KeyDecoder
+from .headless import HeadlessTerminal
+from .jobs import DEFAULT_MAX_WORKERS, JobRunner
+from .render import Renderer
+from .terminal import TerminalSession
+
+# Message header: one type byte and the length of the payload
+HEADER = struct.Struct('!cI')
+
+KEYS = b'k'     # client to server: raw terminal input
+SIZE = b's'     # client to server: terminal size as b'columns rows'
+FRAME = b'f'    # server to client: terminal output of a frame
+
+# Last word of a SIZE payload whose terminal shows colors, as in
+# b'80 24 color'; it is left out when stdout is not a terminal or
+# NO_COLOR is set on the client
+COLOR = b'color'
+
+# Largest payload accepted in one message
+MAX_PAYLOAD = 1 << 20
+
+# Bytes read from the terminal at once by the client
+READ_SIZE = 4096
+
+
+def pack(kind: bytes, payload: bytes) -> bytes:
+    """Encode one message."""
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[bytes, bytes]:
+    """
+    Read one message.
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection was closed.
+        PPMError: If the message is larger than `MAX_PAYLOAD`.
+    """
+    kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if length > MAX_PAYLOAD:
+        raise PPMError(f'Message of {length} bytes is too large.')
+    return kind, await reader.readexactly(length)
+
+
+def _parse_size(payload: bytes) -> os.terminal_size:
+    """Decode a SIZE payload."""
+    parts = payload.split()
+    try:
+        if len(parts) not in (2, 3):
+            raise ValueError
+        columns, lines = (int(part) for part in parts[:2])
+    except ValueError:
+        raise PPMError(f'Invalid terminal size: {payload!r}') from None
+    return os.terminal_size((max(columns, 1), max(lines, 1)))
+
+
+def _wants_color(payload: bytes) -> bool:
+    """Whether a SIZE payload says the client's terminal shows colors."""
+    return payload.split()[2:] == [COLOR]
+
+
+class RemoteKeys:
+    """Input backend of a session; keys arrive from its client socket."""
+
+    def __init__(self) -> None:
+        """Initialize the decoder of the client's terminal input."""
+        self.decoder = KeyDecoder()
+
+    def read(self, timeout: Optional[float] = None) -> list[str]:
+        """Return nothing; keys are queued by `MenuServer`."""
+        return []
+
+    def fileno(self) -> Optional[int]:
+        """Remote input has no local file descriptor."""
+        return None
+
+    def wake(self) -> None:
+        """Do nothing; sessions are woken through their event queue."""
+        pass
+
+    def close(self) -> None:
+        """Do nothing; the connection is closed by `MenuServer`."""
+        pass
+
+
+class MenuServer:
+    """
+    Serve one compiled menu to many clients at the same time.
+
+    The menu is processed once. Every connection gets a session from
+    `PPM.session()`, which holds only its cursor, back-stack, marks and
+    terminal size and shares the levels and indexes of `menu`. Actions
+    run as background jobs on one shared thread pool, so a slow action
+    does not stall the other sessions.
+
+    Example:
+        server = MenuServer(PPM(ops_menu, title='Ops'))
+        await server.start_unix('/run/ops-menu.sock')
+        await server.serve_forever()
+    """
+
+    def __init__(self, menu: PPM, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Initialize the server.
+
+        Args:
+            menu: The menu to serve; its settings are used by every
+                session.
+            max_workers: Maximum number of actions running at once,
+                across all sessions.
+        """
+        self.menu = menu
+        self.sessions: set[PPM] = set()
+        self.executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='ppmenu-action'
+        )
+        self._servers: list[asyncio.AbstractServer] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def start_unix(
+        self,
+        path: str,
+        mode: int = 0o600
+    ) -> asyncio.AbstractServer:
+        """
+        Listen on a Unix-domain socket.
+
+        Args:
+            path: Socket path; an existing socket file is replaced.
+            mode: Permissions of the socket file, e.g. 0o660 to let a
+                group of operators connect.
+        """
+        server = await asyncio.start_unix_server(self._serve, path=path)
+        os.chmod(path, mode)
+        self._servers.append(server)
+        return server
+
+    async def start_tcp(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0
+    ) -> asyncio.AbstractServer:
+        """
+        Listen on a TCP port, by default on the loopback interface only.
+
+        TCP has no access control of its own; prefer a Unix socket on a
+        shared host.
+        """
+        server = await asyncio.start_server(self._serve, host, port)
+        self._servers.append(server)
+        return server
+
+    async def serve_forever(self) -> None:
+        """Serve clients until cancelled."""
+        await asyncio.gather(
+            *(server.serve_forever() for server in self._servers)
+        )
+
+    async def close(self) -> None:
+        """Stop listening, end every session and the action pool."""
+        for server in self._servers:
+            server.close()
+        for session in list(self.sessions):
+            session.running = False
+            session._wake()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def invalidate(self, menu: Optional[dict[str, Any]] = None) -> None:
+        """
+        Reprocess levels after the menu changed, for every session.
+
+        Args:
+            menu: The raw submenu dict that changed; None for the whole
+                tree.
+
+        Raises:
+            PPMError: If a changed level is invalid.
+        """
+        self.menu.invalidate(menu)
+        for session in self.sessions:
+            session._forget_positions()
+            session._wake()
+
+    def new_session(
+        self,
+        size: os.terminal_size,
+        color: bool = False
+    ) -> PPM:
+        """
+        Return a session of the menu for a client terminal.
+
+        Args:
+            size: Size of the client's terminal.
+            color: Whether the client's terminal shows colors; the
+                session then uses the menu's `color_scheme`.
+        """
+        session = self.menu.session()
+        session.colors = self.menu.color_scheme if color else NO_COLORS
+        session.keys = RemoteKeys()
+        session.terminal = HeadlessTerminal()
+        session.jobs = JobRunner(executor=self.executor)
+        session.renderer = Renderer(get_size=lambda: size)
+        return session
+
+    async def _serve(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Run one session until its client quits or disconnects."""
+        try:
+            kind, payload = await read_message(reader)
+            if kind != SIZE:
+                raise PPMError('Expected the terminal size first.')
+            session = self.new_session(
+                _parse_size(payload), _wants_color(payload)
+            )
+        except (asyncio.IncompleteReadError, ConnectionError, PPMError):
+            writer.close()
+            return
+
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks.add(task)
+        output: list[str] = []
+        session.renderer.write = output.append
+        session._loop = asyncio.get_running_loop()
+        session._events = asyncio.Queue()
+        self.sessions.add(session)
+        receiver = asyncio.create_task(self._receive(session, reader))
+        try:
+            current_level = session._first_level()
+            while session.running:
+                session._display_menu(current_level)
+                if output:
+                    writer.write(pack(FRAME, ''.join(output).encode()))
+                    output.clear()
+                    await writer.drain()
+                keys = await session._next_keys()
+                new_level = session._take_jump(
+                    session._handle_keys(current_level, keys)
+                )
+                if session.stats is not None:
+                    session.stats.end_iteration()
+                if new_level is not current_level:
+                    current_level = new_level or session.menu
+        except ConnectionError:
+            pass
+        finally:
+            receiver.cancel()
+            self.sessions.discard(session)
+            self._tasks.discard(task)
+            session._loop = None
+            session._events = None
+            session._finish()
+            if session.status is not None:
+                session.status.close()
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _receive(
+        self,
+        session: PPM,
+        reader: asyncio.StreamReader
+    ) -> None:
+        """Queue the keys and resizes a client sends for its session."""
+        decoder = session.keys.decoder
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == KEYS and session._events is not None:
+                    session._events.put_nowait(decoder.feed(payload))
+                    if decoder.pending:
+                        loop.call_later(
+                            ESC_TIMEOUT, session._on_escape_timeout
+                        )
+                elif kind == SIZE:
+                    size = _parse_size(payload)
+                    session.renderer.get_size = lambda: size
+                    session._on_resize()
+        except (asyncio.IncompleteReadError, ConnectionError, PPMError):
+            session.running = False
+            session._wake()
+
+
+def _terminal_size() -> bytes:
+    """Return the SIZE payload of the local terminal."""
+    size = shutil.get_terminal_size()
+    payload = f'{size.columns} {size.lines}'.encode()
+    if _use_color():
+        payload += b' ' + COLOR
+    return payload
+
+
+async def open_connection(
+    address: str
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a Unix socket path, or to 'host:port' over TCP."""
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit() and not os.path.exists(address):
+        return await asyncio.open_connection(host, int(port))
+    return await asyncio.open_unix_connection(address)
+
+
+async def run_client(address: str) -> None:
+    """
+    Show a served menu in this terminal.
+
+    Keys are sent as typed, frames are written as received, and the
+    terminal size is sent again on every resize.
+
+    Args:
+        address: Unix socket path, or 'host:port' for TCP.
+    """
+    reader, writer = await open_connection(address)
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+
+    def send_size() -> None:
+        if not writer.is_closing():
+            writer.write(pack(SIZE, _terminal_size()))
+
+    def on_input() -> None:
+        try:
+            data = os.read(fd, READ_SIZE)
+        except OSError:
+            data = b''
+        if data:
+            writer.write(pack(KEYS, data))
+        else:
+            loop.remove_reader(fd)
+            writer.close()
+
+    terminal = TerminalSession(fd)
+    terminal.on_resize = lambda: loop.call_soon_threadsafe(send_size)
+    send_size()
+    with terminal:
+        loop.add_reader(fd, on_input)
+        try:
+            while True:
+                try:
+                    kind, payload = await read_message(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if kind == FRAME:
+                    sys.stdout.write(payload.decode())
+                    sys.stdout.flush()
+        finally:
+            loop.remove_reader(fd)
+            writer.close()
+    print()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Connect this terminal to a menu server."""
+    parser = argparse.ArgumentParser(
+        prog='python -m ppmenu.server',
+        description='Show a menu served by a ppmenu MenuServer.',
+    )
+    parser.add_argument(
+        'address', help='Unix socket path, or host:port for TCP'
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_client(args.address))
+    except OSError as error:
+        sys.exit(f'Cannot connect to {args.address}: {error}')
+
+
+if __name__ == '__main__':
+    main()
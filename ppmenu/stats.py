@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Timing and usage instrumentation for PPMenu."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import bisect
+import json
+import logging
+import threading
+import time
+
+from collections import deque
+from typing import Any, Callable
+
+# Phases of one run-loop iteration
+PHASES = ('input', 'update', 'render', 'action')
+
+# Upper bounds of the histogram buckets, in milliseconds
+BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+# Number of recent loop iterations kept in `MenuStats.history`
+HISTORY_SIZE = 1000
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations, with count, total and max."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Record one duration."""
+        self.counts[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the histogram as plain data, durations in milliseconds."""
+        labels = [f'<={bound}ms' for bound in BUCKETS_MS]
+        labels.append(f'>{BUCKETS_MS[-1]}ms')
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class PathStats:
+    """Counters for one menu path."""
+
+    __slots__ = ('visits', 'errors', 'actions')
+
+    def __init__(self) -> None:
+        """Initialize zeroed counters."""
+        self.visits: int = 0
+        self.errors: int = 0
+        self.actions = Histogram()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the counters as plain data."""
+        return {
+            'visits': self.visits,
+            'errors': self.errors,
+            'actions': self.actions.to_dict(),
+        }
+
+
+class MenuStats:
+    """
+    Observer collecting timings of the run loop and per-path counters.
+
+    Every loop iteration is split into the input, update, render and
+    action phases. Set an instance as `PPM.stats` to enable it; with the
+    default `None` the menu only pays for a few `is None` checks.
+
+    Subclass and override `on_iteration()` to forward timings elsewhere.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize the stats.
+
+        Args:
+            clock: Monotonic time source, in seconds.
+        """
+        self.clock = clock
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.paths: dict[str, PathStats] = {}
+        self.history: deque[dict[str, float]] = deque(maxlen=HISTORY_SIZE)
+        self.iterations: int = 0
+        self.current: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Add time spent in a phase of the current loop iteration."""
+        with self._lock:
+            self.phases[phase].add(seconds)
+            self.current[phase] = self.current.get(phase, 0.0) + seconds
+
+    def visit(self, path: str) -> None:
+        """Count a visit of a menu level."""
+        with self._lock:
+            self._path(path).visits += 1
+
+    def action(self, path: str, seconds: float, failed: bool = False) -> None:
+        """Record the duration and outcome of an action."""
+        with self._lock:
+            stats = self._path(path)
+            stats.actions.add(seconds)
+            if failed:
+                stats.errors += 1
+
+    def end_iteration(self) -> None:
+        """Close the current loop iteration and keep its timings."""
+        with self._lock:
+            timings, self.current = self.current, {}
+            self.iterations += 1
+            self.history.append(timings)
+        self.on_iteration(timings)
+
+    def on_iteration(self, timings: dict[str, float]) -> None:
+        """Hook called with the phase timings of every loop iteration."""
+        pass
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return all collected data as JSON-ready plain data."""
+        with self._lock:
+            return {
+                'iterations': self.iterations,
+                'phases': {
+                    phase: histogram.to_dict()
+                    for phase, histogram in self.phases.items()
+                },
+                'paths': {
+                    path: stats.to_dict()
+                    for path, stats in self.paths.items()
+                },
+            }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Return all collected data as a JSON string."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def log(
+        self,
+        logger: logging.Logger,
+        level: int = logging.INFO
+    ) -> None:
+        """Write a one-line JSON summary to a logger."""
+        logger.log(level, 'ppmenu stats %s', self.to_json())
+
+    def _path(self, path: str) -> PathStats:
+        """Return the counters of a path, creating them on first use."""
+        stats = self.paths.get(path)
+        if stats is None:
+            stats = self.paths[path] = PathStats()
+        return stats
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""Reactive state store and a throttled, dirty-tracked status region."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import threading
+import time
+
+from typing import Any, Callable, Iterable, Optional, Union
+
+# Default upper bound on status redraws per second
+MAX_RATE = 10.0
+
+# Placeholder for keys that were never set
+_MISSING = object()
+
+Stamp = Union[int, tuple[Any, ...]]
+
+
+class State:
+    """
+    Thread-safe key/value store with memoized derived values.
+
+    A derived value is computed from other keys and cached together with
+    the versions of its inputs, so it is recomputed only after one of
+    them changed. Listeners are told about every change; `StatusRegion`
+    uses that to mark itself dirty.
+
+    Example:
+        state = State(cart=[])
+        state.derive('total', lambda cart: sum(p for _, p in cart), 'cart')
+        state.set('cart', [('Latte', 3.5)])
+        state['total']  # 3.5
+    """
+
+    def __init__(self, **values: Any):
+        """
+        Initialize the store.
+
+        Args:
+            **values: Initial plain values.
+        """
+        self._lock = threading.RLock()
+        self._values: dict[str, Any] = dict(values)
+        self._versions: dict[str, int] = dict.fromkeys(values, 1)
+        self._derived: dict[
+            str, tuple[Callable[..., Any], tuple[str, ...]]
+        ] = {}
+        self._memo: dict[str, tuple[Stamp, Any]] = {}
+        self._listeners: list[Callable[[str], None]] = []
+        # Number of times a derived value was computed
+        self.computations: int = 0
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a plain or derived value."""
+        with self._lock:
+            if key in self._derived:
+                return self._compute(key)
+            return self._values[key]
+
+    def __contains__(self, key: object) -> bool:
+        """Whether a plain or derived value exists."""
+        return key in self._values or key in self._derived
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a value, or `default` when there is none."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a plain value and notify listeners when it changed.
+
+        Setting an equal value is a no-op; call `touch()` after changing
+        a value in place.
+
+        Raises:
+            KeyError: If `key` is a derived value.
+        """
+        with self._lock:
+            if key in self._derived:
+                raise KeyError(f'{key!r} is a derived value.')
+            old = self._values.get(key, _MISSING)
+            if old is not _MISSING and old == value:
+                return
+            self._values[key] = value
+        self.touch(key)
+
+    def touch(self, key: str) -> None:
+        """Treat a value as changed, e.g. a list that was appended to."""
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(key)
+
+    def update(self, **values: Any) -> None:
+        """Store several plain values."""
+        for key, value in values.items():
+            self.set(key, value)
+
+    def derive(
+        self,
+        key: str,
+        func: Callable[..., Any],
+        *inputs: str
+    ) -> None:
+        """
+        Define a value computed from other keys.
+
+        Args:
+            key: Name of the derived value.
+            func: Called with the input values, in order.
+            *inputs: Plain or derived keys the value depends on.
+        """
+        with self._lock:
+            self._derived[key] = (func, inputs)
+            self._memo.pop(key, None)
+
+    def version(self, key: str) -> Stamp:
+        """Return a stamp that changes whenever the value of `key` may."""
+        with self._lock:
+            derived = self._derived.get(key)
+            if derived is None:
+                return self._versions.get(key, 0)
+            return tuple(self.version(name) for name in derived[1])
+
+    def subscribe(
+        self,
+        listener: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """
+        Call `listener(key)` after every change of a plain value.
+
+        Listeners run in the thread that made the change.
+
+        Returns:
+            A function that removes the listener.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _compute(self, key: str) -> Any:
+        """Return a derived value, recomputing it if an input changed."""
+        func, inputs = self._derived[key]
+        stamp = self.version(key)
+        memo = self._memo.get(key)
+        if memo is not None and memo[0] == stamp:
+            return memo[1]
+        value = func(*(self[name] for name in inputs))
+        self._memo[key] = (stamp, value)
+        self.computations += 1
+        return value
+
+
+class StatusRegion:
+    """
+    Block of status lines shown between the title and the menu items.
+
+    The lines are rendered from a `State` only after the region was
+    marked dirty, and at most `max_rate` times per second; in between,
+    the previous lines are reused. Any change of the state marks the
+    region dirty, from any thread or task, and wakes the menu so only the
+    status rows are redrawn.
+
+    Example:
+        region = StatusRegion(lambda s: f'Total: ${s["total"]:.2f}', state)
+        menu.status = region
+    """
+
+    def __init__(
+        self,
+        render: Callable[[State], Union[str, Iterable[str]]],
+        state: Optional[State] = None,
+        max_rate: Optional[float] = MAX_RATE,
+        watch: Optional[Iterable[str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the region.
+
+        Args:
+            render: Returns the status text, or its lines, for a state.
+            state: Store the region reads; a new empty one by default.
+            max_rate: Maximum redraws per second, or None for no limit.
+            watch: Keys whose changes mark the region dirty; all keys by
+                default.
+            clock: Monotonic time source, in seconds.
+        """
+        self.render = render
+        self.state = state if state is not None else State()
+        self.max_rate = max_rate
+        self.watch = None if watch is None else frozenset(watch)
+        self.clock = clock
+        # Called when the region turns dirty; `PPM` wakes its loop here
+        self.on_dirty: Optional[Callable[[], None]] = None
+        self.dirty: bool = True
+        self.renders: int = 0
+        self._lines: list[str] = []
+        self._rendered_at: float = float('-inf')
+        self._lock = threading.Lock()
+        self._unsubscribe = self.state.subscribe(self._on_change)
+
+    def mark_dirty(self) -> None:
+        """Request new status lines; safe to call from any thread."""
+        with self._lock:
+            was_dirty, self.dirty = self.dirty, True
+        on_dirty = self.on_dirty
+        if not was_dirty and on_dirty is not None:
+            on_dirty()
+
+    def timeout(self) -> Optional[float]:
+        """Return seconds until a pending redraw is allowed, or None."""
+        if not self.dirty:
+            return None
+        if not self.max_rate:
+            return 0.0
+        due = self._rendered_at + 1 / self.max_rate
+        return max(due - self.clock(), 0.0)
+
+    def lines(self) -> list[str]:
+        """Return the status lines, rendering them if dirty and allowed."""
+        if self.dirty and self.timeout() == 0:
+            with self._lock:
+                self.dirty = False
+            output = self.render(self.state)
+            if isinstance(output, str):
+                self._lines = output.splitlines()
+            else:
+                self._lines = list(output)
+            self._rendered_at = self.clock()
+            self.renders += 1
+        return self._lines
+
+    def copy(self) -> 'StatusRegion':
+        """Return a new region over the same state, with its settings."""
+        return StatusRegion(
+            self.render, self.state, self.max_rate, self.watch, self.clock
+        )
+
+    def close(self) -> None:
+        """Stop listening to the state."""
+        self._unsubscribe()
+
+    def _on_change(self, key: str) -> None:
+        """Mark the region dirty when a watched key changed."""
+        if self.watch is None or key in self.watch:
+            self.mark_dirty()
+
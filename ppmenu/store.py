@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Read-only menu trees stored in one memory-mapped file."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import json
+import mmap
+import struct
+import weakref
+
+from collections import deque
+from collections.abc import Sequence
+from typing import Any, Callable, Iterator, Mapping, Optional
+
+from . import PPMError, split_keys
+from .catalog import ACTION_KEY, ARGS_KEY, resolve_action
+from .chords import MAX_CHORD_LENGTH
+from .lazy import LazyMenu
+from .level import ACTION, LAZY, VALUE, Level
+
+STORE_MAGIC = b'PPMS'
+STORE_VERSION = 2
+
+# Magic, version, node count, offset of the node table
+HEADER = struct.Struct('<4sIIQ')
+
+# One fixed-size record per node:
+# key offset/length, label offset/length, value offset/length,
+# quick-jump table offset/length, first child, child count,
+# kind, quick-jump chord (empty for none)
+NODE = struct.Struct(f'<QIQIQIQIIIB{MAX_CHORD_LENGTH}s')
+
+# Entry of a node's quick-jump table: chord, child position
+QUICK_NAV = struct.Struct(f'<{MAX_CHORD_LENGTH}sI')
+
+# Kinds of stored nodes
+_VALUE, _ACTION, _SUBMENU = range(3)
+
+# Level kind reported for each stored kind; submenus open lazily
+_LEVEL_KINDS = (VALUE, ACTION, LAZY)
+
+
+def build_store(menu: dict[str, Any], path: str) -> None:
+    """
+    Write a menu tree to a store file.
+
+    The menu uses the catalog format: nested dicts are submenus,
+    `{"@action": "name", "args": [...]}` references an action, and any
+    other value must be JSON-serializable. Children of a node are
+    written next to each other, so a level is one slice of the node table.
+
+    Args:
+        menu: Menu tree to store.
+        path: File to write.
+
+    Raises:
+        PPMError: If a level of the tree is invalid.
+    """
+    heap = bytearray()
+    strings: dict[str, tuple[int, int]] = {}
+
+    def text(value: str) -> tuple[int, int]:
+        """Return the heap span of a string, adding it only once."""
+        span = strings.get(value)
+        if span is None:
+            data = value.encode('utf-8')
+            span = strings[value] = (len(heap), len(data))
+            heap.extend(data)
+        return span
+
+    # Node 0 is the invisible root whose children are the top level
+    nodes: list[list[Any]] = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, _SUBMENU, b'']]
+    queue: deque[tuple[dict[str, Any], int]] = deque([(menu, 0)])
+    while queue:
+        raw, parent = queue.popleft()
+        labels, quick_navs, quick_nav_map = split_keys(raw)
+        nav = b''.join(
+            QUICK_NAV.pack(letter.encode(), pos)
+            for letter, pos in quick_nav_map.items()
+        )
+        nodes[parent][6] = len(heap)
+        nodes[parent][7] = len(nav)
+        heap.extend(nav)
+        nodes[parent][8] = len(nodes)
+        nodes[parent][9] = len(raw)
+
+        for (key, value), label, quick_nav in zip(
+            raw.items(), labels, quick_navs
+        ):
+            if isinstance(value, dict) and ACTION_KEY in value:
+                kind = _ACTION
+                data = json.dumps(
+                    [str(value[ACTION_KEY]), list(value.get(ARGS_KEY, []))]
+                )
+            elif isinstance(value, dict):
+                kind, data = _SUBMENU, ''
+                queue.append((value, len(nodes)))
+            else:
+                kind, data = _VALUE, json.dumps(value, default=str)
+            nodes.append([
+                *text(key), *text(label), *text(data), 0, 0, 0, 0,
+                kind, (quick_nav or '').encode(),
+            ])
+
+    nodes_offset = HEADER.size + len(heap)
+    with open(path, 'wb') as store:
+        store.write(
+            HEADER.pack(STORE_MAGIC, STORE_VERSION, len(nodes), nodes_offset)
+        )
+        store.write(heap)
+        for node in nodes:
+            store.write(NODE.pack(*node))
+
+
+class StoreMenu(LazyMenu):
+    """Submenu of a store, opened as a view of its node slice."""
+
+    def __init__(self, store: 'MenuStore', node: int):
+        """
+        Initialize the submenu.
+
+        Args:
+            store: Store the submenu belongs to.
+            node: Index of the submenu's node.
+        """
+        super().__init__(provider=lambda: store.level(node))
+        self.store = store
+        self.node = node
+
+    def load(self) -> Level:  # type: ignore[override]
+        """Return the view of the submenu's level."""
+        return self.store.level(self.node)
+
+
+class _Column(Sequence):
+    """One field of a range of nodes, decoded item by item on access."""
+
+    __slots__ = ('first', 'count', 'decode')
+
+    def __init__(self, first: int, count: int, decode: Callable[[int], Any]):
+        """Initialize the column of `count` nodes from `first` on."""
+        self.first = first
+        self.count = count
+        self.decode = decode
+
+    def __len__(self) -> int:
+        """Return the number of nodes in the column."""
+        return self.count
+
+    def __getitem__(self, pos: int) -> Any:  # type: ignore[override]
+        """Decode the field of the node at a position."""
+        if pos < 0:
+            pos += self.count
+        if not 0 <= pos < self.count:
+            raise IndexError('Menu item index out of range.')
+        return self.decode(self.first + pos)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Decode the field of every node in order."""
+        return map(self.decode, range(self.first, self.first + self.count))
+
+
+class _Sparse(dict):
+    """Per-item cache that only holds entries for items that were shown."""
+
+    def __missing__(self, pos: int) -> None:
+        """Report an item that has no entry as not cached."""
+        return None
+
+
+class StoreLevel(Level):
+    """
+    Zero-copy view of one level of a store.
+
+    Labels, values and kinds are decoded from the mapped file when an
+    item is shown or activated; only the quick-jump table is decoded when
+    the level is opened. The view is read-only.
+    """
+
+    __slots__ = ('store', 'node')
+
+    def __init__(self, store: 'MenuStore', node: int):
+        """
+        Initialize the view.
+
+        Args:
+            store: Store holding the level.
+            node: Index of the node whose children form the level.
+        """
+        self.store = store
+        self.node = node
+        first, count = store.children(node)
+        self.labels = _Column(first, count, store.label)
+        self.original_keys = _Column(first, count, store.key)
+        self.quick_navs = _Column(first, count, store.quick_nav)
+        self.item_values = _Column(first, count, store.value)
+        self.kinds = _Column(first, count, store.kind)
+        self.styled = _Sparse()
+        self.quick_nav_map = store.quick_nav_map(node)
+        self.dispatch = None
+        self.layout = None
+        self._index = None
+
+    def submenus(self) -> Iterator[Any]:
+        """Store levels hold no raw submenu dicts."""
+        return iter(())
+
+    def __setitem__(self, label: str, item: Any) -> None:
+        """Store levels are read-only."""
+        raise TypeError('Menu store levels are read-only.')
+
+    def __delitem__(self, label: str) -> None:
+        """Store levels are read-only."""
+        raise TypeError('Menu store levels are read-only.')
+
+    def __repr__(self) -> str:
+        """Return a short description of the view."""
+        return f'StoreLevel(node={self.node}, items={len(self)})'
+
+
+class MenuStore:
+    """
+    Menu tree read through `mmap` from a file written by `build_store()`.
+
+    Example:
+        build_store(menu, 'menu.store')
+        PPM(MenuStore('menu.store', {'ssh': ssh}).root()).run()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        actions: Optional[Mapping[str, Callable[..., Any]]] = None,
+    ):
+        """
+        Map a store file.
+
+        Args:
+            path: File written by `build_store()`.
+            actions: Actions that the store may reference, by name.
+
+        Raises:
+            PPMError: If the file is not a menu store.
+        """
+        self.path = path
+        self.actions = actions or {}
+        try:
+            with open(path, 'rb') as store:
+                self._mm = mmap.mmap(
+                    store.fileno(), 0, access=mmap.ACCESS_READ
+                )
+        except (OSError, ValueError) as error:
+            raise PPMError(
+                f'Cannot open menu store {path}: {error}'
+            ) from error
+
+        if len(self._mm) < HEADER.size:
+            raise PPMError(f'{path} is not a menu store.')
+        magic, version, self.size, self._nodes = HEADER.unpack_from(self._mm)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            raise PPMError(f'{path} is not a menu store.')
+        self._menus: weakref.WeakValueDictionary[int, StoreMenu] = (
+            weakref.WeakValueDictionary()
+        )
+        # Resolved actions by node, so an item keeps one identity; only
+        # the actions of items that were shown or run are kept
+        self._actions: dict[int, Callable[[], Any]] = {}
+
+    def root(self) -> StoreLevel:
+        """Return the top level of the store."""
+        return self.level(0)
+
+    def level(self, node: int) -> StoreLevel:
+        """Return the view of a node's children."""
+        return StoreLevel(self, node)
+
+    def close(self) -> None:
+        """Unmap the file; levels of the store must not be used afterwards."""
+        self._mm.close()
+
+    # --- Node fields ---
+
+    def _node(self, node: int) -> tuple[Any, ...]:
+        """Unpack the record of a node."""
+        return NODE.unpack_from(self._mm, self._nodes + node * NODE.size)
+
+    def _text(self, offset: int, length: int) -> str:
+        """Decode a string from the heap."""
+        return self._mm[
+            HEADER.size + offset:HEADER.size + offset + length
+        ].decode('utf-8')
+
+    def children(self, node: int) -> tuple[int, int]:
+        """Return the first child and the child count of a node."""
+        record = self._node(node)
+        return record[8], record[9]
+
+    def key(self, node: int) -> str:
+        """Return the key of a node as written in the menu."""
+        record = self._node(node)
+        return self._text(record[0], record[1])
+
+    def label(self, node: int) -> str:
+        """Return the display label of a node."""
+        record = self._node(node)
+        return self._text(record[2], record[3])
+
+    def quick_nav(self, node: int) -> Optional[str]:
+        """Return the quick-jump chord of a node, or None."""
+        chord = self._node(node)[11].rstrip(b'\0')
+        return chord.decode() if chord else None
+
+    def kind(self, node: int) -> int:
+        """Return the level kind of a node."""
+        return _LEVEL_KINDS[self._node(node)[10]]
+
+    def value(self, node: int) -> Any:
+        """
+        Return the menu value of a node.
+
+        Submenus and actions are decoded once, so reading an item again
+        returns the same object.
+        """
+        action = self._actions.get(node)
+        if action is not None:
+            return action
+        record = self._node(node)
+        kind = record[10]
+        if kind == _SUBMENU:
+            menu = self._menus.get(node)
+            if menu is None:
+                menu = self._menus[node] = StoreMenu(self, node)
+            return menu
+        data = json.loads(self._text(record[4], record[5]))
+        if kind == _ACTION:
+            action = self._actions[node] = resolve_action(
+                self.actions, data[0], data[1]
+            )
+            return action
+        return data
+
+    def quick_nav_map(self, node: int) -> dict[str, int]:
+        """Return the quick-jump letter to position map of a node's level."""
+        record = self._node(node)
+        start = HEADER.size + record[6]
+        return {
+            chord.rstrip(b'\0').decode(): pos
+            for chord, pos in QUICK_NAV.iter_unpack(
+                self._mm[start:start + record[7]]
+            )
+        }
+
+
+def open_store(
+    path: str,
+    actions: Optional[Mapping[str, Callable[..., Any]]] = None,
+) -> StoreLevel:
+    """Return the top level of a store, ready to pass to `PPM`."""
+    return MenuStore(path, actions).root()
+
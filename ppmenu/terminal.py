@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Persistent raw-mode terminal session for PPMenu."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import os
+import signal
+import sys
+import termios
+import threading
+import tty
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# Signals after which the terminal must be left in a usable state
+RESTORE_SIGNALS = (signal.SIGTERM, signal.SIGHUP, signal.SIGQUIT)
+
+
+class TerminalSession:
+    """
+    Keep the terminal in raw input mode for the lifetime of a menu.
+
+    The TTY is switched once on enter and restored on exit, on exceptions
+    and on terminating signals. Output post-processing stays enabled, so
+    `print()` and '\\n' keep working while the session is active.
+    """
+
+    def __init__(self, fd: Optional[int] = None):
+        """
+        Initialize the session.
+
+        Args:
+            fd: Terminal file descriptor. Defaults to stdin.
+        """
+        self.fd = fd
+        self.active: bool = False
+        self._saved: Optional[list[Any]] = None
+        self._depth: int = 0
+        self._previous_handlers: dict[int, Any] = {}
+        # Called on SIGWINCH while the session is active
+        self.on_resize: Optional[Callable[[], None]] = None
+
+    def __enter__(self) -> 'TerminalSession':
+        """Switch the terminal into raw mode."""
+        self._depth += 1
+        if self._depth > 1:
+            return self
+
+        fd = self._fileno()
+        if fd is None or not os.isatty(fd):
+            return self
+
+        self._saved = termios.tcgetattr(fd)
+        self._install_signal_handlers()
+        self._enter_raw()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Restore the original terminal mode."""
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        self.restore()
+        self._remove_signal_handlers()
+        self._saved = None
+
+    @contextmanager
+    def cooked(self) -> Iterator[None]:
+        """Temporarily restore cooked mode, e.g. while an action runs."""
+        was_active = self.active
+        self.restore()
+        try:
+            yield
+        finally:
+            if was_active:
+                self._enter_raw()
+
+    def restore(self) -> None:
+        """Put the saved terminal attributes back."""
+        if self._saved is None or not self.active:
+            return
+        termios.tcsetattr(self._fileno(), termios.TCSADRAIN, self._saved)
+        self.active = False
+
+    def _enter_raw(self) -> None:
+        """Enable raw input while keeping output post-processing."""
+        fd = self._fileno()
+        tty.setraw(fd, termios.TCSANOW)
+        attrs = termios.tcgetattr(fd)
+        attrs[tty.OFLAG] |= termios.OPOST
+        termios.tcsetattr(fd, termios.TCSANOW, attrs)
+        self.active = True
+
+    def _fileno(self) -> Optional[int]:
+        """Return the terminal file descriptor, if there is one."""
+        if self.fd is not None:
+            return self.fd
+        try:
+            return sys.stdin.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    # --- Signal Handling ---
+
+    def _install_signal_handlers(self) -> None:
+        """Restore the terminal before terminating signals take effect."""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum in RESTORE_SIGNALS:
+            self._previous_handlers[signum] = signal.signal(
+                signum, self._handle_signal
+            )
+        if self.on_resize is not None and hasattr(signal, 'SIGWINCH'):
+            self._previous_handlers[signal.SIGWINCH] = signal.signal(
+                signal.SIGWINCH, self._handle_resize
+            )
+
+    def _remove_signal_handlers(self) -> None:
+        """Reinstall the handlers that were active before the session."""
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers.clear()
+
+    def _handle_resize(self, signum: int, frame: Any) -> None:
+        """Report a terminal resize."""
+        if self.on_resize is not None:
+            self.on_resize()
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        """Restore the terminal, then let the original handler run."""
+        self.restore()
+        previous = self._previous_handlers.get(signum, signal.SIG_DFL)
+        signal.signal(signum, previous)
+        self._previous_handlers.pop(signum, None)
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.raise_signal(signum)
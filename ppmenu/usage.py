@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Usage statistics of menu paths, for adaptive selection and prefetch."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+import json
+import os
+import tempfile
+import time
+
+from typing import Callable, Optional
+
+from .paths import SEPARATOR
+
+# Seconds after which a past selection counts half as much
+DEFAULT_HALF_LIFE = 7 * 24 * 3600.0
+
+# Submenus loaded in the background when a level is shown
+DEFAULT_PREFETCH = 2
+
+# Most paths kept in the usage file; the least used ones are dropped
+MAX_ENTRIES = 5000
+
+USAGE_VERSION = 1
+
+
+class UsageModel:
+    """
+    How often and how recently each menu path was selected.
+
+    Every path has a selection count, the time of its last selection
+    and a frecency score: each selection adds 1, and the score halves
+    every `half_life` seconds. Paths are item labels from the root joined
+    with '/', as accepted by `PPM.goto()`.
+
+    Example:
+        menu.usage = UsageModel('~/.cache/ops-menu.json')
+        menu.run()    # saved when the menu exits
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        half_life: float = DEFAULT_HALF_LIFE,
+        prefetch: int = DEFAULT_PREFETCH,
+        preselect: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the model, loading the file if it exists.
+
+        Args:
+            path: JSON file the statistics are kept in; None keeps them
+                in memory only.
+            half_life: Seconds after which a selection counts half.
+            prefetch: Number of likely submenus to load in the
+                background when a level is shown; 0 turns it off.
+            preselect: Select the likeliest item when a level opens.
+            clock: Wall-clock time source, in seconds.
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.half_life = half_life
+        self.prefetch = prefetch
+        self.preselect = preselect
+        self.clock = clock
+        # Path to [count, time of last selection, score at that time]
+        self.entries: dict[str, list[float]] = {}
+        self.dirty: bool = False
+        if self.path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        """Return the number of paths with statistics."""
+        return len(self.entries)
+
+    def record(self, path: str) -> None:
+        """Count a selection of a path now."""
+        now = self.clock()
+        entry = self.entries.get(path)
+        if entry is None:
+            self.entries[path] = [1, now, 1.0]
+        else:
+            entry[2] = self._decayed(entry, now) + 1
+            entry[0] += 1
+            entry[1] = now
+        self.dirty = True
+
+    def count(self, path: str) -> int:
+        """Return how often a path was selected."""
+        entry = self.entries.get(path)
+        return int(entry[0]) if entry is not None else 0
+
+    def score(self, path: str) -> float:
+        """Return the frecency of a path; 0 if it was never selected."""
+        entry = self.entries.get(path)
+        return self._decayed(entry, self.clock()) if entry else 0.0
+
+    def recent(self, limit: Optional[int] = None) -> list[str]:
+        """Return the used paths, the highest frecency first."""
+        now = self.clock()
+        ranked = sorted(
+            self.entries,
+            key=lambda path: self._decayed(self.entries[path], now),
+            reverse=True,
+        )
+        return ranked[:limit]
+
+    def likely(self, parent: str) -> list[str]:
+        """
+        Return the labels of used items of a level, likeliest first.
+
+        Args:
+            parent: Path of the level; '' for the root.
+        """
+        prefix = parent + SEPARATOR if parent else ''
+        now = self.clock()
+        scores: dict[str, float] = {}
+        for path, entry in self.entries.items():
+            if not path.startswith(prefix):
+                continue
+            label = path[len(prefix):]
+            if SEPARATOR not in label:
+                scores[label] = self._decayed(entry, now)
+        return sorted(scores, key=scores.__getitem__, reverse=True)
+
+    def load(self) -> None:
+        """Read the statistics file; a missing or damaged file is ignored."""
+        if self.path is None:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != USAGE_VERSION:
+            return
+        try:
+            entries = {
+                str(path): [float(value) for value in entry]
+                for path, entry in data.get('paths', {}).items()
+                if isinstance(entry, list) and len(entry) == 3
+            }
+        except (AttributeError, TypeError, ValueError):
+            return
+        self.entries = entries
+        self.dirty = False
+
+    def save(self) -> None:
+        """
+        Write the statistics if they changed.
+
+        The file is replaced atomically, and only the `MAX_ENTRIES` paths
+        with the highest frecency are kept.
+        """
+        if self.path is None or not self.dirty:
+            return
+        keep = self.recent(MAX_ENTRIES)
+        data = {
+            'version': USAGE_VERSION,
+            'paths': {path: self.entries[path] for path in keep},
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.dirty = False
+
+    def _decayed(self, entry: list[float], now: float) -> float:
+        """Return the score of an entry at a given time."""
+        age = max(now - entry[1], 0.0)
+        return entry[2] * 0.5 ** (age / self.half_life)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Scrolling viewport over the items of a menu level."""
+
+# created by Sergey Samoylov https://github.com/sergey-samoylov/ppmenu
+
+# Rows always given to menu items, even on very small terminals
+MIN_VIEWPORT_HEIGHT = 3
+
+
+class Viewport:
+    """
+    Window of visible rows that follows the selected item.
+
+    Only the items inside the window are formatted, so the cost of a
+    frame depends on the terminal height, not on the size of the menu.
+    With several columns, items run down each column and the window
+    scrolls a whole column at a time.
+    """
+
+    def __init__(self, height: int = MIN_VIEWPORT_HEIGHT):
+        """
+        Initialize the viewport.
+
+        Args:
+            height: Number of rows available for menu items.
+        """
+        self.top: int = 0
+        self.rows: int = max(height, MIN_VIEWPORT_HEIGHT)
+        self.columns: int = 1
+        # Number of visible items
+        self.height: int = self.rows
+
+    def fit(self, rows: int, columns: int = 1) -> None:
+        """Resize the viewport to the rows left over for menu items."""
+        self.rows = max(rows, MIN_VIEWPORT_HEIGHT)
+        self.columns = max(columns, 1)
+        self.height = self.rows * self.columns
+
+    def reset(self) -> None:
+        """Scroll back to the first item, e.g. after a level change."""
+        self.top = 0
+
+    def window(self, pos: int, total: int) -> range:
+        """
+        Return the item indexes to draw, scrolling to keep `pos` visible.
+
+        Args:
+            pos: Index of the selected item.
+            total: Number of items in the level.
+        """
+        step = self.rows if self.columns > 1 else 1
+        self.top -= self.top % step
+        if pos < self.top:
+            self.top = pos - pos % step
+        elif pos >= self.top + self.height:
+            self.top = (pos // step + 1) * step - self.height
+        # End of the last column, which may be partly filled
+        end = -(-total // step) * step
+        self.top = max(min(self.top, end - self.height), 0)
+        return range(self.top, min(self.top + self.height, total))
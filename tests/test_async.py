@@ -0,0 +1,94 @@
+import asyncio
+import os
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.decoder import KeyReader
+from ppmenu.stats import MenuStats
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+def make_menu(structure, read_fd):
+    menu = PPM(structure)
+    menu.keys = KeyReader(fd=read_fd)
+    menu.frames = []
+    menu.renderer.write = menu.frames.append
+    return menu
+
+
+# --- Tests ---
+
+def test_run_async_handles_keys(pipe):
+    read_fd, write_fd = pipe
+    menu = make_menu({'One': lambda: None, 'Two': lambda: None}, read_fd)
+    os.write(write_fd, b'jq')
+    asyncio.run(asyncio.wait_for(menu.run_async(), timeout=2))
+    assert menu.current_pos == 1
+    assert not menu.running
+
+def test_run_async_times_input(pipe):
+    read_fd, write_fd = pipe
+    menu = make_menu({'One': lambda: None, 'Two': lambda: None}, read_fd)
+    menu.stats = MenuStats()
+    os.write(write_fd, b'jq')
+    asyncio.run(asyncio.wait_for(menu.run_async(), timeout=2))
+    assert menu.stats.phases['input'].count == menu.stats.iterations >= 1
+
+def test_coroutine_action_is_awaited(pipe):
+    read_fd, write_fd = pipe
+    calls = []
+
+    async def fetch():
+        await asyncio.sleep(0)
+        calls.append('fetched')
+
+    menu = make_menu({'[f] Fetch': fetch, '[x] Exit': lambda: None}, read_fd)
+    os.write(write_fd, b'fq')
+    asyncio.run(asyncio.wait_for(menu.run_async(), timeout=2))
+    assert calls == ['fetched']
+
+def test_coroutine_action_in_sync_run():
+    calls = []
+
+    async def fetch():
+        calls.append('fetched')
+
+    menu = PPM({'[f] Fetch': fetch})
+    menu.renderer.write = lambda data: None
+    menu._activate_item(menu.menu, 0)
+    assert calls == ['fetched']
+
+def test_request_redraw_draws_new_frame(pipe):
+    read_fd, write_fd = pipe
+    status = {'text': 'waiting'}
+
+    class LiveMenu(PPM):
+        def _display_cart(self) -> None:
+            print(status['text'])
+
+    menu = LiveMenu({'One': lambda: None})
+    menu.keys = KeyReader(fd=read_fd)
+    frames = []
+    menu.renderer.write = frames.append
+
+    async def feed():
+        await asyncio.sleep(0.01)
+        status['text'] = 'deployed'
+        menu.request_redraw()
+        await asyncio.sleep(0.01)
+        os.write(write_fd, b'q')
+
+    async def main():
+        await asyncio.gather(menu.run_async(), feed())
+
+    asyncio.run(asyncio.wait_for(main(), timeout=2))
+    assert any('deployed' in frame for frame in frames)
@@ -0,0 +1,184 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.batch import Batch, BatchAction
+from ppmenu.constants import Keys
+from ppmenu.headless import HeadlessDriver
+from ppmenu.jobs import JobRunner
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def menu(calls):
+    def action(name):
+        return lambda: calls.append(name) or name.upper()
+
+    return PPM({
+        f'host{i}': action(f'host{i}') for i in range(6)
+    } | {'Settings': {'Reset': action('reset')}})
+
+
+def wait(batch):
+    for job in batch.jobs():
+        job.future.exception(timeout=5)
+
+
+# --- Tests ---
+
+def test_space_toggles_and_moves_down(menu):
+    menu._handle_keys(menu.menu, [Keys.SPACE, Keys.SPACE])
+    assert menu._marked(menu.menu) == {0, 1}
+    assert menu.current_pos == 2
+
+    menu._handle_keys(menu.menu, ['k', Keys.SPACE])
+    assert menu._marked(menu.menu) == {0}
+
+
+def test_range_mark(menu):
+    menu._handle_keys(menu.menu, [Keys.SPACE, 'j', 'j', '+'])
+    assert menu._marked(menu.menu) == {0, 1, 2, 3}
+
+
+def test_mark_all_toggles(menu):
+    menu._handle_key(menu.menu, '*')
+    assert len(menu._marked(menu.menu)) == 7
+    menu._handle_key(menu.menu, '*')
+    assert menu.marks == {}
+
+
+def test_escape_clears_marks(menu):
+    menu._handle_keys(menu.menu, ['*', Keys.ESCAPE])
+    assert menu.marks == {}
+
+
+def test_marks_are_shown(menu):
+    frames = HeadlessDriver(menu).run([Keys.SPACE])
+    lines = frames[-1].splitlines()
+    assert lines[0].startswith('1 marked')
+    assert lines[1] == ' * host0'
+    assert lines[2] == '-> host1'
+
+
+def test_mark_search_matches(menu):
+    menu._handle_keys(menu.menu, ['j', '/', '1', Keys.CTRL_A])
+    assert menu.search is None
+    assert menu._marked(menu.menu) == {1}
+    assert menu.current_pos == 1
+
+
+def test_mark_search_matches_in_whole_menu(menu):
+    menu._handle_keys(
+        menu.menu, ['/', 'r', 'e', 's', 'e', 't', Keys.TAB, Keys.CTRL_A]
+    )
+    (level, pos), = menu.marked()
+    assert level.labels[pos] == 'Reset'
+
+
+def test_enter_runs_marked_items(menu, calls):
+    menu._handle_keys(menu.menu, [Keys.SPACE, 'j', Keys.SPACE, Keys.ENTER])
+    batch = menu.batch
+    wait(batch)
+    assert sorted(calls) == ['host0', 'host2']
+    assert batch.results() == {'host0': 'HOST0', 'host2': 'HOST2'}
+    assert batch.summary() == '2/2 done'
+    assert menu.marks == {}
+
+
+def test_batch_progress_is_shown(menu):
+    driver = HeadlessDriver(menu)
+    menu.run_batch([(menu.menu, 0), (menu.menu, 1)])
+    wait(menu.batch)
+    menu._handle_keys(menu.menu, ['j'])
+    menu._display_menu(menu.menu)
+    frame = driver.frames[-1]
+    assert 'Batch: 2/2 done' in frame
+    assert 'host0 [done' in frame
+
+
+def test_batch_action_gets_all_arguments():
+    seen = []
+
+    def deploy(hosts):
+        seen.append(hosts)
+        return len(hosts)
+
+    menu = PPM({f'web{i}': BatchAction(deploy, f'web{i}') for i in range(4)})
+    batch = menu.run_batch([(menu.menu, 0), (menu.menu, 2), (menu.menu, 3)])
+    wait(batch)
+    assert seen == [['web0', 'web2', 'web3']]
+    assert len(batch.jobs()) == 1
+    assert batch.job(menu.menu, 2) is batch.job(menu.menu, 0)
+    assert batch.results() == {'web0': 3, 'web2': 3, 'web3': 3}
+
+
+def test_batch_action_runs_alone():
+    action = BatchAction(lambda hosts: hosts, 'db')
+    assert action() == ['db']
+
+
+def test_batch_concurrency_is_bounded():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def work():
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    menu = PPM({f'job{i}': (lambda: work()) for i in range(8)})
+    menu.batch_workers = 2
+    wait(menu.run_batch([(menu.menu, i) for i in range(8)]))
+    assert 1 <= running[1] <= 2
+
+
+def test_batch_uses_job_runner(menu):
+    menu.jobs = JobRunner(max_workers=1)
+    batch = menu.run_batch([(menu.menu, 0)])
+    wait(batch)
+    assert batch.summary() == '1/1 done'
+    menu.jobs.shutdown()
+
+
+def test_errors_and_non_actions():
+    def fail():
+        raise RuntimeError('down')
+
+    menu = PPM({'ok': lambda: 1, 'bad': fail, 'sub': {'x': 1}})
+    batch = menu.run_batch([(menu.menu, 0), (menu.menu, 1), (menu.menu, 2)])
+    wait(batch)
+    assert len(batch.items) == 2
+    assert str(batch.errors()['bad']) == 'down'
+    assert batch.summary() == '1/2 done, 1 failed'
+
+
+def test_batch_from_executor_directly(menu):
+    with ThreadPoolExecutor(2) as executor:
+        batch = Batch([(menu.menu, 3)], executor)
+        wait(batch)
+    assert batch.progress() == {'done': 1}
+
+
+def test_right_arrow_opens_submenu_with_marks_pending(menu, calls):
+    menu._handle_key(menu.menu, Keys.SPACE)
+    level = menu._handle_keys(menu.menu, [Keys.END, Keys.ARROW_RIGHT])
+    assert level.labels == ['Reset']
+    assert menu.batch is None
+    assert calls == []
+
+    menu._handle_keys(level, [Keys.SPACE, Keys.ENTER])
+    wait(menu.batch)
+    assert sorted(calls) == ['host0', 'reset']
@@ -0,0 +1,51 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCH_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'benchmarks', 'bench_pty.py',
+)
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def bench():
+    spec = importlib.util.spec_from_file_location('bench_pty', BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def report(p50):
+    return {'results': [{
+        'size': 10, 'depth': 1, 'startup_ms': 5.0,
+        'latency_ms': {'p50': p50, 'p90': 1.0},
+        'bytes_per_frame': {'mean': 80.0}, 'syscalls_per_key': 2.0,
+        'peak_rss_kb': 18000,
+    }]}
+
+
+# --- Tests ---
+
+def test_benchmark_produces_json_report(tmp_path):
+    output = tmp_path / 'bench.json'
+    subprocess.run(
+        [sys.executable, BENCH_PATH, '--sizes', '10', '--depths', '2',
+         '--keys', '4', '--output', str(output)],
+        check=True, capture_output=True, timeout=60,
+    )
+    results = json.loads(output.read_text())['results']
+    assert [(r['size'], r['depth']) for r in results] == [(10, 1), (10, 2)]
+    assert all(r['keys'] == 4 for r in results)
+    assert results[0]['bytes_per_frame']['mean'] > 0
+
+def test_compare_flags_regressions(bench):
+    assert bench.compare(report(0.5), report(0.55), threshold=0.2) == []
+    regressions = bench.compare(report(0.5), report(1.0), threshold=0.2)
+    assert len(regressions) == 1
+    assert 'latency_ms.p50' in regressions[0]
@@ -0,0 +1,141 @@
+import json
+import os
+
+import pytest
+
+from ppmenu import PPM, PPMError
+from ppmenu.catalog import (
+    CACHE_SUFFIX,
+    HEADER,
+    Catalog,
+    CatalogMenu,
+    load_catalog,
+)
+from ppmenu.level import ACTION, LAZY, VALUE
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def actions(calls):
+    return {'deploy': lambda *args: calls.append(args)}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'menu.json'
+    path.write_text(json.dumps({
+        '[d] Deploy': {'@action': 'deploy', 'args': ['prod']},
+        '[o] Hosts': {
+            'web-1': {'@action': 'deploy'},
+            'web-2': 'offline',
+        },
+        'Version': 3,
+    }))
+    return str(path)
+
+
+# --- Tests ---
+
+def test_root_level(source, actions):
+    level = load_catalog(source, actions)
+    assert level.labels == ['Deploy', 'Hosts', 'Version']
+    assert level.quick_nav_map == {'d': 0, 'o': 1}
+    assert list(level.kinds) == [ACTION, LAZY, VALUE]
+    assert isinstance(level.item_values[1], CatalogMenu)
+
+
+def test_actions_get_their_args(source, actions, calls):
+    level = load_catalog(source, actions)
+    level.item_values[0]()
+    assert calls == [('prod',)]
+
+
+def test_submenu_is_decoded_on_open(source, actions):
+    menu = PPM(load_catalog(source, actions))
+    hosts = menu._handle_key(menu.menu, 'o')
+    assert hosts.labels == ['web-1', 'web-2']
+    assert hosts.item_values[1] == 'offline'
+    assert menu.path[0][0] is menu.menu
+
+
+def test_cache_is_reused(source, actions):
+    assert Catalog(source, actions).compiled
+    assert os.path.exists(source + CACHE_SUFFIX)
+    assert not Catalog(source, actions).compiled
+
+
+def test_touched_catalog_keeps_cache(source, actions):
+    Catalog(source, actions)
+    os.utime(source, ns=(0, 0))
+    assert not Catalog(source, actions).compiled
+
+
+def test_changed_catalog_is_recompiled(source, actions):
+    Catalog(source, actions)
+    with open(source, 'w') as catalog:
+        json.dump({'Only': 1, 'Items': 2}, catalog)
+    catalog = Catalog(source, actions)
+    assert catalog.compiled
+    assert catalog.root().labels == ['Only', 'Items']
+
+
+def test_unwritable_cache_stays_in_memory(source, actions, tmp_path):
+    cache_path = str(tmp_path / 'missing' / 'menu.ppmc')
+    catalog = Catalog(source, actions, cache_path=cache_path)
+    assert catalog.root().labels[0] == 'Deploy'
+    hosts = catalog.root().item_values[1].load()
+    assert hosts.labels == ['web-1', 'web-2']
+
+
+def test_unknown_action(source):
+    with pytest.raises(PPMError, match='Unknown action'):
+        load_catalog(source, {})
+
+
+def test_unknown_action_in_submenu(tmp_path, actions):
+    path = tmp_path / 'menu.json'
+    path.write_text(json.dumps({
+        'Deploy': {'@action': 'deploy'},
+        'Hosts': {'web-1': {'@action': 'deplyo'}},
+    }))
+    for _ in range(2):
+        # Checked both when compiling and when the cache is reused
+        with pytest.raises(PPMError, match='Unknown action.*: deplyo'):
+            Catalog(str(path), actions)
+
+
+def test_cache_of_other_interpreter_is_recompiled(source, actions):
+    Catalog(source, actions)
+    with open(source + CACHE_SUFFIX, 'r+b') as cache:
+        cache.seek(8)
+        cache.write(b'other-interpreter'.ljust(32, b'\0'))
+    assert Catalog(source, actions).compiled
+
+
+def test_damaged_cache_is_recompiled(source, actions):
+    Catalog(source, actions)
+    with open(source + CACHE_SUFFIX, 'r+b') as cache:
+        cache.truncate(HEADER.size + 2)
+    catalog = Catalog(source, actions)
+    assert catalog.compiled
+    assert catalog.root().labels[0] == 'Deploy'
+
+
+def test_duplicate_quick_nav(tmp_path):
+    path = tmp_path / 'menu.json'
+    path.write_text('{"[a] One": 1, "[a] Two": 2}')
+    with pytest.raises(PPMError, match='Duplicate quick jump letter'):
+        Catalog(str(path), {})
+
+
+def test_invalid_catalog(tmp_path):
+    path = tmp_path / 'menu.json'
+    path.write_text('[1, 2]')
+    with pytest.raises(PPMError):
+        Catalog(str(path), {})
@@ -0,0 +1,139 @@
+import pytest
+
+from ppmenu import PPM, PPMError
+from ppmenu.chords import assign_chords, build_trie, hint_chords
+from ppmenu.constants import Keys
+from ppmenu.headless import HeadlessDriver
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def menu(calls):
+    def action(name):
+        return lambda: calls.append(name)
+
+    return PPM({
+        '[db] Database': action('db'),
+        '[dp] Deploy': action('dp'),
+        '[d] Dashboard': action('d'),
+        '[x] Exit': action('x'),
+    })
+
+
+# --- Tests ---
+
+def test_trie_marks_unique_prefixes():
+    root = build_trie({'db': 0, 'dp': 1, 'x': 2, 'ab': 3})
+    assert root.children['d'].only is None
+    assert root.children['x'].only == 2
+    assert root.children['a'].only == 3
+    assert root.children['d'].children['p'].position == 1
+
+
+def test_hint_chords_are_short_and_prefix_free():
+    hints = hint_chords(400, 'abcdefgimnoprstuvwxy')
+    assert len(set(hints)) == 400
+    assert max(map(len, hints)) == 2
+    assert not any(
+        a != b and b.startswith(a) for a in hints for b in hints[:40]
+    )
+    assert hint_chords(1, 'ab') == ['a']
+
+
+def test_assign_chords_avoids_reserved_and_explicit():
+    quick_navs = ['a', None, None]
+    quick_nav_map = {'a': 0}
+    assign_chords(quick_navs, quick_nav_map, reserved='bcdefghijklmnopqrstuvw')
+    assert quick_navs == ['a', 'x', 'y']
+    assert quick_nav_map == {'a': 0, 'x': 1, 'y': 2}
+
+
+def test_multi_letter_keys_are_parsed(menu):
+    assert menu.menu.quick_navs == ['db', 'dp', 'd', 'x']
+    assert menu.menu.labels[0] == 'Database'
+
+
+def test_duplicate_chord():
+    with pytest.raises(PPMError, match='Duplicate'):
+        PPM({'[ab] One': 1, '[AB] Two': 2})
+
+
+def test_complete_chord_dispatches(menu, calls):
+    HeadlessDriver(menu).run(['d', 'p'])
+    assert calls == ['dp']
+
+
+def test_ambiguous_prefix_waits_then_jumps(menu, calls):
+    level = menu._handle_key(menu.menu, 'd')
+    assert menu._input_timeout() is not None
+    assert calls == []
+    menu._handle_keys(level, [])
+    assert calls == ['d']
+    assert menu._chord is None
+
+
+def test_other_key_resolves_prefix(menu, calls):
+    menu._handle_keys(menu.menu, ['d', 'x'])
+    assert calls == ['d', 'x']
+
+
+def test_escape_cancels_unfinished_chord():
+    menu = PPM({'[ab] One': 1, '[ac] Two': 2, 'Three': 3})
+    menu._handle_key(menu.menu, 'a')
+    assert menu._chord is not None
+    assert menu._handle_key(menu.menu, Keys.ESCAPE) is menu.menu
+    assert menu._chord is None
+
+
+def test_escape_cancels_chord_that_is_also_an_item():
+    calls = []
+    menu = PPM({
+        '[d] Dashboard': lambda: calls.append('d'),
+        '[db] Database': lambda: calls.append('db'),
+    })
+    menu.renderer.write = lambda data: None
+    menu._handle_keys(menu.menu, ['d', Keys.ESCAPE])
+    assert menu._chord is None
+    assert calls == []
+
+
+@pytest.mark.parametrize('move', [Keys.ARROW_DOWN, Keys.ARROW_UP])
+def test_move_cancels_pending_chord(menu, calls, move):
+    menu.renderer.write = lambda data: None
+    menu.current_pos = 1
+    menu._handle_keys(menu.menu, ['d', move, move])
+    assert menu._chord is None
+    menu._handle_keys(menu.menu, ['b'])
+    assert calls == []
+
+
+def test_chord_letters_do_not_move(menu):
+    menu = PPM({'[aj] One': 1, '[ak] Two': 2, 'Three': 3})
+    menu._handle_keys(menu.menu, ['a', 'k'])
+    assert menu.current_pos == 1
+
+
+def test_auto_quick_jump():
+    raw = {f'Host {i}': i for i in range(300)}
+    menu = PPM(raw, auto_quick_jump=True)
+    quick_navs = menu.menu.quick_navs
+    assert None not in quick_navs
+    assert max(map(len, quick_navs)) <= 2
+    assert not set('hjklq') & {chord[0] for chord in quick_navs}
+
+    target = quick_navs[250]
+    menu._handle_keys(menu.menu, list(target))
+    assert menu.current_pos == 250
+
+
+def test_auto_chords_are_shown():
+    menu = PPM({'Alpha': 1, 'Beta': 2}, auto_quick_jump=True)
+    frames = HeadlessDriver(menu).run([])
+    assert '[a] Alpha' in frames[0]
+    assert '[b] Beta' in frames[0]
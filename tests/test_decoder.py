@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.constants import Keys
+from ppmenu.decoder import KeyDecoder, KeyReader, coalesce
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def decoder():
+    return KeyDecoder()
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+# --- Tests ---
+
+def test_plain_keys_and_arrows_in_one_chunk(decoder):
+    keys = decoder.feed(b'jj\x1b[Bk\x1b[A')
+    assert keys == ['j', 'j', Keys.ARROW_DOWN, 'k', Keys.ARROW_UP]
+
+def test_long_sequences_are_decoded_whole(decoder):
+    keys = decoder.feed(b'\x1b[5~\x1b[6~\x1b[1~\x1bOF\x1b[1;5A')
+    assert keys == [
+        Keys.PAGE_UP, Keys.PAGE_DOWN, Keys.HOME, Keys.END, Keys.ARROW_UP,
+    ]
+
+def test_alt_key(decoder):
+    assert decoder.feed(b'\x1bH') == ['ALT+h']
+
+def test_split_sequence_waits_for_rest(decoder):
+    assert decoder.feed(b'\x1b[') == []
+    assert decoder.pending
+    assert decoder.feed(b'B') == [Keys.ARROW_DOWN]
+    assert not decoder.pending
+
+def test_lone_escape_after_flush(decoder):
+    assert decoder.feed(b'\x1b') == []
+    assert decoder.flush() == [Keys.ESCAPE]
+
+def test_bracketed_paste_is_one_event(decoder):
+    keys = decoder.feed(b'\x1b[200~q\x1b[Ax\x1b[2')
+    assert keys == []
+    assert decoder.feed(b'01~j') == [Keys.PASTE + 'q\x1b[Ax', 'j']
+
+def test_utf8_split_across_reads(decoder):
+    data = 'ж'.encode()
+    assert decoder.feed(data[:1]) == []
+    assert decoder.feed(data[1:]) == ['ж']
+
+def test_coalesce_groups_repeats():
+    assert coalesce(['j', 'j', 'j', 'k', 'j']) == [
+        ('j', 3), ('k', 1), ('j', 1),
+    ]
+
+def test_reader_returns_whole_batch(pipe):
+    read_fd, write_fd = pipe
+    os.write(write_fd, b'jjj\x1b')
+    reader = KeyReader(fd=read_fd)
+    assert reader.read() == ['j', 'j', 'j']
+    assert reader.read() == [Keys.ESCAPE]
+
+def test_held_key_is_one_state_change_and_one_render():
+    menu = PPM({f'Item {i}': lambda: None for i in range(5000)})
+    output = []
+    menu.renderer.write = output.append
+    batches = iter([['j'] * 300, ['q']])
+    menu._read_keys = lambda: next(batches)
+    menu.run()
+    assert menu.current_pos == 300
+    assert menu.renderer.frames == 2
@@ -0,0 +1,101 @@
+import pytest
+
+from ppmenu import PPM, PPMError
+from ppmenu.constants import Keys
+from ppmenu.headless import HeadlessDriver
+from ppmenu.lazy import LazyMenu
+from ppmenu.paths import PathIndex
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def menu():
+    return PPM({
+        '[f] File': {
+            'New': lambda: None,
+            '[r] Recent': {'report.txt': 1, 'readme.md': 2},
+        },
+        '[e] Edit': {'Undo': lambda: None},
+        'Remote': LazyMenu(lambda: {'host-1': 1, 'host-2': 2}),
+    })
+
+
+@pytest.fixture
+def index():
+    return PathIndex(
+        [('File',), ('File', 'New'), ('File', 'Open'), ('Help',)],
+        [(0,), (0, 0), (0, 1), (1,)],
+    )
+
+
+# --- Tests ---
+
+def test_index_lookup(index):
+    assert index.get('File/Open') == (0, 1)
+    assert index.get('/File/Open/') == (0, 1)
+    assert index.get('File/Close') is None
+    assert 'Help' in index
+    assert len(index) == 4
+
+
+def test_index_completion(index):
+    assert index.complete('File/') == ['File/New', 'File/Open']
+    assert index.complete('F', limit=2) == ['File', 'File/New']
+    assert index.complete('X') == []
+    assert index.extend('Fi') == 'File'
+    assert index.extend('File/N') == 'File/New'
+
+
+def test_goto_rebuilds_path(menu):
+    level = menu.goto('File/Recent/readme.md')
+    assert level.labels == ['report.txt', 'readme.md']
+    assert menu.current_pos == 1
+    assert [pos for _, pos in menu.path] == [0, 1]
+    assert menu.path[0][0] is menu.menu
+    assert menu._path_label() == '/File/Recent'
+
+
+def test_goto_lazy_level(menu):
+    level = menu.goto('Remote/host-2')
+    assert list(level) == ['host-1', 'host-2']
+    assert menu.current_pos == 1
+
+
+def test_goto_unknown_path(menu):
+    with pytest.raises(PPMError):
+        menu.goto('File/Missing')
+    with pytest.raises(PPMError):
+        menu.goto('File/New/Deeper')
+
+
+def test_goto_before_run(menu):
+    menu.goto('Edit/Undo')
+    frames = HeadlessDriver(menu).run([])
+    assert '-> Undo' in frames[0]
+
+
+def test_goto_prompt(menu):
+    driver = HeadlessDriver(menu)
+    keys = [Keys.GOTO, 'F', 'i', Keys.TAB, '/', 'R', 'e', 'c', Keys.TAB]
+    frames = driver.run(keys + ['/', Keys.ARROW_DOWN, Keys.ENTER])
+    assert ':File' in frames[4]
+    assert ':File/Recent/' in frames[-3]
+    assert '-> File/Recent/report.txt' in frames[-2]
+    assert '-> report.txt' in frames[-1]
+    assert menu.goto_query is None
+
+
+def test_goto_prompt_escape(menu):
+    driver = HeadlessDriver(menu)
+    frames = driver.run([Keys.ARROW_DOWN, Keys.GOTO, 'x', Keys.ESCAPE])
+    assert '-> [e] Edit' in frames[-1]
+    assert menu.goto_query is None
+
+
+def test_invalidate_rebuilds_index(menu):
+    menu.goto('File/New')
+    menu.original_menu['[f] File']['Save'] = lambda: None
+    menu.invalidate()
+    menu.goto('File/Save')
+    assert menu.current_pos == 2
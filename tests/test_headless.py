@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.constants import Keys
+from ppmenu.headless import HeadlessDriver
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def calls():
+    return []
+
+@pytest.fixture
+def driver(calls):
+    menu = PPM({
+        '[f] File': {
+            '[n] New': lambda: calls.append('new'),
+            '[o] Open': lambda: print('opening'),
+        },
+        '[x] Exit': lambda: None,
+    }, title='Headless')
+    return HeadlessDriver(menu)
+
+
+# --- Tests ---
+
+def test_frames_are_captured_as_text(driver):
+    frames = driver.run(['j', 'k'])
+    assert len(frames) == 3
+    assert frames[0].startswith('Headless')
+    assert '-> [x] Exit' in frames[1]
+
+def test_keys_drive_real_navigation(driver, calls):
+    driver.run(['f', 'n', Keys.ARROW_LEFT, 'q'])
+    assert calls == ['new']
+    assert not driver.menu.running
+
+def test_raw_bytes_are_decoded(driver, calls):
+    driver.run(b'\x1b[C\x1b[C')
+    assert calls == ['new']
+
+def test_action_output_is_captured(driver):
+    driver.run(['f', 'j', Keys.ENTER])
+    assert 'opening' in driver.output.getvalue()
+
+def test_run_ends_when_keys_run_out(driver):
+    driver.run([])
+    assert driver.menu.running
+    assert len(driver.frames) == 1
+
+def test_replay_throughput():
+    menu = PPM({
+        f'Item {i}': {f'Sub {j}': lambda: None for j in range(5)}
+        for i in range(1000)
+    })
+    driver = HeadlessDriver(menu, capture=False)
+    keys = (['j'] * 5 + ['l', 'j', 'h']) * 1250
+    start = time.perf_counter()
+    driver.run(keys)
+    assert len(keys) / (time.perf_counter() - start) > 2000
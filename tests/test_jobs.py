@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.constants import Keys
+from ppmenu.jobs import JobRunner
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def gate():
+    return threading.Event()
+
+@pytest.fixture
+def runner():
+    jobs = JobRunner(max_workers=1)
+    yield jobs
+    jobs.shutdown(cancel=True)
+
+@pytest.fixture
+def menu(gate, runner):
+    def deploy():
+        gate.wait(2)
+        return 'deployed'
+
+    def fail():
+        raise RuntimeError('db down')
+
+    ppm = PPM({'[d] Deploy': deploy, '[f] Fail': fail, '[q] Quit': None})
+    ppm.jobs = runner
+    ppm.renderer.write = lambda data: None
+    return ppm
+
+
+# --- Tests ---
+
+def test_action_runs_in_background(menu, gate):
+    level = menu._handle_keys(menu.menu, ['d'])
+    assert level is menu.menu
+    job = menu.jobs.get('/Deploy')
+    assert job.active
+    assert any('[running' in line for line in menu._compose_frame(level))
+    gate.set()
+    job.future.result(timeout=2)
+    assert job.status == 'done'
+    assert menu.jobs.results() == {'Deploy': 'deployed'}
+
+def test_failed_job_is_reported(menu, gate):
+    gate.set()
+    menu._handle_keys(menu.menu, ['f'])
+    job = menu.jobs.get('/Fail')
+    job.future.exception(timeout=2)
+    assert job.status == 'failed'
+    lines = menu._compose_frame(menu.menu)
+    assert any('[failed: db down]' in line for line in lines)
+
+def test_queued_job_can_be_cancelled(menu, gate):
+    menu._handle_keys(menu.menu, ['d', 'f', Keys.DELETE])
+    job = menu.jobs.get('/Fail')
+    assert job.status == 'cancelled'
+    gate.set()
+
+def test_running_action_is_not_started_twice(menu, gate):
+    menu._handle_keys(menu.menu, ['d'])
+    first = menu.jobs.get('/Deploy')
+    menu._handle_keys(menu.menu, ['d'])
+    assert menu.jobs.get('/Deploy') is first
+    gate.set()
+
+def test_items_sharing_an_action_get_own_jobs(gate, runner):
+    def deploy():
+        gate.wait(2)
+
+    menu = PPM({'[w] Deploy web': deploy, '[b] Deploy db': deploy})
+    menu.jobs = runner
+    menu._handle_keys(menu.menu, ['w', 'b'])
+    web, db = menu.jobs.get('/Deploy web'), menu.jobs.get('/Deploy db')
+    assert web is not db
+    assert menu._job_of(menu.menu, 0) is web
+    assert menu._job_of(menu.menu, 1) is db
+    assert db.status == 'queued'
+    menu.current_pos = 1
+    menu._handle_keys(menu.menu, [Keys.DELETE])
+    assert db.status == 'cancelled'
+    assert web.active
+    gate.set()
@@ -0,0 +1,94 @@
+import pytest
+
+from ppmenu import PPM, KeymapWarning, PPMError
+from ppmenu.constants import Keys
+from ppmenu.headless import HeadlessDriver
+from ppmenu.keymap import DEFAULT_BINDINGS, EMACS_BINDINGS, JUMP, Keymap
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def menu():
+    return PPM({
+        '[f] File': {'New': lambda: None},
+        '[e] Edit': {'Undo': lambda: None},
+        'Help': 'help text',
+    })
+
+
+# --- Tests ---
+
+def test_compile_merges_quick_nav():
+    table, conflicts = Keymap().compile({'f': 0, 'e': 1})
+    assert table['f'] == (JUMP, 0)
+    assert table['F'] == (JUMP, 0)
+    assert table['ALT+e'] == (JUMP, 1)
+    assert table[Keys.Q] == ('quit', None)
+    assert conflicts == []
+
+
+def test_compile_reports_conflicts():
+    table, conflicts = Keymap().compile({'h': 0})
+    assert table['h'] == ('back', None)
+    assert table['ALT+h'] == (JUMP, 0)
+    assert conflicts == [('h', 'back', 0)]
+
+
+def test_table_is_compiled_once_per_level(menu):
+    table = menu._dispatch_table(menu.menu)
+    assert menu._dispatch_table(menu.menu) is table
+    menu.keymap.bind('x', 'quit')
+    assert menu._dispatch_table(menu.menu) is not table
+
+
+def test_conflicts_are_reported_at_compile():
+    with pytest.warns(KeymapWarning, match=r"\[k\] of 'Keep'"):
+        PPM({'[k] Keep': lambda: None, 'Other': 1})
+
+
+def test_quit_item_takes_precedence(recwarn):
+    calls = []
+    menu = PPM({'[q] Quit': lambda: calls.append('bye'), 'Other': 1})
+    menu.renderer.write = lambda data: None
+    menu._handle_key(menu.menu, Keys.Q)
+    assert calls == ['bye']
+    assert not [w for w in recwarn if w.category is KeymapWarning]
+
+
+def test_strict_keymap_raises():
+    menu = PPM({'Item': 1})
+    menu.keymap = Keymap(strict=True)
+    menu.original_menu['[k] Keep'] = 2
+    menu.invalidate()
+    with pytest.raises(PPMError, match='shadowed'):
+        menu.compile()
+
+
+def test_custom_quit_key(menu):
+    menu.keymap.unbind(Keys.Q)
+    menu.keymap.bind('x', 'quit')
+    assert menu._handle_key(menu.menu, Keys.Q) is menu.menu
+    assert menu._handle_key(menu.menu, 'x') is None
+    assert not menu.running
+
+
+def test_emacs_bindings(menu):
+    menu.keymap = Keymap(EMACS_BINDINGS)
+    frames = HeadlessDriver(menu).run(['\x0e', '\x0e', '\x10', '\x06'])
+    assert '-> New' not in frames[-2]
+    assert '-> Undo' in frames[-1]
+
+
+def test_custom_command(menu):
+    seen = []
+    menu.commands['shout'] = lambda level, arg: seen.append(level) or level
+    menu.keymap.bind('!', 'shout')
+    assert menu._handle_key(menu.menu, '!') is menu.menu
+    assert seen == [menu.menu]
+
+
+def test_defaults_are_not_shared():
+    keymap = Keymap()
+    keymap.bind('x', 'quit')
+    assert 'x' not in DEFAULT_BINDINGS
@@ -0,0 +1,143 @@
+import os
+import signal
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.headless import HeadlessDriver
+from ppmenu.layout import (
+    ELLIPSIS,
+    RESIZE_DEBOUNCE,
+    display_width,
+    fit,
+    plan_columns,
+)
+from ppmenu.terminal import TerminalSession
+from ppmenu.viewport import Viewport
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def big_menu():
+    menu = PPM({f'Host {i:03}': i for i in range(100)})
+    menu.max_columns = 4
+    return menu
+
+
+def size(columns, lines=24):
+    return os.terminal_size((columns, lines))
+
+
+# --- Tests ---
+
+def test_display_width():
+    assert display_width('Latte') == 5
+    assert display_width('漢字') == 4
+    assert display_width('é') == 1
+    assert display_width('\x1b[1;32mOK\x1b[0m') == 2
+
+
+def test_fit_cuts_with_ellipsis():
+    assert fit('Cappuccino', 20) == 'Cappuccino'
+    assert fit('Cappuccino', 6) == f'Cappu{ELLIPSIS}'
+    assert fit('Tea', 6, pad=True) == 'Tea   '
+
+
+def test_fit_respects_wide_characters():
+    cut = fit('漢字漢字', 4)
+    assert cut == f'漢{ELLIPSIS}'
+    assert display_width(fit('漢字漢字', 4, pad=True)) == 4
+
+
+def test_fit_keeps_colors_and_resets():
+    cut = fit('\x1b[1;36mEspresso Macchiato\x1b[0m', 8)
+    assert cut.startswith('\x1b[1;36mEspres')
+    assert cut.endswith(f'{ELLIPSIS}\x1b[0m')
+    assert display_width(cut) == 8
+
+
+def test_plan_columns():
+    assert plan_columns(12, 10, 80, 20, 4) == (1, 80)
+    assert plan_columns(12, 100, 80, 20, 1) == (1, 80)
+    assert plan_columns(12, 100, 80, 20, 4) == (4, 18)
+    assert plan_columns(50, 100, 80, 20, 4) == (1, 80)
+    # Never more columns than the items need
+    assert plan_columns(12, 30, 80, 20, 4) == (2, 39)
+
+
+def test_viewport_scrolls_by_column():
+    viewport = Viewport()
+    viewport.fit(10, 3)
+    assert viewport.window(0, 100) == range(0, 30)
+    assert viewport.window(35, 100) == range(10, 40)
+    assert viewport.window(99, 100) == range(70, 100)
+
+
+def test_long_labels_are_truncated():
+    menu = PPM({'A very long label ' * 10: 1, 'Short': 2})
+    frames = HeadlessDriver(menu, size=size(40)).run([])
+    lines = frames[0].splitlines()
+    assert display_width(lines[0]) == 40
+    assert lines[0].endswith(ELLIPSIS)
+    assert lines[1] == '   Short'
+
+
+def test_truncation_is_cached_per_width():
+    menu = PPM({'Label ' * 20: 1})
+    driver = HeadlessDriver(menu, size=size(40))
+    menu._display_menu(menu.menu)
+    styled = menu.menu.styled[0]
+
+    menu._menu_dirty = True
+    menu._display_menu(menu.menu)
+    assert menu.menu.styled[0] is styled
+
+    menu.renderer.get_size = lambda: size(60)
+    menu._display_menu(menu.menu)
+    assert menu.menu.styled[0] is not styled
+    assert display_width(driver.frames[-1].splitlines()[0]) == 60
+
+
+def test_multi_column_layout(big_menu):
+    frames = HeadlessDriver(big_menu, size=size(80)).run(['j'])
+    first = frames[-1].splitlines()[0]
+    assert 'Host 000' in first
+    rows = big_menu.viewport.rows
+    assert f'Host {rows:03}' in first
+    assert big_menu.viewport.columns == 4
+    assert '-> Host 001' in frames[-1].splitlines()[1]
+
+
+def test_narrow_window_keeps_one_column(big_menu):
+    HeadlessDriver(big_menu, size=size(20)).run([])
+    assert big_menu.viewport.columns == 1
+
+
+def test_resize_bursts_are_debounced(big_menu):
+    driver = HeadlessDriver(big_menu)
+    big_menu._display_menu(big_menu.menu)
+    drawn = len(driver.frames)
+
+    big_menu._on_resize()
+    big_menu._on_resize()
+    assert 0 <= big_menu._input_timeout() <= RESIZE_DEBOUNCE
+    big_menu._display_menu(big_menu.menu)
+    assert len(driver.frames) == drawn
+
+    big_menu._resized_at -= RESIZE_DEBOUNCE
+    big_menu._display_menu(big_menu.menu)
+    assert len(driver.frames) == drawn + 1
+    assert big_menu._resized_at is None
+
+
+def test_sigwinch_reports_resize():
+    calls = []
+    session = TerminalSession()
+    session.on_resize = lambda: calls.append(1)
+    session._install_signal_handlers()
+    try:
+        os.kill(os.getpid(), signal.SIGWINCH)
+    finally:
+        session._remove_signal_handlers()
+    assert calls == [1]
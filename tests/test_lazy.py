@@ -0,0 +1,78 @@
+import pytest
+
+from ppmenu import PPM, LazyMenu
+from ppmenu.lazy import LazyCache
+
+
+# --- Fixtures ---
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def loads():
+    return []
+
+@pytest.fixture
+def hosts(loads):
+    def provider():
+        loads.append('hosts')
+        for i in range(3):
+            yield f'host-{i}', {'[s] Ssh': lambda: None}
+    return LazyMenu(provider)
+
+@pytest.fixture
+def menu(hosts, clock):
+    ppm = PPM({'[o] Hosts': hosts, '[q] Quit': lambda: None})
+    ppm.lazy_cache = LazyCache(maxsize=1, ttl=60, clock=clock)
+    return ppm
+
+
+# --- Tests ---
+
+def test_provider_is_not_called_at_startup(menu, loads):
+    assert loads == []
+
+def test_opening_lazy_submenu_loads_children(menu, loads):
+    level = menu._activate_item(menu.menu, 0)
+    assert list(level) == ['host-0', 'host-1', 'host-2']
+    assert loads == ['hosts']
+    assert menu.path
+
+def test_revisit_uses_cache(menu, loads):
+    first = menu._activate_item(menu.menu, 0)
+    second = menu._activate_item(menu.menu, 0)
+    assert first is second
+    assert loads == ['hosts']
+
+def test_expired_level_is_reloaded(menu, loads, clock):
+    menu._activate_item(menu.menu, 0)
+    clock.now = 61
+    menu._activate_item(menu.menu, 0)
+    assert loads == ['hosts', 'hosts']
+
+def test_least_recently_used_level_is_evicted(clock):
+    cache = LazyCache(maxsize=2, clock=clock)
+    evicted = []
+    cache.on_evict = evicted.append
+    nodes = [LazyMenu(dict) for _ in range(3)]
+    for i, node in enumerate(nodes):
+        cache.put(node, {'n': i}, f'level {i}')
+    assert len(cache) == 2
+    assert cache.get(nodes[0]) is None
+    assert evicted == [{'n': 0}]
+
+def test_evicted_children_are_forgotten(menu, hosts):
+    level = menu._activate_item(menu.menu, 0)
+    menu._activate_item(level, 0)
+    assert len(menu._levels) == 2
+    menu.lazy_cache.clear()
+    assert len(menu._levels) == 1
@@ -0,0 +1,131 @@
+import tracemalloc
+
+import pytest
+
+from ppmenu import PPM, MenuItem
+from ppmenu.lazy import LazyMenu
+from ppmenu.level import ACTION, LAZY, SUBMENU, VALUE, Level, kind_of
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def menu():
+    return PPM({
+        '[f] File': {'New': lambda: None},
+        '[e] Edit': lambda: None,
+        'Plain': 42,
+    })
+
+
+@pytest.fixture
+def level(menu):
+    return menu.menu
+
+
+# --- Tests ---
+
+def test_parallel_lists(level):
+    assert level.labels == ['File', 'Edit', 'Plain']
+    assert level.original_keys == ['[f] File', '[e] Edit', 'Plain']
+    assert level.quick_navs == ['f', 'e', None]
+    assert list(level.kinds) == [SUBMENU, ACTION, VALUE]
+    assert level.quick_nav_map == {'f': 0, 'e': 1}
+
+
+def test_kind_of():
+    assert kind_of(print) == ACTION
+    assert kind_of(LazyMenu(dict)) == LAZY
+    assert kind_of({}) == SUBMENU
+    assert kind_of('text') == VALUE
+
+
+def test_mapping_view(level):
+    assert list(level) == ['File', 'Edit', 'Plain']
+    assert 'Edit' in level
+    assert 'Missing' not in level
+    assert level['Plain'].value == 42
+    assert level['File'].quick_nav == 'f'
+    assert level['File'].quick_nav_map is level.quick_nav_map
+    with pytest.raises(KeyError):
+        level['Missing']
+
+
+def test_view_writes_back(level):
+    item = level['Plain']
+    item.value = print
+    assert level.item_values[2] is print
+    assert level.kinds[2] == ACTION
+
+
+def test_setitem_appends_and_replaces(level):
+    level['Copy'] = level['Plain']
+    assert level.labels[-1] == 'Copy'
+    assert level.item_values[-1] == 42
+
+    level['Copy'] = level['Edit']
+    assert len(level) == 4
+    assert level.kinds[3] == ACTION
+
+
+def test_delitem_renumbers_quick_nav(level):
+    del level['File']
+    assert level.labels == ['Edit', 'Plain']
+    assert level.quick_nav_map == {'e': 0}
+    assert len(level.styled) == 2
+
+
+def test_setitem_updates_quick_nav_map(menu, level):
+    menu._dispatch_table(level)
+    level['Exit'] = MenuItem(
+        value=print, quick_nav='x', original_key='[x] Exit',
+        quick_nav_map={},
+    )
+    assert level.quick_nav_map == {'f': 0, 'e': 1, 'x': 3}
+    assert level.dispatch is None
+    assert 'Exit' in level
+
+
+def test_quick_nav_setter_updates_map(menu, level):
+    menu._dispatch_table(level)
+    level['Edit'].quick_nav = 'z'
+    assert level.quick_nav_map == {'f': 0, 'z': 1}
+    assert menu._dispatch_table(level)['z'] == ('jump', 1)
+    assert 'e' not in menu._dispatch_table(level)
+
+
+def test_dataclass_style_menu_item():
+    item = MenuItem(42, 'p', '[p] Plain', {'p': 0})
+    assert (item.value, item.quick_nav, item.original_key) == (
+        42, 'p', '[p] Plain'
+    )
+    assert MenuItem(value=1, quick_nav=None, original_key='One').value == 1
+    with pytest.raises(TypeError):
+        MenuItem(value=1)
+
+
+def test_item_by_position(level):
+    item = level.item(1)
+    assert isinstance(item, MenuItem)
+    assert item.original_key == '[e] Edit'
+
+
+def test_replace_keeps_identity(menu, level):
+    raw = menu.original_menu
+    raw['Added'] = 1
+    menu.invalidate(raw)
+    assert menu.menu is level
+    assert level.labels[-1] == 'Added'
+
+
+def test_compact_memory_per_node():
+    raw = {f'Item {i}': i for i in range(50_000)}
+    menu = PPM({'Item': 1})
+    tracemalloc.start()
+    try:
+        menu._process_menu_structure(raw)
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # A dataclass item per node took about 150 bytes
+    assert used / len(raw) < 64
@@ -1,6 +1,7 @@
 import pytest
 
-from ppmenu import PPM, PPMError
+from ppmenu import PPM, KeymapWarning, PPMError
+from ppmenu.level import Level
 
 
 # --- Fixtures ---
@@ -50,7 +51,7 @@ def test_quick_jump_normal_letter(ppm_instance, monkeypatch):
     monkeypatch.setattr(ppm_instance, '_getch', lambda: 'f')
     new_level = ppm_instance._handle_navigation(ppm_instance.menu)
     assert new_level is not None
-    assert isinstance(new_level, dict)
+    assert isinstance(new_level, Level)
 
 def test_alt_quick_jump_hjkl(ppm_instance, monkeypatch):
     # Simulate user pressing ALT+h (to quick-jump to an item with [h])
@@ -61,7 +62,9 @@ def test_alt_quick_jump_hjkl(ppm_instance, monkeypatch):
     ppm_instance.menu['Help'].quick_nav_map['h'] = 0
 
     monkeypatch.setattr(ppm_instance, '_getch', lambda: 'ALT+h')
-    new_level = ppm_instance._handle_navigation(ppm_instance.menu)
+    # Plain h stays the back key, which is what ALT+h works around
+    with pytest.warns(KeymapWarning, match=r"\[h\] .*'back'"):
+        new_level = ppm_instance._handle_navigation(ppm_instance.menu)
     assert new_level is not None
 
 def test_navigation_movement(ppm_instance, monkeypatch):
@@ -80,6 +83,43 @@ def test_submenu_navigation(ppm_instance, monkeypatch):
     # Simulate pressing 'f' to enter File submenu
     monkeypatch.setattr(ppm_instance, '_getch', lambda: 'f')
     new_level = ppm_instance._handle_navigation(ppm_instance.menu)
-    assert isinstance(new_level, dict)
+    assert isinstance(new_level, Level)
     assert '[n] New' in new_level or 'New' in new_level
 
+
+def test_display_cart_print_lands_in_frame(sample_menu):
+    class CartMenu(PPM):
+        def _display_cart(self) -> None:
+            print('Cart: 2 items')
+
+    output = []
+    menu = CartMenu(menu_structure=sample_menu, title='Shop')
+    menu.renderer.write = output.append
+    menu._display_menu(menu.menu)
+    assert len(output) == 1
+    assert 'Cart: 2 items' in output[0]
+
+def test_submenus_are_validated_up_front():
+    menu = {
+        '[f] File': {
+            '[s] Save': lambda: None,
+            '[s] Save As': lambda: None,
+        },
+    }
+    with pytest.raises(PPMError):
+        PPM(menu_structure=menu)
+
+def test_submenu_level_is_processed_once(ppm_instance, monkeypatch):
+    monkeypatch.setattr(ppm_instance, '_getch', lambda: 'f')
+    first = ppm_instance._handle_navigation(ppm_instance.menu)
+    ppm_instance.path.clear()
+    second = ppm_instance._handle_navigation(ppm_instance.menu)
+    assert first is second
+
+def test_invalidate_updates_levels_in_place(sample_menu):
+    menu = PPM(menu_structure=sample_menu)
+    file_level = menu._get_level(sample_menu['[f] File'])
+    sample_menu['[f] File']['[c] Close'] = lambda: None
+    menu.invalidate(sample_menu['[f] File'])
+    assert 'Close' in file_level
+    assert menu._get_level(sample_menu['[f] File']) is file_level
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from ppmenu.constants import ANSI
+from ppmenu.render import Frame, Renderer, capture_print
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def output():
+    return []
+
+@pytest.fixture
+def renderer(output):
+    return Renderer(write=output.append)
+
+
+# --- Tests ---
+
+def test_first_frame_is_full_repaint(renderer, output):
+    renderer.render(['one', 'two'])
+    assert ANSI.CLEAR_SCREEN in output[-1]
+    assert 'one' in output[-1] and 'two' in output[-1]
+
+def test_only_changed_lines_are_rewritten(renderer, output):
+    renderer.render(['-> a', '   b', '   c'])
+    renderer.render(['   a', '-> b', '   c'])
+    frame = output[-1]
+    assert ANSI.CLEAR_SCREEN not in frame
+    assert '-> b' in frame and '   a' in frame
+    assert '   c' not in frame
+
+def test_unchanged_frame_writes_nothing(renderer, output):
+    renderer.render(['same'])
+    assert renderer.render(['same']) == 0
+    assert len(output) == 1
+
+def test_invalidate_forces_full_repaint(renderer, output):
+    renderer.render(['a'])
+    renderer.invalidate()
+    renderer.render(['a'])
+    assert ANSI.CLEAR_SCREEN in output[-1]
+
+def test_shorter_frame_clears_leftover_rows(renderer, output):
+    renderer.render(['a', 'b', 'c'])
+    renderer.render(['a'])
+    assert ANSI.CLEAR_TO_END in output[-1]
+
+def test_bytes_per_frame_are_counted(renderer):
+    full = renderer.render(['-> a', '   b'])
+    partial = renderer.render(['   a', '-> b'])
+    assert renderer.last_frame_bytes == partial
+    assert renderer.total_bytes == full + partial
+    assert renderer.frames == 2
+
+def test_frame_collects_lines_and_prints():
+    frame = Frame()
+    frame.line('title')
+    print('cart', file=frame)
+    assert frame.lines() == ['title', 'cart']
+
+def test_capture_print_keeps_other_threads_out(capsys):
+    frame = Frame()
+    worker = threading.Thread(target=lambda: print('from a job'))
+    with capture_print(frame):
+        print('cart')
+        worker.start()
+        worker.join()
+    assert frame.lines() == ['cart']
+    assert capsys.readouterr().out == 'from a job\n'
+
+def test_synchronized_frame_is_single_write(renderer, output):
+    renderer.render(['a', 'b', 'c'])
+    assert len(output) == 1
+    assert output[0].startswith(ANSI.BEGIN_SYNC)
+    assert output[0].endswith(ANSI.END_SYNC)
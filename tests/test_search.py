@@ -0,0 +1,112 @@
+import re
+import time
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.constants import Keys
+from ppmenu.search import Search, SearchIndex
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def index():
+    return SearchIndex(['Open File', 'Save', 'Print Preview', 'Options'])
+
+@pytest.fixture
+def tree_menu():
+    opened = []
+    menu = PPM({
+        '[f] File': {
+            '[n] New': lambda: opened.append('new'),
+            '[o] Open Recent': {
+                'report.txt': lambda: opened.append('report'),
+            },
+        },
+        '[e] Edit': {'[u] Undo': lambda: None},
+    })
+    menu.opened = opened
+    menu.renderer.write = lambda data: None
+    return menu
+
+
+# --- Tests ---
+
+def test_fuzzy_subsequence_match(index):
+    search = Search(index)
+    for ch in 'opn':
+        search.push(ch)
+    labels = [index.labels[i] for i in search.results()]
+    assert labels == ['Open File', 'Options']
+
+def test_results_narrow_and_pop_back(index):
+    search = Search(index)
+    search.push('p')
+    assert len(search.results()) == 3
+    search.push('r')
+    assert [index.labels[i] for i in search.results()] == ['Print Preview']
+    search.pop()
+    assert len(search.results()) == 3
+
+def test_tighter_match_ranks_first():
+    index = SearchIndex(['a long b', 'ab'])
+    search = Search(index)
+    search.push('a')
+    search.push('b')
+    assert search.results() == [1, 0]
+
+def test_highlight_positions(index):
+    assert index.positions(2, 'pv') == [0, 9]
+
+def test_search_mode_activates_match(tree_menu):
+    level = tree_menu._handle_keys(tree_menu.menu, ['/', 'e', 'd'])
+    assert tree_menu.search is not None
+    lines = tree_menu._compose_frame(level)
+    assert any('/ed' in line for line in lines)
+    level = tree_menu._handle_keys(level, [Keys.ENTER])
+    assert tree_menu.search is None
+    assert 'Undo' in level
+
+def test_escape_restores_position(tree_menu):
+    tree_menu.current_pos = 1
+    tree_menu._handle_keys(tree_menu.menu, ['/', 'x', Keys.ESCAPE])
+    assert tree_menu.search is None
+    assert tree_menu.current_pos == 1
+
+def test_whole_tree_search_jumps_into_submenu(tree_menu):
+    keys = ['/', Keys.TAB] + list('report') + [Keys.ENTER]
+    tree_menu._handle_keys(tree_menu.menu, keys)
+    assert tree_menu.opened == ['report']
+    assert len(tree_menu.path) == 2
+
+def test_large_level_matches_scan():
+    labels = [f'host-{i:03d}.{i % 7}.org' for i in range(20_000)]
+    search = Search(SearchIndex(labels))
+    for char in '1o5':
+        search.push(char)
+    expected = [
+        i for i, label in enumerate(labels)
+        if re.search('1.*o.*5', label)
+    ]
+    assert sorted(search.results()) == expected
+
+def test_keystroke_latency_on_large_level():
+    labels = [f'host-{i:06d}.example.org' for i in range(100_000)]
+    index = SearchIndex(labels)
+    for query in ('h9', 'ex', 'org'):
+        # Best of three runs, so one scheduling hiccup does not fail it
+        times = []
+        for _ in range(3):
+            search = Search(index)
+            for n, char in enumerate(query):
+                start = time.perf_counter()
+                search.push(char)
+                results = search.results()
+                results[0]
+                elapsed = time.perf_counter() - start
+                if len(times) <= n:
+                    times.append(elapsed)
+                times[n] = min(times[n], elapsed)
+        # A few milliseconds per keystroke, the first one included
+        assert max(times) < 0.01, (query, times)
@@ -0,0 +1,272 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from ppmenu import PPM, PPMError
+from ppmenu.constants import NO_COLORS, Keys
+from ppmenu.stats import MenuStats
+from ppmenu.status import State, StatusRegion
+from ppmenu.server import (
+    FRAME,
+    KEYS,
+    SIZE,
+    MenuServer,
+    _parse_size,
+    _wants_color,
+    open_connection,
+    pack,
+    read_message,
+)
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def menu(calls):
+    return PPM({
+        'Hosts': {f'web{i}': (lambda i=i: calls.append(i)) for i in range(3)},
+        'Deploy': lambda: calls.append('deploy'),
+        'Quit': lambda: None,
+    })
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 bytes
+    directory = tempfile.mkdtemp(prefix='ppm')
+    yield os.path.join(directory, 'menu.sock')
+    for name in os.listdir(directory):
+        os.unlink(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.screen = ''
+
+    async def send(self, kind, payload):
+        self.writer.write(pack(kind, payload))
+        await self.writer.drain()
+
+    async def wait_for(self, text):
+        while text not in self.screen:
+            kind, payload = await read_message(self.reader)
+            assert kind == FRAME
+            self.screen += payload.decode()
+        self.screen = ''
+
+    async def closed(self):
+        with pytest.raises(asyncio.IncompleteReadError):
+            while True:
+                await read_message(self.reader)
+
+
+async def connect(address, size=b'80 24'):
+    client = Client(*await open_connection(address))
+    await client.send(SIZE, size)
+    return client
+
+
+def serve(menu, scenario, tcp=False, path=None):
+    async def main():
+        server = MenuServer(menu)
+        if tcp:
+            listener = await server.start_tcp()
+            host, port = listener.sockets[0].getsockname()[:2]
+            address = f'{host}:{port}'
+        else:
+            await server.start_unix(path)
+            address = path
+        try:
+            await asyncio.wait_for(scenario(server, address), timeout=5)
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+
+
+# --- Tests ---
+
+def test_session_shares_the_tree(menu):
+    session = menu.session()
+    assert session.menu is menu.menu
+    assert session._levels is menu._levels
+    assert session._get_path_index() is menu._get_path_index()
+    assert session.session()._shared is menu
+
+    level = session._handle_keys(session.menu, [Keys.ENTER, 'j'])
+    assert level is menu._get_level(menu.original_menu['Hosts'])
+    assert session.current_pos == 1
+    assert menu.current_pos == 0
+    assert menu.path == []
+    assert session.commands['quit'].__self__ is session
+
+
+def test_session_invalidate_reaches_shared_menu(menu):
+    session = menu.session()
+    hosts = menu.original_menu['Hosts']
+    level = session._handle_keys(session.menu, [Keys.ENTER])
+    session.mark(level, [0])
+    hosts['web9'] = lambda: None
+    session.invalidate(hosts)
+    assert level.labels[-1] == 'web9'
+    assert session.marks == {}
+    assert 'Hosts/web9' in menu._get_path_index().complete('Hosts/', 10)
+
+
+def test_session_gets_own_status_region(menu):
+    state = State(total=0)
+    menu.status = StatusRegion(
+        lambda s: f'Total: {s["total"]}', state, max_rate=None
+    )
+    session = menu.session()
+    assert session.status is not menu.status
+    assert session.status.state is state
+    session.status.lines()
+    state.set('total', 5)
+    assert session.status.lines() == ['Total: 5']
+    assert menu.status.lines() == ['Total: 5']
+
+
+def test_size_payload():
+    assert _parse_size(b'80 24 color') == (80, 24)
+    assert _wants_color(b'80 24 color')
+    assert not _wants_color(b'80 24')
+    with pytest.raises(PPMError):
+        _parse_size(b'80')
+
+
+def test_sessions_have_own_colors(menu):
+    server = MenuServer(menu)
+    size = _parse_size(b'80 24')
+    assert server.new_session(size, color=True).colors is menu.color_scheme
+    assert server.new_session(size).colors is NO_COLORS
+    server.executor.shutdown()
+
+
+def test_color_client_gets_colored_frames(menu, socket_path):
+    async def scenario(server, address):
+        plain = await connect(address)
+        colored = await connect(address, b'80 24 color')
+        await plain.wait_for('-> Hosts')
+        kind, payload = await read_message(colored.reader)
+        assert kind == FRAME
+        assert menu.color_scheme.selected in payload.decode()
+        # The item lines cached for the colored session are not reused
+        await plain.send(KEYS, b'j')
+        await plain.wait_for('-> Deploy')
+
+    serve(menu, scenario, path=socket_path)
+
+
+def test_sessions_navigate_independently(menu, socket_path):
+    async def scenario(server, address):
+        first = await connect(address)
+        second = await connect(address)
+        await first.wait_for('-> Hosts')
+        await second.wait_for('-> Hosts')
+        assert len(server.sessions) == 2
+        assert oct(os.stat(address).st_mode & 0o777) == '0o600'
+
+        await first.send(KEYS, b'\r')
+        await first.wait_for('-> web0')
+        await second.send(KEYS, b'j')
+        await second.wait_for('-> Deploy')
+        await first.send(KEYS, b'jj')
+        await first.wait_for('-> web2')
+
+        await first.send(KEYS, b'q')
+        await first.closed()
+        await second.send(KEYS, b'q')
+        await second.closed()
+        while server.sessions:
+            await asyncio.sleep(0.01)
+
+    serve(menu, scenario, path=socket_path)
+
+
+def test_actions_run_as_jobs(menu, calls, socket_path):
+    async def scenario(server, address):
+        client = await connect(address)
+        await client.send(KEYS, b'j\r')
+        await client.wait_for('Deploy [done')
+        assert calls == ['deploy']
+
+    serve(menu, scenario, path=socket_path)
+
+
+def test_resize_relays_new_layout(menu, socket_path):
+    async def scenario(server, address):
+        client = await connect(address, b'80 24')
+        await client.wait_for('Hosts')
+        (session,) = server.sessions
+        await client.send(SIZE, b'30 10')
+        await client.wait_for('Hosts')
+        assert session._width == 30
+
+    serve(menu, scenario, path=socket_path)
+
+
+def test_disconnect_ends_session(menu, socket_path):
+    async def scenario(server, address):
+        client = await connect(address)
+        await client.wait_for('Hosts')
+        client.writer.close()
+        while server.sessions:
+            await asyncio.sleep(0.01)
+
+    serve(menu, scenario, path=socket_path)
+
+
+def test_size_must_come_first(menu, socket_path):
+    async def scenario(server, address):
+        client = Client(*await open_connection(address))
+        await client.send(KEYS, b'j')
+        await client.closed()
+        assert not server.sessions
+
+    serve(menu, scenario, path=socket_path)
+
+
+def test_sessions_record_stats(menu, socket_path):
+    menu.stats = MenuStats()
+
+    async def scenario(server, address):
+        client = await connect(address)
+        await client.send(KEYS, b'j')
+        await client.wait_for('-> Deploy')
+        await client.send(KEYS, b'q')
+        await client.closed()
+        assert menu.stats.iterations >= 2
+        assert menu.stats.phases['input'].count >= 2
+
+    serve(menu, scenario, path=socket_path)
+
+
+def test_tcp(menu):
+    async def scenario(server, address):
+        client = await connect(address)
+        await client.send(KEYS, b'jj')
+        await client.wait_for('-> Quit')
+
+    serve(menu, scenario, tcp=True)
+
+
+def test_server_invalidate_refreshes_sessions(menu, socket_path):
+    async def scenario(server, address):
+        client = await connect(address)
+        await client.wait_for('Deploy')
+        menu.original_menu['Rollback'] = lambda: None
+        server.invalidate()
+        await client.wait_for('Rollback')
+
+    serve(menu, scenario, path=socket_path)
@@ -0,0 +1,71 @@
+import json
+import logging
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.headless import HeadlessDriver
+from ppmenu.stats import MenuStats
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def menu():
+    def fail():
+        raise RuntimeError('boom')
+
+    ppm = PPM({
+        '[f] File': {
+            '[n] New': lambda: None,
+            '[b] Broken': fail,
+        },
+    })
+    ppm.stats = MenuStats()
+    return ppm
+
+
+# --- Tests ---
+
+def test_phases_are_timed_per_iteration(menu):
+    HeadlessDriver(menu).run(['j', 'k', 'f', 'n'])
+    stats = menu.stats
+    assert stats.iterations == 4
+    assert stats.phases['render'].count == 5
+    assert stats.phases['input'].count == 4
+    assert stats.phases['update'].count == 4
+    assert stats.phases['action'].count == 1
+    assert 'action' in stats.history[-1]
+
+def test_path_counters(menu):
+    HeadlessDriver(menu).run(['f', 'n', 'n', 'h', 'f'])
+    paths = menu.stats.paths
+    assert paths['/'].visits == 2
+    assert paths['/File'].visits == 2
+    assert paths['/File/New'].actions.count == 2
+
+def test_failed_action_is_counted_and_raised(menu):
+    with pytest.raises(RuntimeError):
+        HeadlessDriver(menu).run(['f', 'b'])
+    assert menu.stats.paths['/File/Broken'].errors == 1
+
+def test_export_as_json_and_log(menu, caplog):
+    HeadlessDriver(menu).run(['f', 'n'])
+    data = json.loads(menu.stats.to_json())
+    assert data['paths']['/File/New']['actions']['count'] == 1
+    with caplog.at_level(logging.INFO):
+        menu.stats.log(logging.getLogger('ppmenu'))
+    assert 'ppmenu stats' in caplog.text
+
+def test_subclass_receives_iterations():
+    seen = []
+
+    class Collector(MenuStats):
+        def on_iteration(self, timings):
+            seen.append(timings)
+
+    ppm = PPM({'One': lambda: None, 'Two': lambda: None})
+    ppm.stats = Collector()
+    HeadlessDriver(ppm).run(['j', 'j'])
+    assert len(seen) == 2
+    assert set(seen[0]) >= {'input', 'update', 'render'}
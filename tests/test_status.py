@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.decoder import KeyReader
+from ppmenu.headless import HeadlessDriver
+from ppmenu.status import State, StatusRegion
+
+# --- Fixtures ---
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def state():
+    state = State(cart=[], queue=0)
+    state.derive('total', lambda cart: sum(p for _, p in cart), 'cart')
+    return state
+
+
+@pytest.fixture
+def region(state, clock):
+    return StatusRegion(
+        lambda s: f'Total: {s["total"]:.2f}', state, max_rate=10,
+        clock=clock,
+    )
+
+
+@pytest.fixture
+def menu(region):
+    menu = PPM({'[a] Alpha': 1, '[b] Beta': 2})
+    menu.status = region
+    HeadlessDriver(menu)
+    return menu
+
+
+# --- Tests ---
+
+def test_derived_value_is_memoized(state):
+    state.set('cart', [('Latte', 3.5)])
+    assert state['total'] == 3.5
+    assert state['total'] == 3.5
+    assert state.computations == 1
+
+    state.set('queue', 4)
+    assert state['total'] == 3.5
+    assert state.computations == 1
+
+    state.set('cart', [('Latte', 3.5), ('Mocha', 4.0)])
+    assert state['total'] == 7.5
+    assert state.computations == 2
+
+
+def test_derived_from_derived(state):
+    state.derive('label', lambda total: f'${total:.2f}', 'total')
+    state.set('cart', [('Tea', 2.0)])
+    assert state['label'] == '$2.00'
+    state.set('queue', 1)
+    state['label']
+    assert state.computations == 2
+
+
+def test_set_equal_value_is_noop(state):
+    changes = []
+    state.subscribe(changes.append)
+    state.set('queue', 0)
+    assert changes == []
+
+    cart = state['cart']
+    cart.append(('Tea', 2.0))
+    state.set('cart', cart)
+    assert changes == []
+    state.touch('cart')
+    assert changes == ['cart']
+    assert state['total'] == 2.0
+
+
+def test_derived_values_are_read_only(state):
+    with pytest.raises(KeyError, match='derived'):
+        state.set('total', 1)
+
+
+def test_unsubscribe(state):
+    changes = []
+    unsubscribe = state.subscribe(changes.append)
+    unsubscribe()
+    state.set('queue', 1)
+    assert changes == []
+
+
+def test_region_renders_only_when_dirty(region, state):
+    assert region.lines() == ['Total: 0.00']
+    region.lines()
+    assert region.renders == 1
+    state.set('queue', 3)
+    assert region.dirty
+
+
+def test_region_is_throttled(region, state, clock):
+    region.lines()
+    state.set('cart', [('Tea', 2.0)])
+    assert region.lines() == ['Total: 0.00']
+    assert region.timeout() == pytest.approx(0.1)
+
+    clock.now += 0.1
+    assert region.lines() == ['Total: 2.00']
+    assert region.renders == 2
+
+
+def test_region_watches_keys(state):
+    region = StatusRegion(lambda s: 'x', state, watch=['cart'])
+    region.lines()
+    state.set('queue', 5)
+    assert not region.dirty
+    state.set('cart', [('Tea', 2.0)])
+    assert region.dirty
+
+
+def test_on_dirty_fires_once_per_change(region, state):
+    calls = []
+    region.lines()
+    region.on_dirty = lambda: calls.append(1)
+    state.set('queue', 1)
+    state.set('queue', 2)
+    assert calls == [1]
+
+
+def test_status_is_shown_under_title(menu):
+    frames = HeadlessDriver(menu).run([])
+    assert frames[0].splitlines()[0] == 'Total: 0.00'
+
+
+def test_status_update_skips_menu_items(menu, state, clock, monkeypatch):
+    menu._display_menu(menu.menu)
+    composed = []
+    monkeypatch.setattr(
+        menu, '_display_menu_items', lambda level: composed.append(level)
+    )
+    written = menu.renderer.total_bytes
+
+    clock.now += 1
+    state.set('cart', [('Tea', 2.0)])
+    menu._display_menu(menu.menu)
+
+    assert composed == []
+    assert menu.renderer.captured[-1].splitlines()[0] == 'Total: 2.00'
+    assert 'Alpha' in menu.renderer.captured[-1]
+    assert menu.renderer.total_bytes - written < 40
+
+
+def test_keys_compose_a_full_frame(menu, monkeypatch):
+    menu._display_menu(menu.menu)
+    composed = []
+    monkeypatch.setattr(
+        menu, '_display_menu_items', lambda level: composed.append(level)
+    )
+    menu._handle_keys(menu.menu, ['j'])
+    menu._display_menu(menu.menu)
+    assert composed == [menu.menu]
+
+
+def test_throttled_update_sets_input_timeout(menu, state):
+    menu._display_menu(menu.menu)
+    assert menu._input_timeout() is None
+    state.set('queue', 1)
+    assert menu._input_timeout() == pytest.approx(0.1)
+
+
+def test_update_from_thread_wakes_reader(menu, state):
+    read_fd, write_fd = os.pipe()
+    try:
+        menu.keys = KeyReader(fd=read_fd)
+        menu.keys.read(0)
+        menu._display_menu(menu.menu)
+
+        timer = threading.Timer(0.05, state.set, ('queue', 7))
+        timer.start()
+        start = time.monotonic()
+        assert menu.keys.read(5) == []
+        assert time.monotonic() - start < 2
+        timer.join()
+    finally:
+        menu.keys.close()
+        os.close(read_fd)
+        os.close(write_fd)
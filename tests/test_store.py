@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from ppmenu import PPM, PPMError
+from ppmenu.headless import HeadlessDriver
+from ppmenu.jobs import JobRunner
+from ppmenu.level import ACTION, LAZY, VALUE
+from ppmenu.store import MenuStore, StoreLevel, StoreMenu, build_store
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def store(tmp_path, calls):
+    path = str(tmp_path / 'menu.store')
+    build_store({
+        '[d] Deploy': {'@action': 'deploy', 'args': ['prod']},
+        '[s] Servers': {
+            '[w] Web': {'web-1': 'up', 'web-2': 'down'},
+            'db-1': {'@action': 'deploy', 'args': ['db-1']},
+        },
+        'Version': 3,
+    }, path)
+    return MenuStore(path, {'deploy': lambda *args: calls.append(args)})
+
+
+# --- Tests ---
+
+def test_root_is_a_view(store):
+    root = store.root()
+    assert isinstance(root, StoreLevel)
+    assert len(root) == 3
+    assert root.labels[1] == 'Servers'
+    assert root.original_keys[1] == '[s] Servers'
+    assert root.quick_navs[2] is None
+    assert list(root.kinds) == [ACTION, LAZY, VALUE]
+    assert root.quick_nav_map == {'d': 0, 's': 1}
+    assert root.item_values[2] == 3
+
+
+def test_submenu_nodes_are_shared(store):
+    root = store.root()
+    menu = root.item_values[1]
+    assert isinstance(menu, StoreMenu)
+    assert root.item_values[1] is menu
+    assert list(menu.load().labels) == ['Web', 'db-1']
+
+
+def test_actions_are_resolved(store, calls):
+    store.root().item_values[0]()
+    assert calls == [('prod',)]
+
+
+def test_action_values_are_shared(store):
+    root = store.root()
+    assert root.item_values[0] is root.item_values[0]
+
+
+def test_jobs_of_store_items(tmp_path):
+    gate = threading.Event()
+    path = str(tmp_path / 'menu.store')
+    build_store({'[d] Deploy': {'@action': 'deploy', 'args': ['prod']}}, path)
+    menu = PPM(MenuStore(path, {'deploy': lambda env: gate.wait(2)}).root())
+    menu.jobs = JobRunner(max_workers=1)
+    try:
+        menu._handle_keys(menu.menu, ['d'])
+        job = menu._job_of(menu.menu, 0)
+        assert job is not None and job.active
+        menu._handle_keys(menu.menu, ['d'])
+        assert menu.jobs.jobs() == [job]
+        lines = menu._compose_frame(menu.menu)
+        assert any('[running' in line for line in lines)
+    finally:
+        gate.set()
+        menu.jobs.shutdown()
+
+
+def test_mapping_view(store):
+    root = store.root()
+    assert 'Version' in root
+    assert root['Version'].value == 3
+    with pytest.raises(TypeError):
+        root['Version'] = root['Deploy']
+
+
+def test_navigation(store):
+    menu = PPM(store.root())
+    driver = HeadlessDriver(menu)
+    frames = driver.run(['ALT+s', 'ALT+w', 'j', 'h'])
+    assert '-> web-2' in frames[3]
+    assert '-> [w] Web' in frames[4]
+    assert menu._path_label() == '/Servers'
+
+
+def test_not_a_store(tmp_path):
+    path = tmp_path / 'menu.json'
+    path.write_text('{}')
+    with pytest.raises(PPMError):
+        MenuStore(str(path))
+
+
+def test_duplicate_quick_nav(tmp_path):
+    with pytest.raises(PPMError, match='Duplicate quick jump letter'):
+        build_store({'[a] One': 1, '[a] Two': 2}, str(tmp_path / 'm'))
@@ -0,0 +1,56 @@
+import pytest
+
+import ppmenu
+
+from ppmenu import PPM, ColorScheme
+from ppmenu.constants import NO_COLORS
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def colored(monkeypatch):
+    monkeypatch.delenv('NO_COLOR', raising=False)
+    monkeypatch.setattr(ppmenu, '_use_color', lambda: True)
+
+@pytest.fixture
+def menu(colored):
+    ppm = PPM({'[a] Apple': lambda: None, 'Pear': {'Inner': None}})
+    ppm.renderer.write = lambda data: None
+    return ppm
+
+
+# --- Tests ---
+
+def test_item_lines_are_formatted_once(menu, monkeypatch):
+    menu._compose_frame(menu.menu)
+    calls = []
+    monkeypatch.setattr(
+        menu, '_format_unselected_item',
+        lambda *args: calls.append(args) or 'x',
+    )
+    menu._handle_keys(menu.menu, ['j', 'k', 'j'])
+    menu._compose_frame(menu.menu)
+    assert calls == []
+
+def test_color_scheme_change_restyles(menu):
+    first = menu._compose_frame(menu.menu)
+    menu.colors = ColorScheme(selected='\033[1;31m')
+    second = menu._compose_frame(menu.menu)
+    assert first != second
+    assert '\033[1;31m' in second[0]
+
+def test_changed_item_is_restyled(menu):
+    menu._compose_frame(menu.menu)
+    menu.menu['Apple'].original_key = '[a] Apricot'
+    assert any('Apricot' in line for line in menu._compose_frame(menu.menu))
+
+def test_no_color_env_disables_escapes(monkeypatch):
+    monkeypatch.setenv('NO_COLOR', '1')
+    ppm = PPM({'[a] Apple': lambda: None})
+    assert ppm.colors is NO_COLORS
+    assert '\033' not in '\n'.join(ppm._compose_frame(ppm.menu))
+
+def test_colors_kept_on_terminal(colored):
+    scheme = ColorScheme(title='\033[1;35m')
+    assert PPM({'One': None}, colors=scheme).colors is scheme
@@ -0,0 +1,52 @@
+import os
+import pty
+import termios
+
+import pytest
+
+from ppmenu.terminal import TerminalSession
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def tty_fd():
+    master, slave = pty.openpty()
+    yield slave
+    os.close(master)
+    os.close(slave)
+
+def is_canonical(fd):
+    return bool(termios.tcgetattr(fd)[3] & termios.ICANON)
+
+
+# --- Tests ---
+
+def test_session_enters_raw_mode_once_and_restores(tty_fd):
+    session = TerminalSession(fd=tty_fd)
+    with session:
+        assert session.active
+        assert not is_canonical(tty_fd)
+        with session:  # nested use keeps the same mode
+            assert not is_canonical(tty_fd)
+        assert not is_canonical(tty_fd)
+    assert not session.active
+    assert is_canonical(tty_fd)
+
+def test_session_restores_on_exception(tty_fd):
+    session = TerminalSession(fd=tty_fd)
+    with pytest.raises(RuntimeError):
+        with session:
+            raise RuntimeError('boom')
+    assert is_canonical(tty_fd)
+
+def test_cooked_mode_during_action(tty_fd):
+    session = TerminalSession(fd=tty_fd)
+    with session:
+        with session.cooked():
+            assert is_canonical(tty_fd)
+        assert not is_canonical(tty_fd)
+
+def test_session_keeps_output_processing(tty_fd):
+    with TerminalSession(fd=tty_fd):
+        assert termios.tcgetattr(tty_fd)[1] & termios.OPOST
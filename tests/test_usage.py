@@ -0,0 +1,238 @@
+import json
+import threading
+
+import pytest
+
+from ppmenu import PPM, LazyMenu
+from ppmenu.constants import Keys
+from ppmenu.headless import HeadlessDriver
+from ppmenu.lazy import LazyCache
+from ppmenu.usage import DEFAULT_HALF_LIFE, USAGE_VERSION, UsageModel
+
+# --- Fixtures ---
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def usage(clock):
+    return UsageModel(clock=clock)
+
+
+@pytest.fixture
+def loads():
+    return []
+
+
+@pytest.fixture
+def menu(usage, loads):
+    def provider():
+        loads.append(threading.current_thread().name)
+        return {f'db-{i}': i for i in range(3)}
+
+    ppm = PPM({
+        'Edit': {'Copy': 1, 'Paste': 2, 'Cut': 3},
+        'Hosts': LazyMenu(provider),
+        'Quit': lambda: None,
+    })
+    ppm.usage = usage
+    return ppm
+
+
+# --- Tests ---
+
+def test_record_counts_and_decays(usage, clock):
+    usage.record('Edit/Copy')
+    usage.record('Edit/Copy')
+    assert usage.count('Edit/Copy') == 2
+    assert usage.score('Edit/Copy') == pytest.approx(2.0)
+
+    clock.now += DEFAULT_HALF_LIFE
+    assert usage.score('Edit/Copy') == pytest.approx(1.0)
+    assert usage.score('Edit/Cut') == 0.0
+
+
+def test_recent_selection_beats_old_frequency(usage, clock):
+    for _ in range(3):
+        usage.record('Edit/Copy')
+    clock.now += 3 * DEFAULT_HALF_LIFE
+    usage.record('Edit/Paste')
+    assert usage.recent() == ['Edit/Paste', 'Edit/Copy']
+    assert usage.likely('Edit') == ['Paste', 'Copy']
+    assert usage.likely('') == []
+
+
+def test_save_and_load(tmp_path, clock):
+    path = tmp_path / 'cache' / 'usage.json'
+    usage = UsageModel(str(path), clock=clock)
+    usage.record('Edit/Cut')
+    usage.save()
+    assert not usage.dirty
+    data = json.loads(path.read_text())
+    assert data['version'] == USAGE_VERSION
+
+    loaded = UsageModel(str(path), clock=clock)
+    assert loaded.count('Edit/Cut') == 1
+    assert list(tmp_path.joinpath('cache').iterdir()) == [path]
+
+
+@pytest.mark.parametrize('content', [
+    '{not json',
+    '[]',
+    '{"version": 1, "paths": []}',
+    '{"version": 1, "paths": {"a": ["x", 1, 2]}}',
+    '{"version": 1, "paths": {"a": [null, 1, 2]}}',
+])
+def test_damaged_file_is_ignored(tmp_path, content):
+    path = tmp_path / 'usage.json'
+    path.write_text(content)
+    assert len(UsageModel(str(path))) == 0
+
+
+def test_submenu_opens_on_likeliest_item(menu, usage):
+    usage.record('Edit/Cut')
+    menu._handle_keys(menu.menu, [Keys.ENTER])
+    assert menu.current_pos == 2
+
+
+def test_root_opens_on_likeliest_item(menu, usage):
+    usage.record('Hosts')
+    menu._first_level()
+    assert menu.current_pos == 1
+
+
+def test_preselect_can_be_turned_off(menu, usage):
+    usage.preselect = False
+    usage.record('Edit/Cut')
+    menu._handle_keys(menu.menu, [Keys.ENTER])
+    assert menu.current_pos == 0
+
+
+def test_selections_are_recorded(menu, usage):
+    menu._handle_keys(menu.menu, [Keys.ENTER, 'j', Keys.ENTER])
+    assert usage.count('Edit') == 1
+    assert usage.count('Edit/Paste') == 1
+
+
+def test_run_saves_usage(tmp_path):
+    path = tmp_path / 'usage.json'
+    menu = PPM({'A': 1, 'B': 2})
+    menu.usage = UsageModel(str(path))
+    HeadlessDriver(menu).run(['j', Keys.ENTER, 'q'])
+    assert UsageModel(str(path)).count('B') == 1
+
+
+def test_recent_lists_most_used_paths(menu, usage, clock):
+    usage.record('Edit/Paste')
+    clock.now += 1
+    usage.record('Edit/Cut')
+    frames = HeadlessDriver(menu).run([Keys.TAB])
+    lines = frames[-1].splitlines()
+    assert lines[0].endswith('2 recent')
+    assert lines[1] == '-> Edit/Cut'
+
+    menu._handle_keys(menu.menu, [Keys.ARROW_DOWN, Keys.ENTER])
+    assert menu.path[-1][0] is menu.menu
+    assert menu.current_pos == 1
+
+
+def test_typing_replaces_recent_paths(menu, usage):
+    usage.record('Edit/Cut')
+    menu._handle_keys(menu.menu, [Keys.TAB, 'Q'])
+    assert not menu._goto_recent
+    assert menu._goto_matches == ['Quit']
+
+
+def test_likely_submenu_is_prefetched(menu, usage, loads):
+    usage.record('Hosts/db-1')
+    usage.record('Hosts')
+    menu._display_menu(menu.menu)
+    assert list(menu._prefetched)
+    level = menu._handle_keys(menu.menu, ['j', Keys.ENTER])
+    assert level.labels == ['db-0', 'db-1', 'db-2']
+    assert len(loads) == 1
+    assert loads[0].startswith('ppmenu-prefetch')
+    assert menu.current_pos == 1
+    assert menu._prefetched == {}
+
+
+def test_cached_submenus_are_not_prefetched(menu, usage, loads):
+    usage.record('Hosts')
+    menu._handle_keys(menu.menu, ['j', Keys.ENTER, 'h'])
+    menu._rendered_level = None
+    menu._display_menu(menu.menu)
+    assert menu._prefetched == {}
+    assert len(loads) == 1
+
+
+def test_failed_prefetch_loads_again():
+    calls = []
+
+    def provider():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError('busy')
+        return {'ok': 1}
+
+    menu = PPM({'Hosts': LazyMenu(provider)})
+    menu.usage = UsageModel()
+    menu.usage.record('Hosts')
+    menu._display_menu(menu.menu)
+    level = menu._handle_keys(menu.menu, [Keys.ENTER])
+    assert level.labels == ['ok']
+    assert len(calls) == 2
+
+
+def test_cache_contains_does_not_touch_order(clock):
+    cache = LazyCache(maxsize=2, ttl=10, clock=clock)
+    first, second = LazyMenu(dict), LazyMenu(dict)
+    cache.put(first, {}, 'first')
+    cache.put(second, {}, 'second')
+    assert first in cache
+    cache.put(LazyMenu(dict), {}, 'third')
+    assert first not in cache
+    assert second in cache
+    clock.now += 10
+    assert second not in cache
+
+
+def test_stale_prefetch_is_loaded_again(clock):
+    loads = []
+
+    def provider():
+        loads.append(clock.now)
+        return {f'v{len(loads)}': 1}
+
+    menu = PPM({'Hosts': LazyMenu(provider, ttl=60)})
+    menu.lazy_cache = LazyCache(ttl=None, clock=clock)
+    menu.usage = UsageModel()
+    menu.usage.record('Hosts')
+    menu._display_menu(menu.menu)
+    menu._prefetched[id(menu.menu.item_values[0])].result()
+
+    clock.now += 30
+    level = menu._handle_keys(menu.menu, [Keys.ENTER])
+    assert level.labels == ['v1']
+    menu._handle_keys(level, ['h'])
+    clock.now += 31
+    # Expires 60s after the prefetch loaded it, not after it was opened
+    assert menu.menu.item_values[0] not in menu.lazy_cache
+
+    menu._rendered_level = None
+    menu._display_menu(menu.menu)
+    menu._prefetched[id(menu.menu.item_values[0])].result()
+    clock.now += 10000
+    level = menu._handle_keys(menu.menu, [Keys.ENTER])
+    assert level.labels == ['v3']
+    assert len(loads) == 3
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from ppmenu import PPM
+from ppmenu.constants import Keys
+from ppmenu.viewport import Viewport
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def big_menu(monkeypatch):
+    monkeypatch.setattr(
+        'shutil.get_terminal_size', lambda: os.terminal_size((80, 24))
+    )
+    menu = PPM({f'Host {i}': lambda: None for i in range(100_000)})
+    menu.renderer.write = lambda data: None
+    return menu
+
+
+# --- Tests ---
+
+def test_window_follows_selection():
+    viewport = Viewport(height=5)
+    assert viewport.window(0, 100) == range(0, 5)
+    assert viewport.window(7, 100) == range(3, 8)
+    assert viewport.window(2, 100) == range(2, 7)
+    assert viewport.window(99, 100) == range(95, 100)
+
+def test_window_smaller_level_than_viewport():
+    viewport = Viewport(height=10)
+    assert viewport.window(2, 4) == range(0, 4)
+
+def test_frame_fits_terminal(big_menu):
+    lines = big_menu._compose_frame(big_menu.menu)
+    assert len(lines) <= 24
+    assert any('Host 0' in line for line in lines)
+
+def test_selection_stays_visible(big_menu):
+    big_menu._handle_keys(big_menu.menu, [Keys.END])
+    lines = big_menu._compose_frame(big_menu.menu)
+    assert big_menu.current_pos == 99_999
+    assert any('Host 99999' in line for line in lines)
+
+def test_page_and_home_keys(big_menu):
+    big_menu._compose_frame(big_menu.menu)
+    height = big_menu.viewport.height
+    big_menu._handle_keys(big_menu.menu, [Keys.PAGE_DOWN, Keys.PAGE_DOWN])
+    assert big_menu.current_pos == 2 * height
+    big_menu._handle_keys(big_menu.menu, [Keys.PAGE_UP])
+    assert big_menu.current_pos == height
+    big_menu._handle_keys(big_menu.menu, [Keys.HOME])
+    assert big_menu.current_pos == 0
+
+def test_activate_uses_indexed_lookup(big_menu):
+    calls = []
+    big_menu.menu['Host 50000'].value = lambda: calls.append(True)
+    big_menu._activate_item(big_menu.menu, 50_000)
+    assert calls == [True]